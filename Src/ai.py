@@ -0,0 +1,133 @@
+# ai.py
+"""
+Computer opponent for single-player mode.
+
+Targets come from a probability density: for every remaining ship, count
+the placements (placement.placement_table) that are still possible, i.e.
+cover no miss and no cell of an already sunk ship, and sum them per cell.
+Placements that pass through unresolved hits (hit but not yet sunk) get a
+separate target count, and while there are any the AI shoots the cell
+with the highest target count, breaking ties by density.
+
+Ships are counted independently (the per-ship marginals), not over joint
+fleets; that is the usual approximation and it is what keeps an update
+cheap. Nothing is rebuilt per move: each shot only touches the placements
+that cover the shot cell, found through an inverted index (cell ->
+placements), and the per-cell counts are adjusted by those placements.
+"""
+import random
+import functools
+import numpy as np
+
+from placement import placement_cells_array
+
+
+@functools.lru_cache(maxsize=None)
+def placements_by_cell(grid_size, length):
+    """Inverted index: for every cell, the indices of placements covering it."""
+    cells = placement_cells_array(grid_size, length)
+    owners = np.repeat(np.arange(len(cells)), length)
+    flat = cells.ravel()
+    order = np.argsort(flat, kind='stable')
+    bounds = np.searchsorted(flat[order], np.arange(grid_size * grid_size + 1))
+    return [owners[order[bounds[i]:bounds[i + 1]]] for i in range(grid_size * grid_size)]
+
+
+class ShipDensity:
+    """Counts for all ships of one length (they share a placement table)."""
+
+    def __init__(self, grid_size, length, count):
+        self.length = length
+        self.count = count  # ships of this length still afloat
+        self.cells = placement_cells_array(grid_size, length)
+        self.by_cell = placements_by_cell(grid_size, length)
+        size = grid_size * grid_size
+        self.alive = np.ones(len(self.cells), dtype=bool)
+        self.hits_covered = np.zeros(len(self.cells), dtype=np.int32)
+        self.density = np.bincount(self.cells.ravel(), minlength=size).astype(np.int64)
+        self.target = np.zeros(size, dtype=np.int64)
+
+    def _covering(self, index):
+        idx = self.by_cell[index]
+        return idx[self.alive[idx]]
+
+    def exclude(self, index):
+        # a miss or a sunk ship's cell: no ship of this length can cover it any more
+        idx = self._covering(index)
+        if not len(idx):
+            return
+        self.alive[idx] = False
+        size = len(self.density)
+        self.density -= np.bincount(self.cells[idx].ravel(), minlength=size)
+        weights = self.hits_covered[idx]
+        if weights.any():
+            self.target -= np.bincount(self.cells[idx].ravel(), weights=np.repeat(weights, self.length),
+                                       minlength=size).astype(np.int64)
+
+    def add_hit(self, index):
+        idx = self._covering(index)
+        if len(idx):
+            self.hits_covered[idx] += 1
+            self.target += np.bincount(self.cells[idx].ravel(), minlength=len(self.target))
+
+
+class ComputerPlayer:
+    """
+    Density-targeting opponent. Call choose_shot() for a move and observe()
+    with the outcome of every shot it takes. accuracy is the chance that it
+    answers a quiz question correctly.
+    """
+
+    def __init__(self, grid_size, ship_lengths, accuracy=0.7, rng=random):
+        self.grid_size = grid_size
+        self.accuracy = accuracy
+        self.rng = rng
+        counts = {}
+        for length in ship_lengths:
+            counts[length] = counts.get(length, 0) + 1
+        self.ships = {length: ShipDensity(grid_size, length, n) for length, n in counts.items()}
+        self.shot = np.zeros(grid_size * grid_size, dtype=bool)
+
+    def answers_correctly(self):
+        return self.rng.random() < self.accuracy
+
+    def scores(self):
+        # per-cell (target, density) sums over the ships still afloat
+        target = sum(s.count * s.target for s in self.ships.values())
+        density = sum(s.count * s.density for s in self.ships.values())
+        return target, density
+
+    def choose_shot(self):
+        target, density = self.scores()
+        score = density.astype(np.float64)
+        if (target[~self.shot] > 0).any():
+            # hunt down the ship that was hit; density only breaks ties
+            score = target * (density.max() + 1.0) + density
+        score[self.shot] = -1.0
+        best = np.flatnonzero(score == score.max())
+        index = int(best[self.rng.randrange(len(best))])
+        return divmod(index, self.grid_size)
+
+    def observe(self, cell, hit, sunk_cells=None):
+        """Outcome of a shot at cell; sunk_cells are the cells of the ship it sank, if any."""
+        index = cell[0] * self.grid_size + cell[1]
+        if self.shot[index]:
+            return
+        self.shot[index] = True
+        for ship in self.ships.values():
+            if hit:
+                ship.add_hit(index)
+            else:
+                ship.exclude(index)
+        if sunk_cells:
+            ship = self.ships.get(len(sunk_cells))
+            if ship and ship.count:
+                ship.count -= 1
+            for r, c in sunk_cells:
+                for s in self.ships.values():
+                    s.exclude(r * self.grid_size + c)
+
+    def observe_result(self, result):
+        """observe() from the game.ShotResult of this player's shot."""
+        if result.changed:
+            self.observe(result.cell, result.hit, result.sunk.cells() if result.sunk else None)
@@ -1,12 +1,18 @@
 import pygame
-import sys
 import random
-from board import Board, generate_sequences
+from board_view import BoardView
 from game import Game
 from quiz import QuizManager
+from seeding import stream
 from question_ui import QuestionCard
 from hud import TurnHUD
 from toast import StatusToast
+from compositor import Compositor, Layer
+from frame_scheduler import earliest
+from scenes import SceneManager
+from timeline import Timeline
+import text_cache
+from fonts import get_font
 
 # --- Config ---
 GRID_SIZE = 10
@@ -24,6 +30,7 @@ HEIGHT = TOP_BAR + OUTER_MARGIN + GRID_PIXELS + OUTER_MARGIN
 
 BG_COLOR = (245, 245, 245)
 LABEL_COLOR = (60, 60, 60)
+RESULT_PAUSE_MS = 1200  # how long a shot / skipped turn stays up before the next question
 
 # colors for sequences (like ships)
 SEQUENCE_COLORS = [
@@ -36,32 +43,42 @@ SEQUENCE_COLORS = [
 
 
 class App:
-    def __init__(self):
-        pygame.init()
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        pygame.display.set_caption("Battleship – Quiz Edition")
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont(None, 28)
+    def __init__(self, vs_computer=False, ai_accuracy=0.7, seed=None, scenes=None):
+        self.scenes = scenes or SceneManager()
+        self.size = (WIDTH, HEIGHT)
+        self.caption = "Battleship – Quiz Edition"
+        self.screen = self.scenes.show(self.size, self.caption)
+        self.font = get_font(28)
         self.running = True
+        self.timeline = Timeline()  # delayed state changes and animations
 
         # Polished question UI card
         self.question_card = QuestionCard(self.screen, width=700)
 
         # Turn/Result HUD
-        self.hud = TurnHUD(self.screen)
+        self.hud = TurnHUD(self.screen, self.timeline)
         self.hud.set_status(None, None)
 
-        self.toast = StatusToast(self.screen)
+        self.toast = StatusToast(self.screen, self.timeline)
 
         # make the game (players; Game handles ship placement)
-        self.game = Game(["Player 1", "Player 2"], SEQUENCE_COLORS, ship_lengths=[2, 2, 3, 3, 5], grid_size=GRID_SIZE)
+        ship_lengths = [2, 2, 3, 3, 5]
+        names = ["Player 1", "Computer"] if vs_computer else ["Player 1", "Player 2"]
+        self.game = Game(names, SEQUENCE_COLORS, ship_lengths=ship_lengths, grid_size=GRID_SIZE, seed=seed)
 
-        # set origins so boards draw in the right place
-        # (Game created Board objects with origin=(0,0) so update the origins here)
-        self.game.players[0].board.origin = LEFT_ORIGIN
-        self.game.players[1].board.origin = RIGHT_ORIGIN
+        # single-player: player 2 is the computer (numpy is only needed for this mode)
+        self.computer = None
+        if vs_computer:
+            from ai import ComputerPlayer
+            self.computer = ComputerPlayer(GRID_SIZE, ship_lengths, accuracy=ai_accuracy,
+                                           rng=stream(self.game.seed, "ai"))
 
-        self.quiz = QuizManager()
+        # one view per player's board; origins are swapped each turn in draw()
+        self.board_views = [BoardView(self.game.players[0].board, LEFT_ORIGIN, BG_COLOR),
+                            BoardView(self.game.players[1].board, RIGHT_ORIGIN, BG_COLOR)]
+
+        # same seed as the game: fleets, questions and computer moves replay together
+        self.quiz = QuizManager(seed=self.game.seed)
 
         # UI state
         self.state = "ASK_QUESTION"  # ASK_QUESTION -> ANSWERING -> (SHOOTING or SHOW_RESULT)
@@ -72,10 +89,14 @@ class App:
         # Initialize HUD with current player
         self.hud.set_player(self.game.get_current_player().name)
 
+        self.dim = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+        self.dim.fill((0, 0, 0, 80))
+        self.compositor = self.make_compositor()
+
     # --- Quiz flow helpers ---
     def ask_question(self):
         self.current_question, self.correct_answer = self.quiz.get_question()
-        self.state = "ANSWERING"
+        self.state = "COMPUTER_TURN" if self.is_computer_turn() else "ANSWERING"
         # reset the card each time
         self.question_card.set_input("")
         self.question_card.clear_feedback()
@@ -95,14 +116,55 @@ class App:
         self.hud.set_status(False, "Skipped")
         self.game.next_turn()
         self.hud.set_player(self.game.get_current_player().name)
+        self.show_result()
+
+    def show_result(self):
+        # the result stays up for a moment, then the next question (or game over)
         self.state = "SHOW_RESULT"
+        self.timeline.after(RESULT_PAUSE_MS, self.next_turn)
+
+    def next_turn(self):
+        if not self.game.over:
+            self.ask_question()
+        else:
+            self.state = "GAME_OVER"
+            self.message = f"{self.game.get_current_player().name} wins!"
+
+    # --- Computer opponent ---
+    def is_computer_turn(self):
+        return self.computer is not None and self.game.current_turn == 1
+
+    def computer_pending(self):
+        return 0 if self.state == "COMPUTER_TURN" else None
+
+    def computer_turn(self):
+        # answer the question at the configured accuracy, then shoot like a player would
+        if not self.computer.answers_correctly():
+            self.on_wrong_answer()
+            self.toast.show("Computer answered wrong. Turn lost.", positive=True)
+            return
+
+        result = self.game.process_shot(self.computer.choose_shot())
+        self.computer.observe_result(result)
+        self.toast.show(result.message(), positive=not result.hit)
+        self.show_shot_result(result)
+
+    def show_shot_result(self, result):
+        self.hud.set_status(result.hit, "Sunk!" if result.sunk else "Hit!" if result.hit else "Miss!")
+        # after process_shot, turn likely advanced to the next player
+        self.hud.set_player(self.game.get_current_player().name)
+        self.show_result()
 
     # --- Event handling ---
-    def handle_events(self):
-        for event in pygame.event.get():
+    def handle_events(self, events=None):
+        for event in pygame.event.get() if events is None else events:
+            self.compositor.handle_event(event)
             if event.type == pygame.QUIT:
                 self.running = False
                 continue
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                self.running = False  # back to the menu
+                continue
 
             if self.state == "ANSWERING":
                 if event.type == pygame.KEYDOWN:
@@ -129,80 +191,115 @@ class App:
 
             elif self.state == "SHOOTING" and event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 pos = event.pos
-                opponent = self.game.get_opponent()
-                cell = opponent.board.cell_from_pos(pos)
+                cell = self.opponent_view().cell_from_pos(pos)
                 if cell:
-                    msg, *_ = self.game.process_shot(cell)
-                    #self.message = msg
+                    result = self.game.process_shot(cell)
+                    if result.changed:  # clicks on cells already shot are ignored
+                        self.show_shot_result(result)
 
-                    # detect hit/miss from message (fallback if your Game doesn't expose it directly)
-                    lower = msg.lower()
-                    did_hit = ("hit" in lower) and ("miss" not in lower)
-                    self.hud.set_status(did_hit, "Hit!" if did_hit else "Miss!")
+    def player_view(self):
+        # against the computer the human's board always stays on the left
+        if self.computer is not None:
+            return self.board_views[0]
+        return self.board_views[self.game.current_turn]
 
-                    # after process_shot, turn likely advanced to the next player
-                    self.hud.set_player(self.game.get_current_player().name)
-                    self.state = "SHOW_RESULT"
+    def opponent_view(self):
+        if self.computer is not None:
+            return self.board_views[1]
+        return self.board_views[(self.game.current_turn + 1) % len(self.board_views)]
 
     # --- Drawing helpers ---
     def draw_text_center(self, text, y):
-        label = self.font.render(text, True, LABEL_COLOR)
+        label = text_cache.render(self.font, text, LABEL_COLOR)
         rect = label.get_rect(center=(WIDTH // 2, y))
         self.screen.blit(label, rect)
 
-    def draw(self):
-        self.screen.fill(BG_COLOR)
+    # --- Frame layers (compositor.py repaints only what changed) ---
+    def make_compositor(self):
+        return Compositor(self.screen, [
+            Layer("background", lambda surface: surface.fill(BG_COLOR)),
+            Layer("hud", lambda surface: self.hud.draw(), self.hud.render_key, self.hud.rect),
+            Layer("boards", self.draw_boards, self.boards_key, self.boards_rect),
+            Layer("overlay", self.draw_overlay, self.overlay_key, self.overlay_rect),
+            Layer("question card", self.draw_question_card, self.question_card_key, self.question_card_rect),
+            Layer("toast", lambda surface: self.toast.draw(), self.toast.render_key, self.toast.rect),
+        ])
+
+    def placed_views(self):
+        # current player's board on the left
+        player_view = self.player_view()
+        opponent_view = self.opponent_view()
+        player_view.origin = LEFT_ORIGIN
+        opponent_view.origin = RIGHT_ORIGIN
+        return player_view, opponent_view
+
+    def draw_boards(self, surface):
+        player_view, opponent_view = self.placed_views()
+        player_view.draw(surface, show_ships=True)
+        opponent_view.draw(surface, show_ships=False)
+
+    def boards_key(self):
+        player_view, opponent_view = self.placed_views()
+        return player_view.render_key(True), opponent_view.render_key(False)
+
+    def boards_rect(self):
+        player_view, opponent_view = self.placed_views()
+        return player_view.rect.union(opponent_view.rect)
+
+    def status_text(self):
+        return self.message if self.state in ("SHOW_RESULT", "SHOOTING") else None
+
+    def draw_overlay(self, surface):
+        if self.state == "ANSWERING":
+            # Dim background for focus
+            surface.blit(self.dim, (0, 0))
+        text = self.status_text()
+        if text:
+            self.draw_text_center(text, HEIGHT - 80)
 
-        player = self.game.get_current_player()
-        opponent = self.game.get_opponent()
+    def overlay_key(self):
+        return self.state == "ANSWERING", self.status_text()
 
-        # HUD on top
-        self.hud.draw()
+    def overlay_rect(self):
+        if self.state == "ANSWERING":
+            return None
+        if self.status_text():
+            return pygame.Rect(0, HEIGHT - 100, WIDTH, 40)
+        return pygame.Rect(0, 0, 0, 0)
 
-        # Draw both boards
-        player.board.origin = LEFT_ORIGIN
-        opponent.board.origin = RIGHT_ORIGIN
-        player.board.draw(self.screen, show_ships=True)
-        opponent.board.draw(self.screen, show_ships=False)
+    def card_center(self):
+        return (self.screen.get_width() // 2, self.screen.get_height() // 2)
 
-        # State-specific UI
+    def draw_question_card(self, surface):
         if self.state == "ANSWERING":
-            # Dim background for focus
-            overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 80))
-            self.screen.blit(overlay, (0, 0))
+            self.question_card.draw(self.current_question, self.card_center())
 
-            center = (self.screen.get_width() // 2, self.screen.get_height() // 2)
-            self.question_card.draw(self.current_question, center)
+    def question_card_key(self):
+        return self.question_card.render_key(self.current_question) if self.state == "ANSWERING" else None
 
-        elif self.state == "SHOW_RESULT":
-            self.draw_text_center(self.message, HEIGHT - 80)
+    def question_card_rect(self):
+        if self.state == "ANSWERING":
+            return self.question_card.rect(self.current_question, self.card_center())
+        return pygame.Rect(0, 0, 0, 0)
+
+    def draw(self):
+        self.compositor.render()
 
-        elif self.state == "SHOOTING":
-            self.draw_text_center(self.message, HEIGHT - 80)
+    # --- Scene (see scenes.py) ---
+    def enter(self):
+        self.compositor.invalidate()
+        if self.state == "ASK_QUESTION":
+            self.ask_question()  # start with a question
 
-        self.toast.draw()
+    def next_frame_at(self):
+        # 60 fps only while something moves or is waiting to be drawn
+        return earliest(self.compositor.next_frame_at(), self.timeline.next_frame_at(), self.computer_pending())
 
-        pygame.display.flip()
+    def update(self):
+        self.timeline.update()
+        if self.state == "COMPUTER_TURN":
+            self.computer_turn()
 
-    # --- Main loop ---
     def run(self):
-        # Start with a question
-        self.ask_question()
-
-        while self.running:
-            self.handle_events()
-            self.draw()
-            self.clock.tick(60)
-
-            # After showing result briefly, move to next question
-            if self.state == "SHOW_RESULT":
-                pygame.time.wait(1200)
-                if not self.game.over:
-                    self.ask_question()
-                else:
-                    self.state = "GAME_OVER"
-                    self.message = f"{self.game.get_current_player().name} wins!"
-
-        pygame.quit()
-        sys.exit()
\ No newline at end of file
+        self.scenes.push(self)
+        self.scenes.run()
\ No newline at end of file
@@ -0,0 +1,190 @@
+# batch_sim.py
+"""
+Vectorized batch simulator: advances many two-player games at once with
+NumPy. Board state is kept flat, one row per (game, player) board:
+row 2 * game + player has grid * grid cells.
+
+Each step follows the turn flow of GameRoom.game_loop: the current player
+answers a quiz question (correct with probability `accuracy` for that
+player); a correct answer earns one shot chosen by the shooting policy,
+and then the turn passes to the other player either way. A game ends when
+one board has no unhit ship cells left.
+
+Used for tuning SHIP_LENGTHS, grid size and quiz difficulty, e.g.
+
+    stats = simulate(100_000, accuracy=(0.9, 0.6), policy=HuntTargetPolicy())
+    stats['turns'].mean(), (stats['winner'] == 0).mean()
+
+simulate_scalar() plays the same model through the real Game class, so the
+two can be checked against each other (see benchmarks/bench_sim.py).
+"""
+import random
+import numpy as np
+
+from config import GRID_SIZE, SHIP_LENGTHS, SEQUENCE_COLORS
+from placement import sample_fleets, fleet_boards
+
+
+class Batch:
+    """
+    State of a chunk of games, as seen by a shooting policy.
+      shot  (2n, cells) bool  cells fired at on each board
+      hit   (2n, cells) bool  the subset of those that were hits
+      fired (2n,)             shots taken at each board
+    """
+
+    def __init__(self, n, grid_size, ship_lengths, rng):
+        self.n = n
+        self.grid_size = grid_size
+        self.cells = grid_size * grid_size
+        self.rng = rng
+        fleets = sample_fleets(2 * n, grid_size, ship_lengths, rng)
+        self.ships = fleet_boards(fleets, grid_size, ship_lengths)
+        self.shot = np.zeros((2 * n, self.cells), dtype=bool)
+        self.hit = np.zeros((2 * n, self.cells), dtype=bool)
+        self.fired = np.zeros(2 * n, dtype=np.int32)
+        self.remaining = np.full(2 * n, sum(ship_lengths), dtype=np.int32)
+
+
+# --- shooting policies ---
+# start(batch) is called once per chunk, choose(batch, boards) returns one
+# unshot cell index for each board row in `boards`.
+
+class RandomPolicy:
+    """Uniformly random unshot cell: a random firing order per board, drawn up front."""
+
+    def start(self, batch):
+        dtype = np.int16 if batch.cells < 2 ** 15 else np.int32
+        cells = np.broadcast_to(np.arange(batch.cells, dtype=dtype), (2 * batch.n, batch.cells))
+        self.order = batch.rng.permuted(cells, axis=1)
+
+    def choose(self, batch, boards):
+        return self.order[boards, batch.fired[boards]]
+
+
+class HuntTargetPolicy:
+    """Random unshot cell next to a known hit if there is one, else a random unshot cell."""
+
+    def start(self, batch):
+        pass
+
+    def choose(self, batch, boards):
+        k, g = len(boards), batch.grid_size
+        shot = batch.shot[boards]
+        h = batch.hit[boards].reshape(k, g, g)
+        near = np.zeros_like(h)
+        near[:, 1:, :] |= h[:, :-1, :]
+        near[:, :-1, :] |= h[:, 1:, :]
+        near[:, :, 1:] |= h[:, :, :-1]
+        near[:, :, :-1] |= h[:, :, 1:]
+        near = near.reshape(k, -1) & ~shot
+
+        keys = batch.rng.random(shot.shape, dtype=np.float32)
+        keys[shot] = -1.0
+        keys[near] += 2.0  # neighbours of hits always win the argmax
+        return keys.argmax(axis=1)
+
+
+def simulate(n, grid_size=GRID_SIZE, ship_lengths=SHIP_LENGTHS, accuracy=0.8,
+             policy=None, seed=None, max_turns=None, chunk=100_000):
+    """
+    Play n games. Returns a dict of arrays:
+      winner   (n,)   0 or 1, -1 if max_turns ran out
+      turns    (n,)   questions asked until the game ended
+      shots    (n, 2) shots fired by each player
+      hits     (n, 2) hits scored by each player
+      correct  (n, 2) correctly answered questions per player
+      hit_rate (n, 2) hits / shots (0 where no shots)
+    accuracy is one probability or a pair (player 0, player 1).
+    """
+    rng = np.random.default_rng(seed)
+    policy = policy or RandomPolicy()
+    accuracy = np.broadcast_to(np.asarray(accuracy, dtype=float), (2,))
+    if max_turns is None:
+        max_turns = 50 * grid_size * grid_size
+
+    parts = []
+    done = 0
+    while done < n:
+        m = min(chunk, n - done)
+        batch = Batch(m, grid_size, ship_lengths, rng)
+        policy.start(batch)
+        parts.append(_play(batch, policy, accuracy, max_turns))
+        done += m
+    stats = {key: np.concatenate([p[key] for p in parts]) for key in parts[0]}
+    stats['hit_rate'] = stats['hits'] / np.maximum(stats['shots'], 1)
+    return stats
+
+
+def _play(batch, policy, accuracy, max_turns):
+    m, rng = batch.n, batch.rng
+    turn = np.zeros(m, dtype=np.int64)  # Game starts with player 0
+    winner = np.full(m, -1, dtype=np.int8)
+    turns = np.zeros(m, dtype=np.int32)
+    shots = np.zeros((m, 2), dtype=np.int32)
+    hits = np.zeros((m, 2), dtype=np.int32)
+    correct = np.zeros((m, 2), dtype=np.int32)
+
+    live = np.arange(m)
+    for _ in range(max_turns):
+        if not live.size:
+            break
+        player = turn[live]
+        turns[live] += 1
+        ok = rng.random(live.size) < accuracy[player]
+
+        games = live[ok]
+        shooter = player[ok]
+        correct[games, shooter] += 1
+
+        if games.size:
+            boards = 2 * games + 1 - shooter  # the opponent's board
+            cell = policy.choose(batch, boards)
+            is_hit = batch.ships[boards, cell]
+            batch.shot[boards, cell] = True
+            batch.hit[boards, cell] = is_hit
+            batch.fired[boards] += 1
+            batch.remaining[boards] -= is_hit
+            shots[games, shooter] += 1
+            hits[games, shooter] += is_hit
+            won = is_hit & (batch.remaining[boards] == 0)
+            winner[games[won]] = shooter[won]
+
+        turn[live] = 1 - player
+        live = live[winner[live] < 0]
+
+    return {'winner': winner, 'turns': turns, 'shots': shots, 'hits': hits, 'correct': correct}
+
+
+def simulate_scalar(n, grid_size=GRID_SIZE, ship_lengths=SHIP_LENGTHS, accuracy=0.8, seed=None, max_turns=None):
+    """Same model with the real Game class and random shooting, one game at a time."""
+    from game import Game
+
+    rng = random.Random(seed)
+    accuracy = [float(a) for a in np.broadcast_to(np.asarray(accuracy, dtype=float), (2,))]
+    if max_turns is None:
+        max_turns = 50 * grid_size * grid_size
+    cells = [(r, c) for r in range(grid_size) for c in range(grid_size)]
+
+    stats = {'winner': np.full(n, -1, dtype=np.int8), 'turns': np.zeros(n, dtype=np.int32),
+             'shots': np.zeros((n, 2), dtype=np.int32), 'hits': np.zeros((n, 2), dtype=np.int32),
+             'correct': np.zeros((n, 2), dtype=np.int32)}
+    for i in range(n):
+        game = Game(["Player 1", "Player 2"], SEQUENCE_COLORS, ship_lengths=ship_lengths, grid_size=grid_size,
+                    seed=rng.getrandbits(64))
+        targets = [rng.sample(cells, len(cells)) for _ in range(2)]
+        for _ in range(max_turns):
+            p = game.current_turn
+            stats['turns'][i] += 1
+            if rng.random() >= accuracy[p]:
+                game.next_turn()
+                continue
+            stats['correct'][i, p] += 1
+            result = game.process_shot(targets[p].pop())
+            stats['shots'][i, p] += 1
+            stats['hits'][i, p] += result.hit
+            if result.game_over:
+                stats['winner'][i] = p
+                break
+    stats['hit_rate'] = stats['hits'] / np.maximum(stats['shots'], 1)
+    return stats
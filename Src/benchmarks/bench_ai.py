@@ -0,0 +1,103 @@
+"""
+Computer opponent benchmark: average shots to sink a whole random fleet
+for the density AI against random shooting and hunt/target, and the time
+per move decision (choose_shot + observe) on small and large grids.
+
+    python benchmarks/bench_ai.py [--games 300]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai import ComputerPlayer
+from board import Board, generate_fleet
+from config import SEQUENCE_COLORS, SHIP_LENGTHS
+
+
+def new_board(grid):
+    board = Board(SEQUENCE_COLORS, grid)
+    board.set_ships(generate_fleet(grid, SHIP_LENGTHS, SEQUENCE_COLORS))
+    return board
+
+
+def shoot(board, cell):
+    # (hit, Ship sunk or None, game over)
+    index = cell[0] * board.grid_size + cell[1]
+    hit = bool(board.ship_mask >> index & 1)
+    sunk = board.mark_index(index, hit)
+    return hit, sunk, board.all_sunk()
+
+
+def play_ai(board, times=None):
+    ai = ComputerPlayer(board.grid_size, SHIP_LENGTHS)
+    shots = 0
+    while True:
+        start = time.perf_counter()
+        cell = ai.choose_shot()
+        hit, sunk, over = shoot(board, cell)
+        ai.observe(cell, hit, sunk.cells() if sunk else None)
+        if times is not None:
+            times.append(time.perf_counter() - start)
+        shots += 1
+        if over:
+            return shots
+
+
+def play_random(board):
+    g = board.grid_size
+    cells = random.sample([(r, c) for r in range(g) for c in range(g)], g * g)
+    for shots, cell in enumerate(cells, 1):
+        if shoot(board, cell)[2]:
+            return shots
+
+
+def play_hunt(board):
+    # random shots until a hit, then its unshot neighbours first
+    g = board.grid_size
+    todo = random.sample([(r, c) for r in range(g) for c in range(g)], g * g)
+    stack = []
+    shots = 0
+    while True:
+        cell = stack.pop() if stack else todo.pop()
+        index = cell[0] * g + cell[1]
+        if board.shot_mask >> index & 1:
+            continue
+        shots += 1
+        if shoot(board, cell)[2]:
+            return shots
+        if board.hit_mask >> index & 1:
+            r, c = cell
+            stack += [(r + dr, c + dc) for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                      if 0 <= r + dr < g and 0 <= c + dc < g]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=300)
+    args = parser.parse_args()
+    random.seed(11)
+
+    print(f"10x10, {args.games} games, shots to sink the fleet {SHIP_LENGTHS}:")
+    times = []
+    for name, play in (("random", play_random), ("hunt/target", play_hunt),
+                       ("density AI", lambda b: play_ai(b, times))):
+        shots = [play(new_board(10)) for _ in range(args.games)]
+        print(f"{name:>12}: mean {statistics.mean(shots):6.1f}, median {statistics.median(shots):5.0f}")
+
+    # 10x10 decision times were collected in the games above
+    for grid, games in ((10, 0), (30, 5), (100, 1)):
+        if games:
+            times = []
+            for _ in range(games):
+                play_ai(new_board(grid), times)
+        times.sort()
+        print(f"{grid:>3}x{grid:<3} move: mean {statistics.mean(times) * 1e3:.3f} ms, "
+              f"p99 {times[int(len(times) * 0.99)] * 1e3:.3f} ms, max {times[-1] * 1e3:.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+A client that stops reading, against a server under normal load. The
+"flooder" joins a match, then sends --requests resync requests without
+ever reading the board snapshots they produce, while --bots loadtest bots
+play their matches on the same server. Reports the bots' turns/s and
+latency, the server's peak RSS and whether (and how fast) the flooder was
+disconnected.
+
+--src runs the server from another checkout (e.g. a git worktree of an
+older commit); anything after -- is passed on to its server.py.
+
+    python benchmarks/bench_backpressure.py [--bots 200] [--duration 5] [--requests 100000]
+    python benchmarks/bench_backpressure.py -- --overflow drop --stall-timeout 2
+"""
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC)
+
+from loadtest import run_load, percentile
+from network_utils import encode_message
+
+
+def peak_rss_mb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+async def flood(host, port, requests, result):
+    reader, writer = await asyncio.open_connection(host, port)
+    sock = writer.get_extra_info('socket')
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)  # fill up quickly, like a stalled phone
+    await asyncio.sleep(1.0)  # paired with the first bot by now
+    request = encode_message({'type': 'resync'})
+    start = time.perf_counter()
+    try:
+        for i in range(requests):
+            writer.write(request)
+            if i % 1000 == 999:
+                await writer.drain()
+        await writer.drain()
+        # the server is done with us once it stops accepting our bytes or resets the socket
+        while True:
+            await asyncio.sleep(0.05)
+            writer.write(request)
+            await writer.drain()
+            if time.perf_counter() - start > 30:
+                result['disconnected'] = None
+                return
+    except (ConnectionError, OSError):
+        result['disconnected'] = time.perf_counter() - start
+    finally:
+        writer.close()
+
+
+async def run(args):
+    result = {}
+    flooder = asyncio.create_task(flood(args.host, args.port, args.requests, result))
+    await asyncio.sleep(0.2)  # flooder waits first, so it is paired with a bot
+    stats, elapsed = await run_load(args.host, args.port, args.bots, args.duration, accuracy=0.8)
+    await flooder
+    return stats, elapsed, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5097)
+    parser.add_argument("--bots", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--requests", type=int, default=100000, help="resync requests the flooder sends")
+    parser.add_argument("--src", default=SRC, help="checkout whose server.py to run (its Src directory)")
+    parser.add_argument("server_args", nargs="*", help="extra server.py arguments (after --)")
+    args = parser.parse_args()
+
+    server = subprocess.Popen([sys.executable, "server.py", "--host", args.host, "--port", str(args.port),
+                               "--quiet", *args.server_args], cwd=args.src, stdout=subprocess.DEVNULL)
+    time.sleep(1.0)
+    try:
+        stats, elapsed, result = asyncio.run(run(args))
+        rss = peak_rss_mb(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+
+    lat = stats.latencies
+    gone = result.get('disconnected')
+    print(f"{os.path.abspath(args.src)} {' '.join(args.server_args)}")
+    print(f"bots {args.bots}: {stats.turns / elapsed:.0f} turns/s, latency p50 {percentile(lat, 0.5) * 1000:.2f} ms, "
+          f"p99 {percentile(lat, 0.99) * 1000:.2f} ms, errors: {stats.errors or 'none'}")
+    print(f"flooder ({args.requests} resyncs, never reads): "
+          + (f"disconnected after {gone:.2f} s" if gone is not None else "still connected after 30 s")
+          + f"; server peak RSS {rss:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
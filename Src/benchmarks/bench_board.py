@@ -0,0 +1,180 @@
+"""
+Board benchmark: the old set-based shot/win logic against the bitboard
+Board, per shot and per full game (random shooting until one side wins),
+plus the sunk-ship check and the per-frame ship lookup (colour flood fill
+against the Ship list).
+
+    python benchmarks/bench_board.py [--grid 10] [--games 2000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board import Board, generate_fleet, cell_hash_table
+from config import SEQUENCE_COLORS, SHIP_LENGTHS
+
+
+# --- the set-based rules from before the bitboard, kept for comparison ---
+class LegacyBoard:
+    def __init__(self, cells_with_colors, grid_size):
+        self.hits = set()
+        self.misses = set()
+        self.cells_with_colors = cells_with_colors
+        self.grid_size = grid_size
+        self.seq = 0
+        self.state_hash = 0
+        self.hash_table = cell_hash_table(grid_size)
+
+    def mark(self, cell, hit):
+        (self.hits if hit else self.misses).add(cell)
+        self.seq += 1
+        self.state_hash ^= self.hash_table[(cell[0] * self.grid_size + cell[1]) * 2 + hit]
+
+
+def legacy_process_shot(board, cell):
+    if cell in board.hits or cell in board.misses:
+        return None, False
+    hit = cell in board.cells_with_colors
+    board.mark(cell, hit)
+    return hit, len(board.hits) >= len(board.cells_with_colors) > 0
+
+
+def legacy_group_ships(cells_with_colors):
+    # the old Board.group_ships: flood fill over same-coloured neighbours
+    visited = set()
+    ships = []
+    for cell in cells_with_colors:
+        if cell in visited:
+            continue
+        ship = []
+        color = cells_with_colors[cell]
+        stack = [cell]
+        while stack:
+            current = stack.pop()
+            if current in visited:
+                continue
+            if cells_with_colors.get(current) == color:
+                visited.add(current)
+                ship.append(current)
+                r, c = current
+                for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+                    neighbor = (r + dr, c + dc)
+                    if neighbor not in visited:
+                        stack.append(neighbor)
+        if ship:
+            ships.append(ship)
+    return ships
+
+
+def fleet_cells(fleet):
+    # Ships -> {cell: colour}, the old board representation
+    return {cell: ship.color for ship in fleet for cell in ship.cells()}
+
+
+def legacy_ship_sunk(board, cell, ships):
+    # old way: walk the groups (group_ships) and test the ship's cells against hits
+    for ship in ships:
+        if cell in ship:
+            return all(c in board.hits for c in ship)
+    return False
+
+
+def bitboard_process_shot(board, cell):
+    # same steps as Game.process_shot
+    index = cell[0] * board.grid_size + cell[1]
+    if board.shot_cells[index]:
+        return None, False
+    hit = board.ship_ids[index] >= 0
+    sunk = board.mark_index(index, hit)
+    return hit, sunk is not None and board.ships_afloat == 0
+
+
+def play(make_board, shoot, fleets, orders):
+    # board construction is not timed, see setup_us
+    boards = [make_board(fleet) for fleet in fleets]
+    shots = 0
+    start = time.perf_counter()
+    for board, order in zip(boards, orders):
+        for cell in order:
+            shots += 1
+            if shoot(board, cell)[1]:
+                break
+    return time.perf_counter() - start, shots
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--grid", type=int, default=10)
+    parser.add_argument("--games", type=int, default=2000)
+    args = parser.parse_args()
+    g = args.grid
+
+    random.seed(7)
+    fleets = [generate_fleet(g, SHIP_LENGTHS, SEQUENCE_COLORS) for _ in range(args.games)]
+    cells = [(r, c) for r in range(g) for c in range(g)]
+    orders = [random.sample(cells, len(cells)) for _ in range(args.games)]
+
+    def make_bitboard(fleet):
+        board = Board(SEQUENCE_COLORS, g)
+        board.set_ships(fleet)
+        return board
+
+    def make_legacy(fleet):
+        return LegacyBoard(fleet_cells(fleet), g)
+
+    legacy_t, shots = play(make_legacy, legacy_process_shot, fleets, orders)
+    bit_t, _ = play(make_bitboard, bitboard_process_shot, fleets, orders)
+    start = time.perf_counter()
+    for fleet in fleets:
+        make_bitboard(fleet)
+    setup_us = (time.perf_counter() - start) / args.games * 1e6
+
+    print(f"grid {g}x{g}, {args.games} games, {shots} shots")
+    print(f"{'':>10} {'ns/shot':>9} {'us/game':>9}")
+    print(f"{'legacy':>10} {legacy_t / shots * 1e9:>9.0f} {legacy_t / args.games * 1e6:>9.1f}")
+    print(f"{'bitboard':>10} {bit_t / shots * 1e9:>9.0f} {bit_t / args.games * 1e6:>9.1f}")
+    print(f"bitboard set_ships (masks + cell -> ship index): {setup_us:.1f} us/board")
+
+    # sunk check on a half-played board
+    board = make_bitboard(fleets[0])
+    legacy = make_legacy(fleets[0])
+    for cell in orders[0][:len(cells) // 2]:
+        bitboard_process_shot(board, cell)
+        legacy_process_shot(legacy, cell)
+    ships = legacy_group_ships(legacy.cells_with_colors)
+    probe = list(legacy.cells_with_colors)
+    n = 200_000
+    start = time.perf_counter()
+    for i in range(n):
+        legacy_ship_sunk(legacy, probe[i % len(probe)], ships)
+    legacy_sunk = time.perf_counter() - start
+    start = time.perf_counter()
+    for i in range(n):
+        r, c = probe[i % len(probe)]
+        board.is_sunk(board.ship_mask_at(r * g + c))
+    bit_sunk = time.perf_counter() - start
+    print(f"sunk check: legacy {legacy_sunk / n * 1e9:.0f} ns, bitboard {bit_sunk / n * 1e9:.0f} ns")
+
+    # what draw_ship_images does every frame: find each ship's cells and orientation
+    n = 20_000
+    start = time.perf_counter()
+    for _ in range(n):
+        for ship_cells in legacy_group_ships(legacy.cells_with_colors):
+            ship_cells = sorted(ship_cells)
+            all(r == ship_cells[0][0] for r, c in ship_cells)
+    legacy_frame = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(n):
+        for ship in board.ships:
+            ship.orientation == "H"
+    ship_frame = time.perf_counter() - start
+    print(f"ship lookup per frame: flood fill {legacy_frame / n * 1e6:.1f} us, "
+          f"Ship list {ship_frame / n * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Codec benchmark: bytes on the wire and encode+decode time of the JSON
+and binary codecs for the messages sent every turn, taken from a game
+with 60 shots already fired.
+
+    python benchmarks/bench_codec.py
+"""
+import os
+import sys
+import random
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import codec
+from game import Game
+from config import SEQUENCE_COLORS, SHIP_LENGTHS
+from network_utils import serialize_board
+
+
+def sample_messages(shots=60):
+    random.seed(1)
+    game = Game(["Player 1", "Player 2"], SEQUENCE_COLORS, ship_lengths=SHIP_LENGTHS, grid_size=10)
+    cells = [(r, c) for r in range(10) for c in range(10)]
+    targets = [random.sample(cells, len(cells)) for _ in range(2)]
+    for _ in range(shots):
+        game.process_shot(targets[game.current_turn].pop())
+    board = game.players[1].board
+    delta = {'result': game.last_result.message(), 'cell': [4, 7], 'outcome': 'hit', 'seq': board.seq,
+             'hash': board.state_hash, 'game_over': False, 'winner': None, 'sunk': [4, 5, 'H', 3]}
+    return {
+        'game_start': {
+            'type': 'game_start',
+            'your_board': serialize_board(game.players[0].board, show_ships=True),
+            'opponent_board': serialize_board(board, show_ships=False),
+            'grid_size': 10,
+        },
+        'quiz_question': {'type': 'quiz_question', 'question': "What is 47 + 85?"},
+        'answer': {'type': 'answer', 'answer': "132"},
+        'shot': {'type': 'shot', 'cell': [4, 7]},
+        'shot_result': dict(delta, type='shot_result'),
+        'opponent_shot': dict(delta, type='opponent_shot'),
+        'board_snapshot': {
+            'type': 'board_snapshot',
+            'your_board': serialize_board(game.players[0].board, show_ships=True),
+            'opponent_board': serialize_board(board, show_ships=False),
+        },
+    }
+
+
+def roundtrip_us(msg, codec_name, number):
+    payload = codec.encode(msg, codec_name)
+    enc = timeit.timeit(lambda: codec.encode(msg, codec_name), number=number) / number
+    dec = timeit.timeit(lambda: codec.decode(payload), number=number) / number
+    return len(payload), enc * 1e6, dec * 1e6
+
+
+def main(number=20000):
+    print(f"{'message':>14} {'json B':>7} {'bin B':>6} {'json enc+dec us':>16} {'bin enc+dec us':>15}")
+    for name, msg in sample_messages().items():
+        j_size, j_enc, j_dec = roundtrip_us(msg, codec.JSON, number)
+        b_size, b_enc, b_dec = roundtrip_us(msg, codec.BINARY, number)
+        print(f"{name:>14} {j_size:>7} {b_size:>6} {j_enc + j_dec:>16.2f} {b_enc + b_dec:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
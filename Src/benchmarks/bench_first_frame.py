@@ -0,0 +1,70 @@
+"""
+Time to first frame of the local App (SDL dummy video driver): from a
+fresh interpreter to the first compositor frame on screen, imports
+included. "cold" starts without a font cache file (fonts.py), "warm" with
+the one the cold run left behind. Each run is a new process; the median
+is reported.
+
+--src points at another checkout (e.g. a git worktree of an older
+commit) to measure that one instead.
+
+    python benchmarks/bench_first_frame.py [--runs 7] [--src PATH]
+"""
+import os
+import sys
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import time
+start = time.perf_counter()
+from app import App
+app = App(seed=1)
+app.ask_question()
+app.draw()
+first_frame = time.perf_counter() - start
+try:
+    import fonts
+    scans = fonts.registry.scans
+except ImportError:
+    scans = -1
+print(first_frame, scans)
+"""
+
+
+def run_once(src, cache_path):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1",
+               BATTLESHIP_FONT_CACHE=cache_path)
+    out = subprocess.run([sys.executable, "-c", CHILD], cwd=src, env=env, stdout=subprocess.PIPE,
+                         stderr=subprocess.DEVNULL, text=True).stdout
+    seconds, scans = out.split()[-2:]
+    return float(seconds), int(scans)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--src", default=SRC, help="checkout to measure (its Src directory)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, "fonts.json")
+        cold, warm = [], []
+        for _ in range(args.runs):
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            cold.append(run_once(args.src, cache_path))
+            warm.append(run_once(args.src, cache_path))
+    print(f"{os.path.abspath(args.src)}, {args.runs} runs")
+    for name, runs in [("cold", cold), ("warm", warm)]:
+        ms = statistics.median(s for s, _ in runs) * 1000
+        scans = runs[-1][1]
+        print(f"{name:>5} first frame {ms:7.1f} ms" + (f", font families scanned {scans}" if scans >= 0 else ""))
+
+
+if __name__ == "__main__":
+    main()
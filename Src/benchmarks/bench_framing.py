@@ -0,0 +1,91 @@
+"""
+Framing microbenchmark: old newline-delimited receive_json against the
+length-prefixed FrameReader, for 100-byte and 100-KB messages.
+
+A writer thread pushes messages through a socketpair and the main thread
+receives and decodes them.
+
+    python benchmarks/bench_framing.py
+"""
+import os
+import sys
+import json
+import time
+import socket
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from network_utils import FrameReader, encode_message, receive_messages
+
+
+# the receive_json from before the framed protocol, kept here for comparison
+def legacy_receive_json(sock, buffer=b''):
+    while b'\n' not in buffer:
+        chunk = sock.recv(1024)
+        if not chunk:
+            return None, buffer
+        buffer += chunk
+    line, buffer = buffer.split(b'\n', 1)
+    return json.loads(line.decode('utf-8')), buffer
+
+
+def legacy_encode(data):
+    return (json.dumps(data) + '\n').encode('utf-8')
+
+
+def make_message(size):
+    msg = {'type': 'bench', 'pad': ''}
+    msg['pad'] = 'x' * (size - len(json.dumps(msg)))
+    return msg
+
+
+def writer(sock, payload, count):
+    for _ in range(count):
+        sock.sendall(payload)
+    sock.close()
+
+
+def run_legacy(msg, count):
+    a, b = socket.socketpair()
+    t = threading.Thread(target=writer, args=(a, legacy_encode(msg), count))
+    start = time.perf_counter()
+    t.start()
+    buffer = b''
+    received = 0
+    while received < count:
+        data, buffer = legacy_receive_json(b, buffer)
+        received += 1
+    elapsed = time.perf_counter() - start
+    t.join()
+    b.close()
+    return elapsed
+
+
+def run_framed(msg, count):
+    a, b = socket.socketpair()
+    t = threading.Thread(target=writer, args=(a, encode_message(msg), count))
+    start = time.perf_counter()
+    t.start()
+    reader = FrameReader()
+    received = 0
+    while received < count:
+        received += len(receive_messages(b, reader))
+    elapsed = time.perf_counter() - start
+    t.join()
+    b.close()
+    return elapsed
+
+
+def main():
+    cases = [(100, 200_000), (100 * 1024, 500)]
+    print(f"{'size':>8} {'count':>8} {'legacy msg/s':>13} {'framed msg/s':>13} {'speedup':>8}")
+    for size, count in cases:
+        msg = make_message(size)
+        legacy = run_legacy(msg, count)
+        framed = run_framed(msg, count)
+        print(f"{size:>8} {count:>8} {count / legacy:>13.0f} {count / framed:>13.0f} {legacy / framed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
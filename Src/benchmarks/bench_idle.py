@@ -0,0 +1,76 @@
+"""
+CPU use of the pygame windows while nothing happens (SDL dummy video
+driver): the main menu, the local App waiting on a question card and the
+online client waiting for an opponent (against a local server.py). Each
+window runs in its own process for --seconds, closed by a QUIT timer; the
+CPU time of its run() loop is reported as a share of one core, with the
+voluntary context switches of the main thread per second (each sleep
+in the loop is one; Linux only).
+
+--src points at another checkout (e.g. a git worktree of an older
+commit) to measure that one instead.
+
+    python benchmarks/bench_idle.py [--seconds 5] [--src PATH] [--port 5099]
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC)
+
+from loadtest import spawn_server
+
+CHILD = """
+import sys, time, atexit, resource
+import pygame
+seconds, which, port = float(sys.argv[1]), sys.argv[2], int(sys.argv[3])
+if which == "menu":
+    from main_menu import MainMenu
+    ui = MainMenu()
+elif which == "app":
+    from app import App
+    ui = App(seed=1)
+else:
+    from client import BattleshipClient
+    ui = BattleshipClient(host="127.0.0.1", port=port)
+pygame.time.set_timer(pygame.QUIT, int(seconds * 1000), loops=1)
+switches = lambda: resource.getrusage(resource.RUSAGE_THREAD).ru_nvcsw
+start, wall, sleeps = time.process_time(), time.perf_counter(), switches()
+# App and the client end in sys.exit()
+atexit.register(lambda: print(time.process_time() - start, time.perf_counter() - wall, switches() - sleeps))
+ui.run()
+"""
+
+WINDOWS = [("main menu", "menu"), ("App, question card", "app"), ("client, waiting for opponent", "client")]
+
+
+def run_window(src, which, seconds, port):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    out = subprocess.run([sys.executable, "-c", CHILD, str(seconds), which, str(port)], cwd=src, env=env,
+                         stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout
+    cpu, wall, sleeps = map(float, out.split()[-3:])
+    return cpu, wall, sleeps
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--src", default=SRC, help="checkout to measure (its Src directory)")
+    parser.add_argument("--port", type=int, default=5099)
+    args = parser.parse_args()
+
+    server = spawn_server("127.0.0.1", args.port)
+    try:
+        print(f"{args.seconds:.0f} s idle per window, {os.path.abspath(args.src)}")
+        for name, which in WINDOWS:
+            cpu, wall, sleeps = run_window(args.src, which, args.seconds, args.port)
+            print(f"{name:>30} {cpu / wall * 100:5.1f}% of a core, {sleeps / wall:6.1f} wakeups/s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
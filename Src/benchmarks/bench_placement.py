@@ -0,0 +1,84 @@
+"""
+Placement benchmark: the old rejection-sampling generate_sequences against
+the placement engine, on 10x10 and 100x100 grids. Also counts how often the
+old function returned overlapping fleets on a crowded board.
+
+    python benchmarks/bench_placement.py
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from placement import sample_fleet, sample_fleets, fleet_to_colors
+from config import SEQUENCE_COLORS, SHIP_LENGTHS
+
+
+# generate_sequences from before the placement engine, kept for comparison
+def legacy_generate_sequences(grid_size, lengths, sequence_colors):
+    occupied = set()
+    cell_to_color = {}
+    for length, color in zip(lengths, sequence_colors):
+        placed = False
+        for _ in range(500):
+            orientation = random.choice(["H", "V"])
+            if orientation == "H":
+                row = random.randint(0, grid_size - 1)
+                col = random.randint(0, grid_size - length)
+                cells = [(row, col + i) for i in range(length)]
+            else:
+                row = random.randint(0, grid_size - length)
+                col = random.randint(0, grid_size - 1)
+                cells = [(row + i, col) for i in range(length)]
+            if all(c not in occupied for c in cells):
+                for c in cells:
+                    occupied.add(c)
+                    cell_to_color[c] = color
+                placed = True
+                break
+        if not placed:
+            cells = [(0, i) for i in range(length)] if orientation == "H" else [(i, 0) for i in range(length)]
+            for c in cells:
+                occupied.add(c)
+                cell_to_color[c] = color
+    return cell_to_color
+
+
+def per_call_us(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main():
+    random.seed(3)
+    print(f"{'grid':>8} {'legacy us':>10} {'engine us':>10} {'bulk fleets/s':>14}")
+    for grid, n, bulk in [(10, 20000, 1_000_000), (100, 2000, 100_000)]:
+        legacy = per_call_us(lambda: legacy_generate_sequences(grid, SHIP_LENGTHS, SEQUENCE_COLORS), n)
+        sample_fleet(grid, SHIP_LENGTHS)  # builds the placement tables once
+        sample_fleets(1, grid, SHIP_LENGTHS)
+        engine = per_call_us(lambda: fleet_to_colors(sample_fleet(grid, SHIP_LENGTHS), SEQUENCE_COLORS), n)
+        start = time.perf_counter()
+        sample_fleets(bulk, grid, SHIP_LENGTHS, rng=1)
+        rate = bulk / (time.perf_counter() - start)
+        print(f"{grid:>5}x{grid:<2} {legacy:>10.1f} {engine:>10.1f} {rate:>14.0f}")
+
+    # crowded board: 6x6 with six 5-long ships
+    lengths = [5, 5, 5, 5, 5, 5]
+    colors = SEQUENCE_COLORS * 2
+    trials = 2000
+    bad = 0
+    for _ in range(trials):
+        if len(legacy_generate_sequences(6, lengths, colors)) < sum(lengths):
+            bad += 1
+    for _ in range(trials):
+        fleet = sample_fleet(6, lengths)
+        assert len(fleet_to_colors(fleet, colors)) == sum(lengths)
+    print(f"6x6 with {lengths}: legacy overlapping fleets {bad}/{trials}, engine 0/{trials}")
+
+
+if __name__ == "__main__":
+    main()
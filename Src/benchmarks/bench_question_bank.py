@@ -0,0 +1,96 @@
+"""
+Question bank benchmark: a bank of N generated questions as a mapped
+QuestionBank file against the same questions loaded from JSON into a
+list per difficulty. Each variant runs in a fresh process and reports open
+time, draw time and memory after 100k draws, split into anonymous memory
+(private to the process) and file-backed pages (shared by every process
+mapping the bank).
+
+    python benchmarks/bench_question_bank.py [--questions 1000000]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC)
+
+from question_bank import build_question_bank, generated_rows
+
+CHILD = r"""
+import sys, time, json, random
+sys.path.insert(0, {src!r})
+kind, path, draws = sys.argv[1], sys.argv[2], int(sys.argv[3])
+
+def status():
+    fields = {{}}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            fields[key] = value.split()[0] if value.split() else "0"
+    return int(fields.get("RssAnon", 0)) / 1024, int(fields.get("RssFile", 0)) / 1024
+
+base_anon, base_file = status()
+rng = random.Random(1)
+start = time.perf_counter()
+if kind == "bank":
+    from question_bank import QuestionBank
+    bank = QuestionBank(path)
+    draw = lambda: bank.draw(rng, "extreme")
+else:
+    with open(path) as f:
+        data = json.load(f)
+    extreme = data["extreme"]
+    draw = lambda: extreme[rng.randrange(len(extreme))]
+opened = time.perf_counter() - start
+
+start = time.perf_counter()
+for _ in range(draws):
+    draw()
+per_draw = (time.perf_counter() - start) / draws
+anon, file = status()
+print(opened, per_draw, anon - base_anon, file - base_file)
+"""
+
+
+def run(kind, path, draws):
+    out = subprocess.run([sys.executable, "-c", CHILD.format(src=SRC), kind, path, str(draws)],
+                         capture_output=True, text=True, check=True).stdout
+    return [float(x) for x in out.split()]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=1_000_000)
+    parser.add_argument("--draws", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bank_path = os.path.join(tmp, "bank.qb")
+        json_path = os.path.join(tmp, "bank.json")
+
+        rows = list(generated_rows(args.questions, seed=1))
+        start = time.perf_counter()
+        build_question_bank(bank_path, rows)
+        build = time.perf_counter() - start
+        by_difficulty = {}
+        for _, difficulty, question, answer, choices in rows:
+            by_difficulty.setdefault(difficulty, []).append([question, answer, choices])
+        with open(json_path, "w") as f:
+            json.dump(by_difficulty, f)
+        del rows, by_difficulty
+
+        print(f"{args.questions} questions: bank {os.path.getsize(bank_path) / 1e6:.1f} MB "
+              f"(built in {build:.1f} s), JSON {os.path.getsize(json_path) / 1e6:.1f} MB")
+        print(f"{'':>6} {'open ms':>9} {'draw us':>8} {'anon MB':>8} {'file MB':>8}")
+        for kind, path in (("json", json_path), ("bank", bank_path)):
+            opened, per_draw, anon, file = run(kind, path, args.draws)
+            print(f"{kind:>6} {opened * 1000:>9.1f} {per_draw * 1e6:>8.2f} {anon:>8.1f} {file:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Question service benchmark: the scalar vs batch generation rate per
+difficulty, the cost per question on the turn loop of inline generation
+against the prefetched pools, and of get_question() as the rooms call it
+(inline for "simple", a pool otherwise), and a check that a seed gives the
+same question sequence with background refills.
+
+    python benchmarks/bench_quiz.py [--questions 20000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gen_questions
+from quiz import QuizManager, DIFFICULTIES
+
+SCALAR = {
+    "simple": gen_questions.generate_simple_question,
+    "multiple_choice": gen_questions.generate_multiple_choice_question,
+    "extreme": gen_questions.generate_extreme_question,
+}
+
+
+def per_call_us(fn, n, between=None):
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+        if between:
+            between()
+    samples.sort()
+    return sum(samples) / n * 1e6, samples[int(n * 0.99)] * 1e6, samples[-1] * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=20000)
+    args = parser.parse_args()
+    n = args.questions
+    rng = random.Random(1)
+
+    print(f"{'difficulty':>16} {'scalar q/s':>11} {'batch q/s':>11}  (batches of 64)")
+    for difficulty in DIFFICULTIES:
+        start = time.perf_counter()
+        for _ in range(n):
+            SCALAR[difficulty](rng)
+        scalar = n / (time.perf_counter() - start)
+        gen_questions.generate_batch(difficulty, 64, rng.getrandbits(64))
+        start = time.perf_counter()
+        for _ in range(n // 64):
+            gen_questions.generate_batch(difficulty, 64, rng.getrandbits(64))
+        batch = n // 64 * 64 / (time.perf_counter() - start)
+        print(f"{difficulty:>16} {scalar:>11,.0f} {batch:>11,.0f}")
+
+    print(f"\nper question on the turn loop, {n} calls, mean / p99 us")
+    print(f"{'difficulty':>16} {'inline':>15} {'pool, serve only':>17} {'pool + refills':>16} "
+          f"{'get_question':>16}")
+    # the sleep between calls stands in for the wait for an answer (it also
+    # leaves the caches colder than a tight loop would), same for every column
+    wait = lambda: time.sleep(0.00005)
+    for difficulty in DIFFICULTIES:
+        inline = per_call_us(lambda: SCALAR[difficulty](rng), n, wait)
+
+        # one big batch: only the serving path (next row + format)
+        pool = QuizManager(seed=2, batch_size=n + 1, low_water=0).pool(difficulty)
+        pool.refill()
+        serve = per_call_us(pool.pop, n, wait)
+
+        # normal pools: refills run on the background thread and compete for the GIL
+        pool = QuizManager(seed=2).pool(difficulty)
+        pool.refill_in_background()
+        time.sleep(0.05)
+        pooled = per_call_us(pool.pop, n, wait)
+
+        # what a room gets, recently-asked check included
+        quiz = QuizManager(seed=2)
+        quiz.prefetch(difficulty)
+        time.sleep(0.05)
+        served = per_call_us(lambda: quiz.get_question(difficulty), n, wait)
+        print(f"{difficulty:>16} {inline[0]:>7.2f} {inline[1]:>7.2f} {serve[0]:>8.2f} {serve[1]:>8.2f} "
+              f"{pooled[0]:>7.2f} {pooled[1]:>8.2f} {served[0]:>7.2f} {served[1]:>8.2f}")
+
+    # same seed, different refill timing -> same questions
+    a = QuizManager(seed=3)
+    first = [a.get_question("extreme") for _ in range(500)]
+    b = QuizManager(seed=3)
+    b.prefetch("extreme")
+    second = []
+    for i in range(500):
+        second.append(b.get_question("extreme"))
+        if i % 7 == 0:
+            time.sleep(0.001)
+    print(f"\nseeded sequence reproducible with background refills: {first == second}")
+
+
+if __name__ == "__main__":
+    main()
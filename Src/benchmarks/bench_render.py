@@ -0,0 +1,153 @@
+"""
+Board rendering benchmark on the SDL dummy video driver (no window): time
+per frame to draw one board with its ships and markers, the way App.draw
+draws the player's board: the old per-frame scale + rotate of every ship
+image, cached sprites redrawn every frame (grid and markers with
+pygame.draw), and the retained BoardLayer (one blit). Every frame starts
+by clearing the screen, as App.draw does.
+
+Then whole frames of the online client and the local App through the
+compositor (compositor.py): repainting and pushing the full window every
+frame against dirty rectangles only.
+
+    python benchmarks/bench_render.py [--frames 2000] [--shots 40]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC)
+os.chdir(SRC)  # images/ is relative
+
+import pygame
+import board_view
+from board import Board, generate_fleet
+from board_view import BoardView
+from app import WIDTH, HEIGHT, BG_COLOR, LEFT_ORIGIN
+from config import CELL_SIZE, SEQUENCE_COLORS, SHIP_LENGTHS
+
+
+def legacy_draw_ship_images(view, surface):
+    # before the sprite cache: scale (and rotate) every ship image every frame
+    ox, oy = view.origin
+    for ship in view.board.ships:
+        img = board_view.image_loader.get_ship_image(ship.length)
+        img = pygame.transform.scale(img, (CELL_SIZE, CELL_SIZE * ship.length))
+        if ship.orientation == "H":
+            img = pygame.transform.rotate(img, -90)
+        surface.blit(img, (ox + ship.col * CELL_SIZE, oy + ship.row * CELL_SIZE))
+
+
+def immediate_draw(view, surface, ship_images):
+    # before the retained layer: ships, grid lines and every marker each frame
+    ship_images(surface)
+    view.draw_grid(surface)
+    for (r, c) in view.board.misses:
+        view.draw_x(surface, r, c)
+    for (r, c) in view.board.hits:
+        view.draw_o(surface, r, c)
+
+
+def frame_ms(screen, draw, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        screen.fill(BG_COLOR)
+        draw()
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--shots", type=int, default=40, help="markers on the board")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    board_view.init_image_loader()
+
+    rng = random.Random(5)
+    board = Board(SEQUENCE_COLORS)
+    board.set_ships(generate_fleet(board.grid_size, SHIP_LENGTHS, SEQUENCE_COLORS, rng))
+    cells = [(r, c) for r in range(board.grid_size) for c in range(board.grid_size)]
+    for r, c in rng.sample(cells, args.shots):
+        index = r * board.grid_size + c
+        board.mark_index(index, bool(board.ship_mask >> index & 1))
+    view = BoardView(board, LEFT_ORIGIN, BG_COLOR)
+
+    legacy_ships = lambda surface: legacy_draw_ship_images(view, surface)
+    results = [
+        ("clear only", frame_ms(screen, lambda: None, args.frames)),
+        ("ships only: scale + rotate", frame_ms(screen, lambda: legacy_ships(screen), args.frames)),
+        ("ships only: cached", frame_ms(screen, lambda: view.draw_ship_images(screen), args.frames)),
+        ("board: scale + rotate", frame_ms(screen, lambda: immediate_draw(view, screen, legacy_ships),
+                                          args.frames)),
+        ("board: cached sprites", frame_ms(screen, lambda: immediate_draw(view, screen, view.draw_ship_images),
+                                           args.frames)),
+        ("board: retained layer", frame_ms(screen, lambda: view.draw(screen, show_ships=True), args.frames)),
+    ]
+    print(f"{board.grid_size}x{board.grid_size}, {len(board.ships)} ships, {args.shots} markers, "
+          f"{args.frames} frames (SDL dummy driver)")
+    for name, ms in results:
+        print(f"{name:>28} {ms:8.3f} ms/frame")
+
+    # cost of one new shot on the retained layer (stamp) and of a full rebuild
+    layer = view.layers[True]
+    free = [cell for cell in cells if not board.shot_mask >> (cell[0] * board.grid_size + cell[1]) & 1]
+    start = time.perf_counter()
+    for r, c in free:
+        index = r * board.grid_size + c
+        board.mark_index(index, bool(board.ship_mask >> index & 1))
+        layer.update()
+    stamp = (time.perf_counter() - start) / max(len(free), 1) * 1000
+    start = time.perf_counter()
+    for _ in range(100):
+        layer.rebuild(layer.key)
+    rebuild = (time.perf_counter() - start) / 100 * 1000
+    print(f"retained layer: stamp one shot {stamp:.3f} ms, full rebuild {rebuild:.3f} ms")
+
+    compositor_frames(args.frames)
+    pygame.quit()
+
+
+def compositor_frames(frames):
+    from app import App
+    from client import BattleshipClient
+    from network_utils import serialize_board
+
+    # animations read pygame.time.get_ticks(); step it by 16 ms per frame as at 60 fps
+    ticks = [pygame.time.get_ticks()]
+    real_get_ticks = pygame.time.get_ticks
+    pygame.time.get_ticks = lambda: ticks[0]
+
+    def per_frame(ui, full):
+        start = time.perf_counter()
+        for _ in range(frames):
+            ticks[0] += 16
+            if full:
+                ui.compositor.invalidate()
+            ui.draw()
+        return (time.perf_counter() - start) / frames * 1000
+
+    client = BattleshipClient()
+    app = App(seed=1)
+    mine, theirs = (serialize_board(p.board, show_ships=i == 0) for i, p in enumerate(app.game.players))
+    client.player_name = "Player 1"
+    client.handle_message({'type': 'game_start', 'your_board': mine, 'opponent_board': theirs, 'grid_size': 10})
+    app.ask_question()
+    app.on_correct_answer()
+    app.show_shot_result(app.game.process_shot((0, 0)))  # HUD badge pulses from now on
+    print(f"{'whole frame':>28} {'full ms':>8} {'dirty ms':>8}")
+    for name, ui in [("client, waiting for turn", client), ("App, result badge pulsing", app)]:
+        full, dirty = per_frame(ui, True), per_frame(ui, False)
+        print(f"{name:>28} {full:8.3f} {dirty:8.3f}")
+    pygame.time.get_ticks = real_get_ticks
+
+
+if __name__ == "__main__":
+    main()
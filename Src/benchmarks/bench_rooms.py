@@ -0,0 +1,65 @@
+"""
+Rooms-per-process benchmark for the multi-room server.
+
+Starts `server.py` in a child process, opens two bot connections per match
+and keeps every match busy with loadtest.py bots that answer correctly and
+shoot at once (they reconnect when a match ends, so the room count stays
+constant). Reports the server's RSS per room, turns/sec and the round-trip
+latency of every request in a turn (answer -> answer_result, shot ->
+shot_result).
+
+    python benchmarks/bench_rooms.py --matches 1000 10000
+"""
+import os
+import sys
+import asyncio
+import argparse
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC)
+
+import codec
+from loadtest import run_load, spawn_server, raise_fd_limit, percentile
+
+
+def rss_kb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--matches", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=5600)
+    parser.add_argument("--codec", default=codec.JSON, choices=codec.SUPPORTED_CODECS)
+    args = parser.parse_args()
+
+    hard = raise_fd_limit(max(args.matches) * 2 + 64)
+
+    print(f"{'matches':>8} {'rss MB':>8} {'KB/room':>8} {'turns/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for matches in args.matches:
+        if matches * 2 + 16 > hard:
+            print(f"{matches:>8} skipped: needs {matches * 2} sockets per process, RLIMIT_NOFILE is {hard}")
+            continue
+        server = spawn_server("127.0.0.1", args.port)
+        try:
+            idle_rss = rss_kb(server.pid)
+            stats, elapsed = asyncio.run(run_load("127.0.0.1", args.port, matches * 2, args.duration,
+                                                  codec_name=args.codec))
+            busy_rss = rss_kb(server.pid)
+        finally:
+            server.terminate()
+            server.wait()
+
+        lat = stats.latencies
+        print(f"{matches:>8} {busy_rss / 1024:>8.1f} {(busy_rss - idle_rss) / matches:>8.1f} "
+              f"{stats.turns / elapsed:>9.0f} {percentile(lat, 0.50) * 1000:>8.2f} "
+              f"{percentile(lat, 0.99) * 1000:>8.2f} {sum(stats.errors.values()):>7}")
+
+
+if __name__ == "__main__":
+    main()
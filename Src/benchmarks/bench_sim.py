@@ -0,0 +1,85 @@
+"""
+Batch simulator benchmark: games per minute on one core for the vectorized
+engine against the scalar Game, and agreement of their statistics
+(mean turns, hit rate, first-player win share) under the same model, for
+SHIP_LENGTHS and for a fleet longer than the colour list (--long-fleet),
+where the scalar Game must still place every ship.
+
+    python benchmarks/bench_sim.py [--games 200000] [--scalar-games 5000] [--accuracy 0.8]
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from batch_sim import simulate, simulate_scalar, HuntTargetPolicy
+from config import SEQUENCE_COLORS
+from game import Game
+
+
+def summary(stats):
+    # (mean, standard error) per statistic
+    winner0 = (stats['winner'] == 0).astype(float)
+    turns = stats['turns'].astype(float)
+    hit_rate = stats['hit_rate'].mean(axis=1)
+    return {name: (x.mean(), x.std() / np.sqrt(len(x)))
+            for name, x in (('turns', turns), ('hit rate', hit_rate), ('p0 wins', winner0))}
+
+
+def compare(scalar, batch):
+    print(f"{'':>10} {'scalar':>18} {'batch':>18} {'z':>6}")
+    s, b = summary(scalar), summary(batch)
+    for name in s:
+        (sm, se), (bm, be) = s[name], b[name]
+        z = (sm - bm) / np.hypot(se, be)
+        print(f"{name:>10} {sm:>10.3f} ±{se:<7.3f} {bm:>10.3f} ±{be:<7.3f} {z:>6.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=200_000)
+    parser.add_argument("--scalar-games", type=int, default=5000)
+    parser.add_argument("--accuracy", type=float, default=0.8)
+    parser.add_argument("--long-fleet", type=int, nargs="+", default=[2, 2, 3, 3, 5, 4, 4],
+                        help=f"ship lengths, more than the {len(SEQUENCE_COLORS)} colours")
+    args = parser.parse_args()
+
+    simulate(1000, accuracy=args.accuracy, seed=0)  # placement tables
+    start = time.perf_counter()
+    batch = simulate(args.games, accuracy=args.accuracy, seed=1)
+    batch_t = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scalar = simulate_scalar(args.scalar_games, accuracy=args.accuracy, seed=1)
+    scalar_t = time.perf_counter() - start
+
+    start = time.perf_counter()
+    hunt = simulate(args.games, accuracy=args.accuracy, policy=HuntTargetPolicy(), seed=2)
+    hunt_t = time.perf_counter() - start
+
+    print(f"accuracy {args.accuracy}")
+    print(f"{'':>16} {'games':>8} {'games/min':>12}")
+    print(f"{'scalar Game':>16} {args.scalar_games:>8} {args.scalar_games / scalar_t * 60:>12,.0f}")
+    print(f"{'batch random':>16} {args.games:>8} {args.games / batch_t * 60:>12,.0f}")
+    print(f"{'batch hunt':>16} {args.games:>8} {args.games / hunt_t * 60:>12,.0f}")
+
+    print()
+    compare(scalar, batch)
+
+    lengths = args.long_fleet
+    game = Game(["Player 1", "Player 2"], SEQUENCE_COLORS, ship_lengths=lengths, seed=3)
+    placed = [ship.length for ship in game.players[0].board.ships]
+    assert placed == lengths, f"Game placed {placed}, expected {lengths}"
+    print(f"\nfleet {lengths} ({len(lengths)} ships, {len(SEQUENCE_COLORS)} colours)")
+    compare(simulate_scalar(args.scalar_games // 5, ship_lengths=lengths, accuracy=args.accuracy, seed=4),
+            simulate(args.games // 10, ship_lengths=lengths, accuracy=args.accuracy, seed=5))
+    print(f"\nhunt/target: mean turns {hunt['turns'].mean():.1f} "
+          f"(random {batch['turns'].mean():.1f}), hit rate {hunt['hit_rate'].mean():.3f}")
+
+
+if __name__ == "__main__":
+    main()
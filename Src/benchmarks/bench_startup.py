@@ -0,0 +1,61 @@
+"""
+Startup cost of the headless server entry point: wall time to import
+`server` and build one GameRoom's Game, and the peak RSS of that process.
+Each run is a fresh interpreter; a run that fails stops the benchmark.
+
+--src points at another checkout (e.g. a git worktree of an older
+commit) to measure that one instead.
+
+    python benchmarks/bench_startup.py [--runs 10] [--src PATH]
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import time, sys
+start = time.perf_counter()
+import server
+from game import Game
+from config import SEQUENCE_COLORS, SHIP_LENGTHS
+Game(["Player 1", "Player 2"], SEQUENCE_COLORS, ship_lengths=SHIP_LENGTHS)
+print(time.perf_counter() - start, 'pygame' in sys.modules)
+"""
+
+
+def run_once(src):
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    proc = subprocess.Popen([sys.executable, "-c", CHILD], cwd=src, env=env,
+                            stdout=subprocess.PIPE, text=True)
+    with proc.stdout:
+        out = proc.stdout.read()
+    # wait4 for the child's own rusage; Popen must learn the real exit status
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode != 0:
+        sys.exit(f"child in {src} exited with {proc.returncode}")
+    seconds, pygame_loaded = out.split()
+    return float(seconds), usage.ru_maxrss / 1024, pygame_loaded == "True"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--src", default=SRC, help="checkout to measure (its Src directory)")
+    args = parser.parse_args()
+
+    results = [run_once(args.src) for _ in range(args.runs)]
+    times = [r[0] * 1000 for r in results]
+    rss = [r[1] for r in results]
+    print(f"{os.path.abspath(args.src)}, {args.runs} runs")
+    print(f"import server + Game: median {statistics.median(times):.1f} ms, "
+          f"peak RSS median {statistics.median(rss):.1f} MB, pygame loaded: {results[0][2]}")
+
+
+if __name__ == "__main__":
+    main()
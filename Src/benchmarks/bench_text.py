@@ -0,0 +1,84 @@
+"""
+Text drawing with and without the shared text cache (text_cache.py), SDL
+dummy video driver: ms per frame for the HUD, a visible toast, the
+question card and the main menu's buttons, each drawn the way their
+draw() runs every frame, plus the cache hit rate over the cached run.
+
+    python benchmarks/bench_text.py [--frames 2000]
+"""
+import os
+import sys
+import time
+import argparse
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC)
+os.chdir(SRC)
+
+import pygame
+import text_cache
+from app import App
+from main_menu import MainMenu
+
+QUESTION = "Which planet in our solar system has the largest number of known moons orbiting it?"
+
+
+def draw_menu(menu):
+    # the body of MainMenu.run, minus the event loop
+    menu.screen.fill(menu.BG_COLOR)
+    menu.draw_text("Battleship", menu.font_title, menu.TEXT_COLOR, (menu.screen.get_width() // 2, 140))
+    for rect, text in [(menu.start_rect, "Start Game"), (menu.computer_rect, "vs Computer"),
+                       (menu.test_rect, "Multiplayer"), (menu.quit_rect, "Quit")]:
+        menu.draw_button(rect, text, (0, 0))
+
+
+def frame_ms(draw, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        draw()
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=2000)
+    args = parser.parse_args()
+
+    app = App(seed=1)
+    app.hud.set_status(True, "Hit!")
+    app.question_card.set_input("Saturn")
+    menu = MainMenu()
+    app.screen = pygame.display.get_surface()
+
+    # hold the clock inside the toast's visible phase so every frame draws it
+    now = pygame.time.get_ticks()
+    real_get_ticks = pygame.time.get_ticks
+    pygame.time.get_ticks = lambda: now
+    app.toast.show("Correct! Take your shot.", positive=True)
+    pygame.time.get_ticks = lambda: now + 600
+
+    parts = [
+        ("HUD", app.hud.draw),
+        ("toast", app.toast.draw),
+        ("question card", lambda: app.question_card.draw(QUESTION, (app.screen.get_width() // 2, 300))),
+        ("main menu", lambda: draw_menu(menu)),
+    ]
+    print(f"{'':>14} {'uncached':>9} {'cached':>9}  ms/frame, {args.frames} frames")
+    cache = text_cache.cache
+    for name, draw in parts:
+        cache.max_surfaces = cache.max_layouts = 0
+        app.toast._layout_for = None
+        uncached = frame_ms(draw, args.frames)
+        cache.max_surfaces, cache.max_layouts = text_cache.MAX_SURFACES, text_cache.MAX_LAYOUTS
+        cache.clear()
+        app.toast._layout_for = None
+        cached = frame_ms(draw, args.frames)
+        print(f"{name:>14} {uncached:9.3f} {cached:9.3f}  hit rate {cache.hit_rate() * 100:.1f}%")
+    pygame.time.get_ticks = real_get_ticks
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# bitboard.py
+"""
+Integer bitmask helpers for the board: cell (r, c) on a grid of size g is
+bit r * g + c. Python ints grow as needed, so the same code serves 10x10
+and 100x100 grids.
+"""
+from collections.abc import Set
+
+
+def cell_index(cell, grid_size):
+    return cell[0] * grid_size + cell[1]
+
+
+def cells_to_mask(cells, grid_size):
+    mask = 0
+    for r, c in cells:
+        mask |= 1 << (r * grid_size + c)
+    return mask
+
+
+def iter_bits(mask):
+    # indices of set bits, lowest first
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def iter_cells(mask, grid_size):
+    for i in iter_bits(mask):
+        yield divmod(i, grid_size)
+
+
+class CellSetView(Set):
+    """
+    Read-mostly set of (row, col) cells backed by one of a Board's masks,
+    so board.hits / board.misses keep working like the old sets.
+    add() goes through Board.mark so seq and the state hash stay correct.
+    """
+    __slots__ = ('board', 'hit')
+
+    def __init__(self, board, hit):
+        self.board = board
+        self.hit = hit
+
+    def _mask(self):
+        return self.board.hit_mask if self.hit else self.board.miss_mask
+
+    def __contains__(self, cell):
+        board = self.board
+        if not board.in_bounds(cell):
+            return False
+        return bool(self._mask() >> (cell[0] * board.grid_size + cell[1]) & 1)
+
+    def __iter__(self):
+        return iter_cells(self._mask(), self.board.grid_size)
+
+    def __len__(self):
+        return self._mask().bit_count()
+
+    def add(self, cell):
+        if cell not in self.board.hits and cell not in self.board.misses:
+            self.board.mark(cell, self.hit)
+
+    def __repr__(self):
+        return f"{{{', '.join(map(str, self))}}}"
@@ -1,218 +1,182 @@
-import pygame
+# board.py
+# Board model: ships, hits and misses, no pygame (drawing lives in board_view.py)
 import random
-from image_loader import ImageLoader
-
-# --- config ---
-GRID_SIZE = 10
-CELL_SIZE = 48
-LINE_WIDTH = 2
-X_MARGIN = 8
-BG_COLOR = (245, 245, 245)
-GRID_COLOR = (30, 30, 30)
-X_COLOR = (200, 40, 40)
-O_COLOR = (40, 120, 200)
-
-
-GRID_PIXELS = GRID_SIZE * CELL_SIZE
-
-image_loader = None
-
-def init_image_loader():
-    global image_loader
-    if image_loader is None:
-        image_loader = ImageLoader()
-
-def generate_sequences(grid_size, lengths, sequence_colors):
-    # Randomly generate ship-like colored sequences.
-    occupied = set()
-    cell_to_color = {}
-
-    for length, color in zip(lengths, sequence_colors):
-        placed = False
-        for _ in range(500):
-            orientation = random.choice(["H", "V"])
-            if orientation == "H":
-                row = random.randint(0, grid_size - 1)
-                col = random.randint(0, grid_size - length)
-                cells = [(row, col + i) for i in range(length)]
-            else:
-                row = random.randint(0, grid_size - length)
-                col = random.randint(0, grid_size - 1)
-                cells = [(row + i, col) for i in range(length)]
-
-            if all(c not in occupied for c in cells):
-                for c in cells:
-                    occupied.add(c)
-                    cell_to_color[c] = color
-                placed = True
-                break
-
-        if not placed:
-            # fallback placement
-            cells = [(0, i) for i in range(length)] if orientation == "H" else [(i, 0) for i in range(length)]
-            for c in cells:
-                occupied.add(c)
-                cell_to_color[c] = color
-
-    return cell_to_color
+import functools
+import itertools
+from bitboard import CellSetView, cells_to_mask, iter_bits
+from placement import sample_fleet
+from config import GRID_SIZE
+
+
+class Ship:
+    """One ship on a board: id (its index in Board.ships), origin, 'H' or 'V', length, colour, bitmask."""
+    __slots__ = ('id', 'row', 'col', 'orientation', 'length', 'color', 'mask')
+
+    def __init__(self, id, row, col, orientation, length, color, grid_size):
+        self.id = id
+        self.row = row
+        self.col = col
+        self.orientation = orientation
+        self.length = length
+        self.color = color
+        self.mask = cells_to_mask(self.cells(), grid_size)
+
+    def cells(self):
+        if self.orientation == "H":
+            return [(self.row, self.col + i) for i in range(self.length)]
+        return [(self.row + i, self.col) for i in range(self.length)]
+
+    def __repr__(self):
+        return f"Ship({self.id}, {self.row}, {self.col}, {self.orientation!r}, {self.length})"
+
+
+def generate_fleet(grid_size, lengths, sequence_colors, rng=random):
+    # Random non-overlapping fleet (see placement.sample_fleet), one Ship per length;
+    # colours repeat when there are more ships than colours
+    return [Ship(i, p.row, p.col, p.orientation, p.length, color, grid_size)
+            for i, (p, color) in enumerate(zip(sample_fleet(grid_size, lengths, rng),
+                                               itertools.cycle(sequence_colors)))]
+
+
+MASK64 = (1 << 64) - 1
+
+def cell_hash(index, hit):
+    # splitmix64 of (cell, outcome); a board's hash is the XOR over all shot cells,
+    # so it can be updated per shot and recomputed from a snapshot
+    z = ((index * 2 + hit + 1) * 0x9E3779B97F4A7C15) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+@functools.lru_cache(maxsize=None)
+def cell_hash_table(grid_size):
+    # cell_hash for every (index, outcome), at [index * 2 + hit]
+    return [cell_hash(i >> 1, i & 1) for i in range(grid_size * grid_size * 2)]
 
 
 class Board:
-    def __init__(self, origin, sequence_colors):
-        self.origin = origin
+    """
+    Ships, hits and misses are kept as integer bitmasks (see bitboard.py);
+    hits / misses are set-like views over them, so code using the old sets
+    keeps working. Each ship is a Ship in self.ships, and ship_ids maps
+    every cell index to the id of the ship on it (-1 for water).
+    hits_left counts the unhit cells of every ship and ships_afloat the
+    ships with any left, so sinking and winning are O(1) per shot.
+    """
+    def __init__(self, sequence_colors, grid_size=GRID_SIZE):
         self.sequence_colors = sequence_colors
-        self.hits = set()
-        self.misses = set()
-        self.cells_with_colors = {}
-
-    def set_cells(self, cell_to_color):
-        # Assigns pre-generated ship/sequence colors to board cells.
-        self.cells_with_colors = cell_to_color
-
-    def cell_from_pos(self, pos):
-        # Returns (row, col) of cell if click is inside this board.
-        x, y = pos
-        ox, oy = self.origin
-        gx, gy = x - ox, y - oy
-        if 0 <= gx < GRID_PIXELS and 0 <= gy < GRID_PIXELS:
-            col = gx // CELL_SIZE
-            row = gy // CELL_SIZE
-            return (int(row), int(col))
-        return None
-
-    def handle_click(self, pos):
-        # Registers a hit or miss based on click position.
-        cell = self.cell_from_pos(pos)
-        if cell is None:
-            return
-        if cell in self.cells_with_colors:
-            self.hits.add(cell)
-        else:
-            self.misses.add(cell)
-
-    def draw_grid(self, surface):
-        ox, oy = self.origin
-        for c in range(GRID_SIZE + 1):
-            x = ox + c * CELL_SIZE
-            pygame.draw.line(surface, GRID_COLOR, (x, oy), (x, oy + GRID_PIXELS), LINE_WIDTH)
-        for r in range(GRID_SIZE + 1):
-            y = oy + r * CELL_SIZE
-            pygame.draw.line(surface, GRID_COLOR, (ox, y), (ox + GRID_PIXELS, y), LINE_WIDTH)
-
-    def draw_cell_fill(self, surface, row, col, color):
-        ox, oy = self.origin
-        rect = pygame.Rect(
-            ox + col * CELL_SIZE + 1,
-            oy + row * CELL_SIZE + 1,
-            CELL_SIZE - 2,
-            CELL_SIZE - 2,
-        )
-        pygame.draw.rect(surface, color, rect)
-
-    def draw_x(self, surface, row, col):
-        ox, oy = self.origin
-        x0 = ox + col * CELL_SIZE + X_MARGIN
-        y0 = oy + row * CELL_SIZE + X_MARGIN
-        x1 = ox + (col + 1) * CELL_SIZE - X_MARGIN
-        y1 = oy + (row + 1) * CELL_SIZE - X_MARGIN
-        pygame.draw.line(surface, X_COLOR, (x0, y0), (x1, y1), LINE_WIDTH + 2)
-        pygame.draw.line(surface, X_COLOR, (x0, y1), (x1, y0), LINE_WIDTH + 2)
-
-    def draw_o(self, surface, row, col):
-        ox, oy = self.origin
-        cx = ox + col * CELL_SIZE + CELL_SIZE // 2
-        cy = oy + row * CELL_SIZE + CELL_SIZE // 2
-        radius = CELL_SIZE // 2 - X_MARGIN
-        pygame.draw.circle(surface, O_COLOR, (cx, cy), radius, LINE_WIDTH + 2)
-
-    def draw_ship_images(self, surface):
-        if image_loader is None:
-            init_image_loader()
-        
-        ships = self.group_ships()
-        
-        for ship_cells in ships:
-            if not ship_cells:
-                continue
-            
-            ship_length = len(ship_cells)
-            img = image_loader.get_ship_image(ship_length)
-            
-            if img is None:
-                # Fallback
-                for (r, c) in ship_cells:
-                    color = self.cells_with_colors.get((r, c))
-                    if color:
-                        self.draw_cell_fill(surface, r, c, color)
-                continue
-            
-            # orientacija, pozicija
-            ship_cells = sorted(ship_cells)
-            first_cell = ship_cells[0]
-
-            is_horizontal = all(r == first_cell[0] for r, c in ship_cells)
-
-            ox, oy = self.origin
-
-            if is_horizontal:
-                img_resized = pygame.transform.scale(img, (CELL_SIZE, CELL_SIZE * ship_length))
-                img_resized = pygame.transform.rotate(img_resized, -90)
-                x = ox + first_cell[1] * CELL_SIZE
-                y = oy + first_cell[0] * CELL_SIZE
-            else:
-                img_resized = pygame.transform.scale(img, (CELL_SIZE, CELL_SIZE * ship_length))
-                x = ox + first_cell[1] * CELL_SIZE
-                y = oy + first_cell[0] * CELL_SIZE
-
-            surface.blit(img_resized, (x, y))
-
-
-
-    # grupiraj celice v ladje
-    def group_ships(self):
-        visited = set()
-        ships = []
-        
-        for cell in self.cells_with_colors:
-            if cell in visited:
-                continue
-            
-            # najdi povezane celice
-            ship = []
-            color = self.cells_with_colors[cell]
-            stack = [cell]
-            
-            while stack:
-                current = stack.pop()
-                if current in visited:
-                    continue
-                
-                if current in self.cells_with_colors and self.cells_with_colors[current] == color:
-                    visited.add(current)
-                    ship.append(current)
-                    
-                    r, c = current
-                    # preveri adjacent celice
-                    for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                        neighbor = (r + dr, c + dc)
-                        if neighbor not in visited:
-                            stack.append(neighbor)
-            
-            if ship:
-                ships.append(ship)
-        
-        return ships
-
-
-    def draw(self, surface, show_ships=False):
-        if show_ships:
-            self.draw_ship_images(surface)
-
-
-        self.draw_grid(surface)
-
-        # Draw hits/misses
-        for (r, c) in self.misses:
-            self.draw_x(surface, r, c)
-        for (r, c) in self.hits:
-            self.draw_o(surface, r, c)
+        self.grid_size = grid_size
+        self.hit_mask = 0
+        self.miss_mask = 0
+        self.shot_mask = 0  # hit_mask | miss_mask
+        self.shot_cells = bytearray(grid_size * grid_size)  # 1 per shot cell: O(1) test on any grid
+        self.ship_mask = 0
+        self.ships = []
+        self.ship_masks = []  # one mask per ship, by id
+        self.ship_ids = [-1] * (grid_size * grid_size)
+        self.hits_left = []  # per ship id
+        self.ships_afloat = 0
+        self.seq = 0         # number of recorded shots
+        self.state_hash = 0  # running hash of hits/misses
+        self._hash_table = cell_hash_table(grid_size)
+
+    @property
+    def hits(self):
+        return CellSetView(self, True)
+
+    @hits.setter
+    def hits(self, cells):
+        self.reset_state(cells, list(self.misses))
+
+    @property
+    def misses(self):
+        return CellSetView(self, False)
+
+    @misses.setter
+    def misses(self, cells):
+        self.reset_state(list(self.hits), cells)
+
+    def set_ships(self, ships):
+        # Places the fleet; ship ids are renumbered to their index.
+        self.ships = list(ships)
+        self.ship_ids = [-1] * (self.grid_size * self.grid_size)
+        self.ship_mask = 0
+        for i, ship in enumerate(self.ships):
+            ship.id = i
+            self.ship_mask |= ship.mask
+            for index in iter_bits(ship.mask):
+                self.ship_ids[index] = i
+        self.ship_masks = [ship.mask for ship in self.ships]
+        self._count_hits_left()
+
+    def _count_hits_left(self):
+        self.hits_left = [ship.length - (self.hit_mask & ship.mask).bit_count() for ship in self.ships]
+        self.ships_afloat = sum(1 for left in self.hits_left if left)
+
+    def ship_at(self, index):
+        # Ship covering cell index, or None
+        i = self.ship_ids[index]
+        return self.ships[i] if i >= 0 else None
+
+    def ship_mask_at(self, index):
+        # mask of the ship covering cell index, or 0
+        i = self.ship_ids[index]
+        return self.ship_masks[i] if i >= 0 else 0
+
+    def is_sunk(self, ship_mask):
+        return ship_mask != 0 and self.hit_mask & ship_mask == ship_mask
+
+    def sunk_ship_masks(self):
+        return [m for m, left in zip(self.ship_masks, self.hits_left) if not left]
+
+    def all_sunk(self):
+        return bool(self.ships) and self.ships_afloat == 0
+
+    def in_bounds(self, cell):
+        try:
+            r, c = cell
+        except (TypeError, ValueError):
+            return False
+        return isinstance(r, int) and isinstance(c, int) and 0 <= r < self.grid_size and 0 <= c < self.grid_size
+
+    def mark(self, cell, hit):
+        # Records one shot and updates seq/state_hash incrementally.
+        self.mark_index(cell[0] * self.grid_size + cell[1], hit)
+
+    def mark_index(self, index, hit):
+        # Returns the Ship this shot sank, else None (the cell must not be shot yet).
+        bit = 1 << index
+        self.shot_mask |= bit
+        self.shot_cells[index] = 1
+        self.seq += 1
+        self.state_hash ^= self._hash_table[index * 2 + hit]
+        if not hit:
+            self.miss_mask |= bit
+            return None
+        self.hit_mask |= bit
+        i = self.ship_ids[index]
+        if i < 0:
+            return None  # e.g. the opponent's board on a client, ships unknown
+        self.hits_left[i] -= 1
+        if self.hits_left[i]:
+            return None
+        self.ships_afloat -= 1
+        return self.ships[i]
+
+    def reset_state(self, hits, misses):
+        # Replaces all hits/misses (e.g. from a snapshot) and recomputes the hash.
+        self.hit_mask = cells_to_mask(hits, self.grid_size)
+        self.miss_mask = cells_to_mask(misses, self.grid_size)
+        self.shot_mask = self.hit_mask | self.miss_mask
+        self.shot_cells = bytearray(self.grid_size * self.grid_size)
+        for i in iter_bits(self.shot_mask):
+            self.shot_cells[i] = 1
+        self.seq = self.hit_mask.bit_count() + self.miss_mask.bit_count()
+        table = self._hash_table
+        h = 0
+        for i in iter_bits(self.hit_mask):
+            h ^= table[i * 2 + 1]
+        for i in iter_bits(self.miss_mask):
+            h ^= table[i * 2]
+        self.state_hash = h
+        self._count_hits_left()
@@ -0,0 +1,192 @@
+# board_view.py
+# pygame rendering of a board model (board.py)
+import pygame
+from image_loader import ImageLoader, display_key
+from bitboard import iter_bits
+from config import CELL_SIZE, LINE_WIDTH, X_MARGIN, GRID_COLOR, X_COLOR, O_COLOR
+
+image_loader = None
+
+def init_image_loader():
+    global image_loader
+    if image_loader is None:
+        image_loader = ImageLoader()
+        image_loader.build_sprites(CELL_SIZE)
+
+
+_markers = {}
+
+def marker_sprites():
+    # (miss X, hit O) drawn once on transparent cell-sized surfaces
+    key = display_key()
+    if _markers.get('key') != key or 'x' not in _markers:
+        sprites = []
+        view = BoardView(None, (0, 0))
+        for draw in (view.draw_x, view.draw_o):
+            sprite = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
+            draw(sprite, 0, 0)
+            sprites.append(sprite.convert_alpha() if key is not None else sprite)
+        _markers.update(key=key, x=sprites[0], o=sprites[1])
+    return _markers['x'], _markers['o']
+
+
+class BoardLayer:
+    """
+    Off-screen image of a board: grid (and ships) drawn once, then every
+    new hit or miss is stamped on as a marker sprite. Drawn in board-local
+    coordinates, so moving the view needs no redraw. Rebuilt only when the
+    display changes, the fleet is replaced or shots disappear (a snapshot).
+    With the view's background colour set the layer is opaque, which is
+    much cheaper to blit than a transparent one.
+    """
+    def __init__(self, view, show_ships):
+        self.view = view
+        self.show_ships = show_ships
+        self.surface = None
+        self.key = None
+        self.hit_mask = 0   # markers already stamped
+        self.miss_mask = 0
+
+    def rebuild(self, key):
+        view = self.view
+        pixels = view.grid_pixels + LINE_WIDTH
+        background = view.background
+        self.surface = pygame.Surface((pixels, pixels), 0 if background else pygame.SRCALPHA)
+        if background:
+            self.surface.fill(background)
+        if self.show_ships:
+            view.draw_ship_images(self.surface, origin=(0, 0))
+        view.draw_grid(self.surface, origin=(0, 0))
+        if key[0] is not None:
+            self.surface = self.surface.convert() if background else self.surface.convert_alpha()
+        self.key = key
+        self.hit_mask = self.miss_mask = 0
+
+    def update(self):
+        board = self.view.board
+        key = (display_key(), (id(board.ships), board.ship_mask) if self.show_ships else None)
+        if (self.surface is None or key != self.key
+                or self.hit_mask & ~board.hit_mask or self.miss_mask & ~board.miss_mask):
+            self.rebuild(key)
+        new_misses = board.miss_mask & ~self.miss_mask
+        new_hits = board.hit_mask & ~self.hit_mask
+        if new_misses or new_hits:
+            x, o = marker_sprites()
+            grid = board.grid_size
+            for mask, sprite in ((new_misses, x), (new_hits, o)):
+                for index in iter_bits(mask):
+                    row, col = divmod(index, grid)
+                    self.surface.blit(sprite, (col * CELL_SIZE, row * CELL_SIZE))
+            self.miss_mask = board.miss_mask
+            self.hit_mask = board.hit_mask
+        return self.surface
+
+
+class BoardView:
+    """Draws a Board at a screen origin and maps clicks to its cells."""
+    def __init__(self, board, origin, background=None):
+        self.board = board
+        self.origin = origin
+        self.background = background  # colour behind the board, if it is a solid one
+        self.layers = {}  # show_ships -> BoardLayer
+
+    @property
+    def grid_pixels(self):
+        return self.board.grid_size * CELL_SIZE
+
+    @property
+    def rect(self):
+        # screen area draw() paints
+        pixels = self.grid_pixels + LINE_WIDTH
+        return pygame.Rect(self.origin, (pixels, pixels))
+
+    def render_key(self, show_ships=False):
+        # position, board state and, when shown, the fleet
+        board = self.board
+        return (self.origin, show_ships, board.seq, board.state_hash,
+                (id(board.ships), board.ship_mask) if show_ships else None)
+
+    def cell_from_pos(self, pos):
+        # Returns (row, col) of cell if click is inside this board.
+        x, y = pos
+        ox, oy = self.origin
+        gx, gy = x - ox, y - oy
+        if 0 <= gx < self.grid_pixels and 0 <= gy < self.grid_pixels:
+            col = gx // CELL_SIZE
+            row = gy // CELL_SIZE
+            return (int(row), int(col))
+        return None
+
+    def handle_click(self, pos):
+        # Registers a hit or miss based on click position.
+        cell = self.cell_from_pos(pos)
+        if cell is None:
+            return
+        board = self.board
+        index = cell[0] * board.grid_size + cell[1]
+        if board.shot_mask >> index & 1:
+            return
+        board.mark_index(index, bool(board.ship_mask >> index & 1))
+
+    def draw_grid(self, surface, origin=None):
+        ox, oy = origin or self.origin
+        size = self.board.grid_size
+        pixels = self.grid_pixels
+        for c in range(size + 1):
+            x = ox + c * CELL_SIZE
+            pygame.draw.line(surface, GRID_COLOR, (x, oy), (x, oy + pixels), LINE_WIDTH)
+        for r in range(size + 1):
+            y = oy + r * CELL_SIZE
+            pygame.draw.line(surface, GRID_COLOR, (ox, y), (ox + pixels, y), LINE_WIDTH)
+
+    def draw_cell_fill(self, surface, row, col, color, origin=None):
+        ox, oy = origin or self.origin
+        rect = pygame.Rect(
+            ox + col * CELL_SIZE + 1,
+            oy + row * CELL_SIZE + 1,
+            CELL_SIZE - 2,
+            CELL_SIZE - 2,
+        )
+        pygame.draw.rect(surface, color, rect)
+
+    def draw_x(self, surface, row, col, origin=None):
+        ox, oy = origin or self.origin
+        x0 = ox + col * CELL_SIZE + X_MARGIN
+        y0 = oy + row * CELL_SIZE + X_MARGIN
+        x1 = ox + (col + 1) * CELL_SIZE - X_MARGIN
+        y1 = oy + (row + 1) * CELL_SIZE - X_MARGIN
+        pygame.draw.line(surface, X_COLOR, (x0, y0), (x1, y1), LINE_WIDTH + 2)
+        pygame.draw.line(surface, X_COLOR, (x0, y1), (x1, y0), LINE_WIDTH + 2)
+
+    def draw_o(self, surface, row, col, origin=None):
+        ox, oy = origin or self.origin
+        cx = ox + col * CELL_SIZE + CELL_SIZE // 2
+        cy = oy + row * CELL_SIZE + CELL_SIZE // 2
+        radius = CELL_SIZE // 2 - X_MARGIN
+        pygame.draw.circle(surface, O_COLOR, (cx, cy), radius, LINE_WIDTH + 2)
+
+    def draw_ship_images(self, surface, origin=None):
+        if image_loader is None:
+            init_image_loader()
+        
+        ox, oy = origin or self.origin
+        for ship in self.board.ships:
+            # scaled + rotated once, see ImageLoader.get_ship_sprite
+            sprite = image_loader.get_ship_sprite(ship.length, ship.orientation, CELL_SIZE)
+
+            if sprite is None:
+                # Fallback
+                for (r, c) in ship.cells():
+                    self.draw_cell_fill(surface, r, c, ship.color, origin)
+                continue
+
+            surface.blit(sprite, (ox + ship.col * CELL_SIZE, oy + ship.row * CELL_SIZE))
+
+
+
+    def draw(self, surface, show_ships=False):
+        # one blit of the retained layer, see BoardLayer
+        layer = self.layers.get(show_ships)
+        if layer is None:
+            layer = self.layers[show_ships] = BoardLayer(self, show_ships)
+        surface.blit(layer.update(), self.origin)
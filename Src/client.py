@@ -1,12 +1,21 @@
 import pygame
-import sys
 import socket
 import threading
+import collections
 from board import Board
-from config import (GRID_PIXELS, SEQUENCE_COLORS, COLOR_BG, DEFAULT_PORT)
-from network_utils import send_json, receive_json, deserialize_board_state, deserialize_board_ships
+from board_view import BoardView
+from config import (GRID_SIZE, GRID_PIXELS, SEQUENCE_COLORS, COLOR_BG, DEFAULT_PORT)
+import codec
+from network_utils import (FrameReader, send_message, receive_messages, deserialize_board_state,
+                           deserialize_board_ships, apply_shot_delta)
 from toast import StatusToast
 from question_ui import QuestionCard
+from compositor import Compositor, Layer
+from frame_scheduler import earliest, wake
+from scenes import SceneManager
+from timeline import Timeline
+import text_cache
+from fonts import get_font
 
 # config
 OUTER_MARGIN = 30
@@ -20,33 +29,42 @@ WIDTH = RIGHT_ORIGIN[0] + GRID_PIXELS + OUTER_MARGIN
 HEIGHT = TOP_BAR + OUTER_MARGIN + GRID_PIXELS + OUTER_MARGIN + 100
 
 LABEL_COLOR = (60, 60, 60)
+RESULT_PAUSE_MS = 2000  # a result stays up this long before "Waiting for your turn..."
 
 
 class BattleshipClient:
-    def __init__(self, host='localhost', port=DEFAULT_PORT):
-        pygame.init()
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        pygame.display.set_caption("Battleship – Online")
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont(None, 28)
-        self.font_large = pygame.font.SysFont(None, 36)
+    def __init__(self, host='localhost', port=DEFAULT_PORT, scenes=None):
+        self.scenes = scenes or SceneManager()
+        self.size = (WIDTH, HEIGHT)
+        self.caption = "Battleship – Online"
+        self.screen = self.scenes.show(self.size, self.caption)
+        self.font = get_font(28)
+        self.font_large = get_font(36)
         self.running = True
+        self.timeline = Timeline()  # delayed state changes and animations
         
-        self.toast = StatusToast(self.screen)
+        self.toast = StatusToast(self.screen, self.timeline)
         self.question_card = QuestionCard(self.screen, width=700)
+        self.dim = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+        self.dim.fill((0, 0, 0, 80))
         
         # network
         self.host = host
         self.port = port
         self.socket = None
         self.connected = False
+        self.codec = codec.JSON
         
         # game
         self.player_name = ""
         self.player_id = -1
         self.my_board = None
         self.opponent_board = None
+        self.my_view = None
+        self.opponent_view = None
         self.receive_thread = None
+        # messages from the receive thread, applied on the render thread (drain_inbox)
+        self.inbox = collections.deque()
 
         # ui state
         self.state = "CONNECTING"
@@ -56,6 +74,8 @@ class BattleshipClient:
         self.can_shoot = False
         self.game_over = False
         self.winner = None
+        self.result_timer = None
+        self.compositor = self.make_compositor()
         
     def connect(self):
         try:
@@ -75,18 +95,27 @@ class BattleshipClient:
             return False
     
     def send_message(self, data):
-        if not send_json(self.socket, data):
+        if not send_message(self.socket, data, self.codec):
             self.connected = False
     
     def receive_messages(self):
-        buffer = b''
+        reader = FrameReader()
         while self.connected and self.running:
-            msg, buffer = receive_json(self.socket, buffer)
-            if msg is None:
-                print("[CLIENT] Server disconnected")
+            messages = receive_messages(self.socket, reader)
+            if messages is None:
+                if self.connected:  # not when close() hung up
+                    print("[CLIENT] Server disconnected")
                 self.connected = False
                 break
-            self.handle_message(msg)
+            # deque appends are atomic: no lock, never waits for the render loop
+            self.inbox.extend(messages)
+            wake()
+    
+    def drain_inbox(self):
+        # the messages queued when the frame starts, in arrival order; any that
+        # arrive meanwhile wait for the next frame
+        for _ in range(len(self.inbox)):
+            self.handle_message(self.inbox.popleft())
     
     def handle_message(self, msg):
         msg_type = msg.get('type')
@@ -94,6 +123,10 @@ class BattleshipClient:
         if msg_type == 'connection_success':
             self.player_name = msg['player_name']
             self.player_id = msg['player_id']
+            if 'codecs' in msg:
+                chosen = codec.choose_codec(msg['codecs'])
+                self.send_message({'type': 'codec', 'codec': chosen})
+                self.codec = chosen
             self.message = f"Connected as {self.player_name}. Waiting for opponent..."
             self.state = "WAITING"
             print(f"[CLIENT] You are {self.player_name}")
@@ -110,6 +143,7 @@ class BattleshipClient:
             self.state = "ANSWERING"
             self.message = f"Answer the question: {self.current_question}"
             self.question_card.set_input("")
+            self.question_card.set_choices(msg.get('choices'))
             self.question_card.clear_feedback()
 
             
@@ -125,50 +159,74 @@ class BattleshipClient:
                 self.question_card.set_feedback(True, "Correct! Fire away 🚀")
                 self.toast.show("Correct! Take your shot.", positive=True)
             else:
-                self.state = "SHOW_RESULT"
                 self.message = msg['message']
                 self.question_card.set_feedback(False, "Wrong answer. Turn lost.")
                 self.toast.show("Wrong answer. Turn lost.", positive=False)
-                pygame.time.set_timer(pygame.USEREVENT, 2000, 1)
+                self.show_result()
                 
         elif msg_type == 'shot_result':
-            self.update_opponent_board(msg['opponent_board'])
+            self.apply_delta(self.opponent_board, msg)
             self.message = msg['result']
             self.can_shoot = False
+            if msg.get('sunk'):
+                self.toast.show(f"You sank a ship ({msg['sunk'][3]})!", positive=True)
             
             if msg['game_over']:
                 self.state = "GAME_OVER"
                 self.winner = msg['winner']
                 self.message = f"Game Over! {self.winner} wins!"
             else:
-                self.state = "SHOW_RESULT"
-                pygame.time.set_timer(pygame.USEREVENT, 2000, 1)
+                self.show_result()
                 
         elif msg_type == 'opponent_shot':
-            self.update_my_board(msg['your_board'])
+            self.apply_delta(self.my_board, msg)
             self.message = msg['result']
+            if msg.get('sunk'):
+                self.toast.show(f"Your ship ({msg['sunk'][3]}) was sunk!", positive=False)
             
             if msg['game_over']:
                 self.state = "GAME_OVER"
                 self.winner = msg['winner']
                 self.message = f"Game Over! {self.winner} wins!"
             else:
-                self.state = "SHOW_RESULT"
-                pygame.time.set_timer(pygame.USEREVENT, 2000, 1)
+                self.show_result()
                 
         elif msg_type == 'turn_skipped':
-            self.state = "SHOW_RESULT"
             self.message = msg['message']
-            pygame.time.set_timer(pygame.USEREVENT, 2000, 1)
+            self.show_result()
+
+        elif msg_type == 'board_snapshot':
+            self.update_my_board(msg['your_board'])
+            self.update_opponent_board(msg['opponent_board'])
     
+    def show_result(self):
+        # back to waiting after a while, unless another message moved on meanwhile
+        self.state = "SHOW_RESULT"
+        if self.result_timer:
+            self.result_timer.cancel()
+        self.result_timer = self.timeline.after(RESULT_PAUSE_MS, self.result_shown)
+
+    def result_shown(self):
+        if self.state == "SHOW_RESULT":
+            self.state = "WAITING"
+            self.message = "Waiting for your turn..."
+
     def initialize_boards(self, msg):
-        self.my_board = Board(LEFT_ORIGIN, SEQUENCE_COLORS)
-        self.opponent_board = Board(RIGHT_ORIGIN, SEQUENCE_COLORS)
+        grid_size = msg.get('grid_size', GRID_SIZE)
+        self.my_board = Board(SEQUENCE_COLORS, grid_size)
+        self.opponent_board = Board(SEQUENCE_COLORS, grid_size)
+        self.my_view = BoardView(self.my_board, LEFT_ORIGIN, COLOR_BG)
+        self.opponent_view = BoardView(self.opponent_board, RIGHT_ORIGIN, COLOR_BG)
         
         deserialize_board_ships(self.my_board, msg['your_board'])
         deserialize_board_state(self.my_board, msg['your_board'])
         deserialize_board_state(self.opponent_board, msg['opponent_board'])
     
+    def apply_delta(self, board, msg):
+        if board and not apply_shot_delta(board, msg):
+            print("[CLIENT] Board out of sync, requesting snapshot")
+            self.send_message({'type': 'resync'})
+
     def update_my_board(self, board_data):
         if self.my_board:
             deserialize_board_state(self.my_board, board_data)
@@ -177,16 +235,15 @@ class BattleshipClient:
         if self.opponent_board:
             deserialize_board_state(self.opponent_board, board_data)
     
-    def handle_events(self):
-        for event in pygame.event.get():
+    def handle_events(self, events=None):
+        for event in pygame.event.get() if events is None else events:
+            self.compositor.handle_event(event)
             if event.type == pygame.QUIT:
                 self.running = False
+
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                self.running = False  # leave the game
                 
-            elif event.type == pygame.USEREVENT:
-                if self.state == "SHOW_RESULT":
-                    self.state = "WAITING"
-                    self.message = "Waiting for your turn..."
-                    
             elif self.state == "ANSWERING":
                 if event.type == pygame.KEYDOWN:
                     action = self.question_card.handle_key(event)
@@ -210,7 +267,7 @@ class BattleshipClient:
             elif self.state == "SHOOTING" and event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1 and self.can_shoot and self.opponent_board:
                     pos = event.pos
-                    cell = self.opponent_board.cell_from_pos(pos)
+                    cell = self.opponent_view.cell_from_pos(pos)
                     if cell:
                         self.send_message({
                             'type': 'shot',
@@ -223,58 +280,123 @@ class BattleshipClient:
     def draw_text_center(self, text, y, font=None, color=LABEL_COLOR):
         if font is None:
             font = self.font
-        label = font.render(text, True, color)
+        label = text_cache.render(font, text, color)
         rect = label.get_rect(center=(WIDTH // 2, y))
         self.screen.blit(label, rect)
     
-    def draw(self):
-        self.screen.fill(COLOR_BG)
-        
-        if self.state in ["CONNECTING", "WAITING", "ERROR"] and not self.my_board:
-            self.draw_text_center(self.message, HEIGHT // 2, self.font_large)
-        else:
+    # --- Frame layers (compositor.py repaints only what changed) ---
+    def make_compositor(self):
+        return Compositor(self.screen, [
+            Layer("background", lambda surface: surface.fill(COLOR_BG)),
+            Layer("boards", self.draw_boards, self.boards_key, self.boards_rect),
+            Layer("overlay", self.draw_overlay, self.overlay_key, self.overlay_rect),
+            Layer("question card", self.draw_question_card, self.question_card_key, self.question_card_rect),
+            Layer("toast", lambda surface: self.toast.draw(), self.toast.render_key, self.toast.rect),
+        ])
+
+    def showing_boards(self):
+        return not (self.state in ["CONNECTING", "WAITING", "ERROR"] and not self.my_board)
+
+    def labelled_views(self):
+        views = []
+        if self.showing_boards():
             if self.my_board:
-                label = self.font.render(f"{self.player_name}'s Board", True, LABEL_COLOR)
-                self.screen.blit(label, (LEFT_ORIGIN[0], LEFT_ORIGIN[1] - 25))
-                self.my_board.draw(self.screen, show_ships=True)
-            
+                views.append((self.my_view, f"{self.player_name}'s Board", True))
             if self.opponent_board:
-                label = self.font.render("Opponent's Board", True, LABEL_COLOR)
-                self.screen.blit(label, (RIGHT_ORIGIN[0], RIGHT_ORIGIN[1] - 25))
-                self.opponent_board.draw(self.screen, show_ships=False)
-            
-            if self.state == "ANSWERING":
-                overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
-                overlay.fill((0, 0, 0, 80))
-                self.screen.blit(overlay, (0, 0))
-                
-                center = (self.screen.get_width() // 2, self.screen.get_height() // 2)
-                self.question_card.draw(self.current_question, center)
-            elif self.state == "GAME_OVER":
-                y_pos = TOP_BAR + OUTER_MARGIN + GRID_PIXELS + 40
-                self.draw_text_center(self.message, y_pos, self.font_large, 
-                                     (200, 40, 40) if self.winner != self.player_name else (40, 120, 40))
-            
-            self.toast.draw()
-        
-        pygame.display.flip()
+                views.append((self.opponent_view, "Opponent's Board", False))
+        return views
+
+    def draw_boards(self, surface):
+        for view, text, show_ships in self.labelled_views():
+            label = text_cache.render(self.font, text, LABEL_COLOR)
+            surface.blit(label, (view.origin[0], view.origin[1] - 25))
+            view.draw(surface, show_ships=show_ships)
+
+    def boards_key(self):
+        return [(text, view.render_key(show_ships)) for view, text, show_ships in self.labelled_views()]
+
+    def boards_rect(self):
+        # boards plus the labels above them
+        areas = [pygame.Rect(r.x, r.y - 25, r.w, r.h + 25) for r in (v.rect for v, _, _ in self.labelled_views())]
+        return areas[0].unionall(areas[1:]) if areas else pygame.Rect(0, 0, 0, 0)
+
+    def overlay_text(self):
+        # (text, y, font, colour) drawn on top of the boards, or None
+        if not self.showing_boards():
+            return self.message, HEIGHT // 2, self.font_large, LABEL_COLOR
+        if self.state == "GAME_OVER":
+            return (self.message, TOP_BAR + OUTER_MARGIN + GRID_PIXELS + 40, self.font_large,
+                    (200, 40, 40) if self.winner != self.player_name else (40, 120, 40))
+        return None
+
+    def draw_overlay(self, surface):
+        if self.showing_boards() and self.state == "ANSWERING":
+            surface.blit(self.dim, (0, 0))
+        text = self.overlay_text()
+        if text:
+            self.draw_text_center(*text)
+
+    def overlay_key(self):
+        return self.showing_boards() and self.state == "ANSWERING", self.overlay_text()
+
+    def overlay_rect(self):
+        if self.showing_boards() and self.state == "ANSWERING":
+            return None
+        text = self.overlay_text()
+        if text:
+            return pygame.Rect(0, text[1] - 25, WIDTH, 50)
+        return pygame.Rect(0, 0, 0, 0)
+
+    def card_center(self):
+        return (self.screen.get_width() // 2, self.screen.get_height() // 2)
+
+    def answering(self):
+        return self.showing_boards() and self.state == "ANSWERING"
+
+    def draw_question_card(self, surface):
+        if self.answering():
+            self.question_card.draw(self.current_question, self.card_center())
+
+    def question_card_key(self):
+        return self.question_card.render_key(self.current_question) if self.answering() else None
+
+    def question_card_rect(self):
+        if self.answering():
+            return self.question_card.rect(self.current_question, self.card_center())
+        return pygame.Rect(0, 0, 0, 0)
+
+    def stop(self):
+        self.running = False
+
+    def draw(self):
+        self.compositor.render()
     
-    def run(self):
-        if not self.connect():
-            for _ in range(180):
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        break
-                self.draw()
-                self.clock.tick(60)
-            self.running = False
-        
-        while self.running:
-            self.handle_events()
-            self.draw()
-            self.clock.tick(60)
-        
+    # --- Scene (see scenes.py) ---
+    def enter(self):
+        self.compositor.invalidate()
+        if self.state == "CONNECTING" and not self.connect():
+            # show the error for 3 s
+            self.timeline.after(3000, self.stop)
+
+    def next_frame_at(self):
+        # blocks while idle; the receive thread wakes it after each batch of messages
+        return earliest(0 if self.inbox else None, self.compositor.next_frame_at(),
+                        self.timeline.next_frame_at())
+
+    def update(self):
+        self.drain_inbox()
+        self.timeline.update()
+
+    def close(self):
+        self.running = False
         if self.connected:
+            self.connected = False
+            try:
+                self.socket.shutdown(socket.SHUT_RDWR)  # unblocks the receive thread
+            except OSError:
+                pass
             self.socket.close()
-        pygame.quit()
-        sys.exit()
\ No newline at end of file
+
+    def run(self):
+        self.scenes.push(self)
+        self.scenes.run()
\ No newline at end of file
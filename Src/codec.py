@@ -0,0 +1,287 @@
+# codec.py
+"""
+Wire codecs for protocol messages.
+
+Every message is a dict with a 'type' key. The JSON codec sends it as is;
+the binary codec packs the per-turn messages with fixed struct layouts and
+sends board cells as bitsets (hits/misses) and ships as one fixed record each.
+Message types without a binary layout always go out as JSON, and decode()
+tells the two apart by the first byte, so both sides can switch codecs at
+any time without losing a message.
+
+Negotiation: the server lists its codecs in 'connection_success', the
+client answers with {'type': 'codec', 'codec': ...} and both then encode
+with the chosen one.
+"""
+import json
+import struct
+import functools
+
+JSON = 'json'
+BINARY = 'bin1'
+SUPPORTED_CODECS = [BINARY, JSON]  # preferred first
+
+_JSON_FIRST_BYTE = ord('{')
+
+_U8 = struct.Struct('!B')
+_U16 = struct.Struct('!H')
+_BOARD_HEADER = struct.Struct('!BBIQ')  # grid size, has ships, seq, hash
+_SHIP = struct.Struct('!BBBBBBB')  # row, col, vertical, length, rgb
+_SHOT_DELTA = struct.Struct('!BBBIQB')  # row, col, outcome, seq, hash, game over
+_SUNK = struct.Struct('!BBBB')  # row, col, vertical, length; length 0 = nothing sunk
+_OUTCOMES = ['miss', 'hit', 'repeat']
+_OUTCOME_IDS = {name: i for i, name in enumerate(_OUTCOMES)}
+
+# tip sporocila -> id v binarnem formatu
+MESSAGE_IDS = {
+    'game_start': 1,
+    'quiz_question': 2,
+    'opponent_turn': 3,
+    'answer': 4,
+    'answer_result': 5,
+    'shot': 6,
+    'shot_result': 7,
+    'opponent_shot': 8,
+    'turn_skipped': 9,
+    'board_snapshot': 10,
+}
+
+
+def choose_codec(offered):
+    """First codec from SUPPORTED_CODECS that the peer also offered."""
+    for name in SUPPORTED_CODECS:
+        if name in offered:
+            return name
+    return JSON
+
+
+def encode(data, codec=JSON):
+    """Message dict -> frame payload bytes."""
+    if codec == BINARY:
+        encoder = _ENCODERS.get(data.get('type'))
+        if encoder is not None:
+            return encoder(data)
+    return json.dumps(data).encode('utf-8')
+
+
+def decode(frame):
+    """
+    Frame payload (bytes or memoryview) -> message dict, in either codec.
+    Raises ValueError for an empty, truncated or otherwise malformed frame.
+    """
+    if not len(frame):
+        raise ValueError("empty frame")
+    first = frame[0]
+    if first == _JSON_FIRST_BYTE:
+        return json.loads(bytes(frame))
+    decoder = _DECODERS.get(first)
+    if decoder is None:
+        raise ValueError(f"unknown binary message id {first}")
+    try:
+        return decoder(frame)
+    except (struct.error, IndexError) as e:
+        raise ValueError(f"malformed binary message id {first}: {e}") from None
+
+
+# --- primitives ---
+def _str(text):
+    raw = (text or '').encode('utf-8')
+    return _U16.pack(len(raw)) + raw
+
+
+def _get_str(buf, pos):
+    (n,) = _U16.unpack_from(buf, pos)
+    pos += 2
+    if pos + n > len(buf):
+        raise ValueError("truncated string")
+    return str(buf[pos:pos + n], 'utf-8'), pos + n
+
+
+@functools.lru_cache(maxsize=None)
+def _cell_table(grid):
+    # index -> (r, c), built once per grid size
+    return [divmod(i, grid) for i in range(grid * grid)]
+
+
+def _bitset_len(grid):
+    return (grid * grid + 7) // 8
+
+
+def _cells_bitset(cells, grid):
+    bits = 0
+    for r, c in cells:
+        bits |= 1 << (r * grid + c)
+    return bits.to_bytes(_bitset_len(grid), 'little')
+
+
+def _get_cells_bitset(buf, pos, grid):
+    end = pos + _bitset_len(grid)
+    if end > len(buf):
+        raise ValueError("truncated cell bitset")
+    bits = int.from_bytes(buf[pos:end], 'little')
+    index_to_cell = _cell_table(grid)
+    cells = []
+    while bits:
+        low = bits & -bits
+        cells.append(index_to_cell[low.bit_length() - 1])
+        bits ^= low
+    return cells, end
+
+
+def _board(board):
+    grid = board['grid_size']
+    ships = board.get('ships')
+    out = bytearray(_BOARD_HEADER.pack(grid, ships is not None, board['seq'], board['hash']))
+    out += _cells_bitset(board['hits'], grid)
+    out += _cells_bitset(board['misses'], grid)
+    if ships is None:
+        return out
+
+    out += _U8.pack(len(ships))
+    for row, col, orientation, length, color in ships:
+        out += _SHIP.pack(row, col, orientation == 'V', length, *color)
+    return out
+
+
+def _get_board(buf, pos):
+    grid, has_ships, seq, state_hash = _BOARD_HEADER.unpack_from(buf, pos)
+    pos += _BOARD_HEADER.size
+    hits, pos = _get_cells_bitset(buf, pos, grid)
+    misses, pos = _get_cells_bitset(buf, pos, grid)
+    board = {'grid_size': grid, 'hits': hits, 'misses': misses, 'seq': seq, 'hash': state_hash}
+    if not has_ships:
+        return board, pos
+
+    (count,) = _U8.unpack_from(buf, pos)
+    pos += 1
+    ships = []
+    for _ in range(count):
+        row, col, vertical, length, *color = _SHIP.unpack_from(buf, pos)
+        pos += _SHIP.size
+        ships.append([row, col, 'V' if vertical else 'H', length, color])
+    board['ships'] = ships
+    return board, pos
+
+
+# --- per-message layouts ---
+# each type: encoder(data) -> bytes and decoder(frame) -> dict
+def _text_message(msg_type, field):
+    msg_id = _U8.pack(MESSAGE_IDS[msg_type])
+
+    def enc(data):
+        return msg_id + _str(data[field])
+
+    def dec(buf):
+        return {'type': msg_type, field: _get_str(buf, 1)[0]}
+    return enc, dec
+
+
+_ID_FLAG = struct.Struct('!BB')
+_ID_CELL = struct.Struct('!BBB')
+_ID_GRID = struct.Struct('!BB')
+
+
+def _enc_game_start(data):
+    return (_ID_GRID.pack(MESSAGE_IDS['game_start'], data['grid_size'])
+            + _board(data['your_board']) + _board(data['opponent_board']))
+
+
+def _dec_game_start(buf):
+    your_board, pos = _get_board(buf, 2)
+    opponent_board, pos = _get_board(buf, pos)
+    return {'type': 'game_start', 'grid_size': buf[1],
+            'your_board': your_board, 'opponent_board': opponent_board}
+
+
+def _enc_quiz_question(data):
+    # question, then the options (count 0 = free answer)
+    choices = data.get('choices') or []
+    out = _U8.pack(MESSAGE_IDS['quiz_question']) + _str(data['question']) + _U8.pack(len(choices))
+    return out + b"".join(_str(c) for c in choices)
+
+
+def _dec_quiz_question(buf):
+    question, pos = _get_str(buf, 1)
+    msg = {'type': 'quiz_question', 'question': question}
+    (count,) = _U8.unpack_from(buf, pos)
+    pos += 1
+    if count:
+        choices = []
+        for _ in range(count):
+            choice, pos = _get_str(buf, pos)
+            choices.append(choice)
+        msg['choices'] = choices
+    return msg
+
+
+def _enc_answer_result(data):
+    return _ID_FLAG.pack(MESSAGE_IDS['answer_result'], bool(data['correct'])) + _str(data['message'])
+
+
+def _dec_answer_result(buf):
+    return {'type': 'answer_result', 'correct': bool(buf[1]), 'message': _get_str(buf, 2)[0]}
+
+
+def _enc_shot(data):
+    r, c = data['cell']
+    return _ID_CELL.pack(MESSAGE_IDS['shot'], r, c)
+
+
+def _dec_shot(buf):
+    return {'type': 'shot', 'cell': [buf[1], buf[2]]}
+
+
+def _sunk(ship):
+    if not ship:
+        return 0, 0, 0, 0
+    row, col, orientation, length = ship
+    return row, col, orientation == 'V', length
+
+
+def _shot_delta_message(msg_type):
+    # shot_result and opponent_shot share one layout: only the changed cell
+    msg_id = _U8.pack(MESSAGE_IDS[msg_type])
+
+    def enc(data):
+        r, c = data['cell']
+        return (msg_id + _SHOT_DELTA.pack(r, c, _OUTCOME_IDS[data['outcome']], data['seq'],
+                                          data['hash'], bool(data['game_over']))
+                + _SUNK.pack(*_sunk(data.get('sunk'))) + _str(data['result']) + _str(data['winner']))
+
+    def dec(buf):
+        r, c, outcome, seq, state_hash, game_over = _SHOT_DELTA.unpack_from(buf, 1)
+        pos = 1 + _SHOT_DELTA.size
+        sunk_r, sunk_c, vertical, length = _SUNK.unpack_from(buf, pos)
+        result, pos = _get_str(buf, pos + _SUNK.size)
+        winner, pos = _get_str(buf, pos)
+        sunk = [sunk_r, sunk_c, 'V' if vertical else 'H', length] if length else None
+        return {'type': msg_type, 'result': result, 'cell': [r, c], 'outcome': _OUTCOMES[outcome],
+                'seq': seq, 'hash': state_hash, 'game_over': bool(game_over), 'winner': winner or None,
+                'sunk': sunk}
+    return enc, dec
+
+
+def _enc_board_snapshot(data):
+    return _U8.pack(MESSAGE_IDS['board_snapshot']) + _board(data['your_board']) + _board(data['opponent_board'])
+
+
+def _dec_board_snapshot(buf):
+    your_board, pos = _get_board(buf, 1)
+    opponent_board, pos = _get_board(buf, pos)
+    return {'type': 'board_snapshot', 'your_board': your_board, 'opponent_board': opponent_board}
+
+
+_LAYOUTS = {
+    'game_start': (_enc_game_start, _dec_game_start),
+    'quiz_question': (_enc_quiz_question, _dec_quiz_question),
+    'opponent_turn': _text_message('opponent_turn', 'message'),
+    'answer': _text_message('answer', 'answer'),
+    'answer_result': (_enc_answer_result, _dec_answer_result),
+    'shot': (_enc_shot, _dec_shot),
+    'shot_result': _shot_delta_message('shot_result'),
+    'opponent_shot': _shot_delta_message('opponent_shot'),
+    'turn_skipped': _text_message('turn_skipped', 'message'),
+    'board_snapshot': (_enc_board_snapshot, _dec_board_snapshot),
+}
+_ENCODERS = {name: enc for name, (enc, _) in _LAYOUTS.items()}
+_DECODERS = {MESSAGE_IDS[name]: dec for name, (_, dec) in _LAYOUTS.items()}
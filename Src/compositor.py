@@ -0,0 +1,123 @@
+# compositor.py
+"""
+Dirty-rectangle frame output shared by App and BattleshipClient.
+
+The screen is a stack of layers (background, boards, overlay, question
+card, HUD, toast), each with
+  - draw(surface): paints the layer (immediate mode, as before),
+  - key(): anything comparable that changes whenever draw() would paint
+    something different (state, text, animation step...); the widgets
+    (BoardView, TurnHUD, StatusToast, QuestionCard) provide it as
+    render_key(),
+  - rect(): the area draw() may paint (an empty Rect when it paints
+    nothing), or None for the whole screen.
+
+render() compares every layer's key and rect with the previous frame; the
+old and new rect of each changed layer are dirty. Only those rectangles
+are repainted (every layer that touches them, bottom to top, clipped) and
+pushed with pygame.display.update(rects). A frame where nothing changed
+paints and pushes nothing.
+"""
+import pygame
+
+_UNSET = object()
+
+# window events after which the whole window has to be pushed again
+_EXPOSE_EVENTS = {pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED,
+                  pygame.WINDOWSIZECHANGED}
+
+
+class Layer:
+    def __init__(self, name, draw, key=None, rect=None):
+        self.name = name
+        self.draw = draw
+        self.key = key or (lambda: None)
+        self.rect = rect or (lambda: None)
+        self.last_key = _UNSET
+        self.last_rect = None
+
+
+class Compositor:
+    def __init__(self, surface, layers=()):
+        self.surface = surface
+        self.layers = list(layers)
+        self.full_redraw = True  # the first frame paints everything
+        self.extra = []          # rects invalidated from outside
+        self.frames = 0          # frames that pushed anything (see bench_render)
+
+    def invalidate(self, rect=None):
+        # force a repaint of rect (or of everything) on the next render()
+        if rect is None:
+            self.full_redraw = True
+        else:
+            self.extra.append(pygame.Rect(rect))
+
+    def handle_event(self, event):
+        if event.type in _EXPOSE_EVENTS:
+            self.invalidate()
+
+    def _current(self, layer, screen):
+        rect = layer.rect()
+        return layer.key(), None if rect is None else pygame.Rect(rect).clip(screen)
+
+    def next_frame_at(self):
+        # frame_scheduler source: 0 (draw now) while anything is waiting to be painted
+        if self.full_redraw or self.extra:
+            return 0
+        screen = self.surface.get_rect()
+        for layer in self.layers:
+            if self._current(layer, screen) != (layer.last_key, layer.last_rect):
+                return 0
+        return None
+
+    def _dirty_rects(self):
+        screen = self.surface.get_rect()
+        dirty = list(self.extra)
+        self.extra = []
+        for layer in self.layers:
+            key, rect = self._current(layer, screen)
+            if key != layer.last_key or rect != layer.last_rect:
+                for r in (layer.last_rect, rect):
+                    dirty.append(screen if r is None else r)
+                layer.last_key = key
+                layer.last_rect = rect
+        if self.full_redraw:
+            self.full_redraw = False
+            return [screen]
+        return merge_rects([r for r in dirty if r.w and r.h], screen)
+
+    def render(self):
+        """Repaints and pushes the changed areas; returns the list of rects pushed."""
+        dirty = self._dirty_rects()
+        if not dirty:
+            return dirty
+        surface = self.surface
+        for area in dirty:
+            surface.set_clip(area)
+            for layer in self.layers:
+                rect = layer.last_rect
+                if rect is None or rect.colliderect(area):
+                    layer.draw(surface)
+        surface.set_clip(None)
+        pygame.display.update(dirty)
+        self.frames += 1
+        return dirty
+
+
+def merge_rects(rects, screen):
+    # unions overlapping rects; when they cover most of the screen a single
+    # full-screen update is cheaper than many small ones
+    merged = []
+    for rect in rects:
+        rect = rect.copy()
+        i = 0
+        while i < len(merged):
+            if merged[i].colliderect(rect):
+                rect.union_ip(merged.pop(i))
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+    if sum(r.w * r.h for r in merged) > screen.w * screen.h // 2:
+        return [screen.copy()]
+    return merged
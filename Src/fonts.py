@@ -0,0 +1,94 @@
+# fonts.py
+"""
+Fonts for every window, from one process-wide registry.
+
+pygame.font.match_font and SysFont scan the system fonts (fc-list on
+Linux) the first time they are used in a process, and every component
+used to look up its own list of families for every size. Here each list
+of families is resolved to a file once, every (families, size, bold) Font
+is built once and shared, and the resolved paths are kept in a small
+JSON file so the next start skips the scan altogether. Delete the file
+(or set BATTLESHIP_FONT_CACHE to another path) after installing fonts.
+
+    font = get_font(22, bold=True, families=UI_FAMILIES)
+    font = get_font(28)  # pygame's default font, never scans
+"""
+import os
+import json
+import pygame
+
+UI_FAMILIES = ("Inter", "Poppins", "Nunito", "Segoe UI", "Arial")  # HUD, toast
+CARD_FAMILIES = ("Montserrat", "Poppins", "Nunito", "Inter", "Avenir", "Segoe UI", "Arial")
+
+CACHE_PATH = os.environ.get("BATTLESHIP_FONT_CACHE") or os.path.join(
+    os.path.expanduser("~"), ".cache", "battleship", "fonts.json")
+CACHE_VERSION = 1
+
+
+class FontRegistry:
+    def __init__(self, cache_path=CACHE_PATH):
+        self.cache_path = cache_path
+        self.paths = None  # "Inter,Arial|bold" -> font file or None (no family found)
+        self.fonts = {}    # (families, size, bold) -> Font
+        self.scans = 0     # families resolved with match_font in this process
+        pygame.register_quit(self.fonts.clear)  # Font objects die with pygame.quit()
+
+    def _key(self, families, bold):
+        return ",".join(families) + ("|bold" if bold else "")
+
+    def _load(self):
+        self.paths = {}
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != CACHE_VERSION:
+            return
+        # fonts may have been removed since
+        self.paths = {k: p for k, p in data.get('paths', {}).items() if p is None or os.path.exists(p)}
+
+    def _save(self):
+        if not self.cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp = self.cache_path + ".tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'paths': self.paths}, f, indent=1)
+            os.replace(tmp, self.cache_path)
+        except OSError as e:
+            print(f"[FONTS] Could not write {self.cache_path}: {e}")
+
+    def path(self, families, bold=False):
+        """File of the first installed family, or None; scans only on a cache miss."""
+        if self.paths is None:
+            self._load()
+        key = self._key(families, bold)
+        if key not in self.paths:
+            self.scans += 1
+            self.paths[key] = next((p for p in (pygame.font.match_font(name, bold=bold) for name in families)
+                                    if p), None)
+            self._save()
+        return self.paths[key]
+
+    def get(self, size, bold=False, families=None):
+        key = (families, size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            path = self.path(families, bold) if families else None
+            # no family found: pygame's default font, as SysFont(None, ...) gives
+            font = pygame.font.Font(path, size)
+            if path is None and bold:
+                font.set_bold(True)
+            self.fonts[key] = font
+        return font
+
+
+registry = FontRegistry()
+
+
+def get_font(size, bold=False, families=None):
+    return registry.get(size, bold, families)
@@ -0,0 +1,83 @@
+# frame_scheduler.py
+"""
+Frame pacing for the pygame loops. While something is animating the loop
+runs at FPS as before; otherwise it blocks in pygame.event.wait until
+input arrives, another thread calls wake() (e.g. the client's network
+thread after a message), or the next animation deadline is due, so an
+idle window costs next to no CPU.
+
+Animation sources are callables returning the get_ticks() time of the
+next frame they need: a time <= now means "animating, draw every frame",
+a later time is a deadline (e.g. when a toast starts fading out) and
+None means nothing to draw until something else happens. The first
+frame, and one after request_frame(), is never waited for.
+
+SDL only really blocks in event.wait on drivers that can wait for OS
+events (x11, wayland, windows, cocoa); headless drivers (dummy, offscreen)
+spin in 1 ms steps there instead, so on those the idle loop just sleeps
+and polls at IDLE_POLL_FPS (wake() still cuts the sleep short).
+"""
+import threading
+import pygame
+
+FPS = 60
+IDLE_TIMEOUT_MS = 1000  # an idle loop still wakes this often
+IDLE_POLL_FPS = 20
+POLLING_DRIVERS = {"dummy", "offscreen"}
+
+# posted to wake a waiting loop; safe to post from any thread
+WAKE = pygame.event.custom_type()
+_woken = threading.Event()  # the same, for the polling fallback
+
+
+def earliest(*times):
+    # the soonest of some next_frame_at() times, None if none is set
+    times = [t for t in times if t is not None]
+    return min(times) if times else None
+
+
+def wake():
+    _woken.set()
+    try:
+        pygame.event.post(pygame.event.Event(WAKE))
+    except pygame.error:
+        pass  # display already closed
+
+
+class FrameScheduler:
+    def __init__(self, sources=(), fps=FPS, idle_timeout=IDLE_TIMEOUT_MS):
+        self.sources = list(sources)
+        self.fps = fps
+        self.idle_timeout = idle_timeout
+        self.clock = pygame.time.Clock()
+        self.idle_waits = 0  # frames that blocked instead of ticking
+        self.requested = True  # the first frame is drawn straight away
+
+    def request_frame(self):
+        # same thread only; other threads use wake()
+        self.requested = True
+
+    def next_frame_at(self):
+        return earliest(*(source() for source in self.sources))
+
+    def next_events(self):
+        """Events for the next frame: one frame at FPS while anything animates, else blocks."""
+        due = self.next_frame_at()
+        now = pygame.time.get_ticks()
+        if self.requested or (due is not None and due <= now):
+            self.requested = False
+            self.clock.tick(self.fps)
+            return pygame.event.get()
+
+        timeout = self.idle_timeout if due is None else min(self.idle_timeout, due - now)
+        self.idle_waits += 1
+        if pygame.display.get_driver() in POLLING_DRIVERS:
+            _woken.wait(min(timeout, 1000 // IDLE_POLL_FPS) / 1000)
+            _woken.clear()
+            events = []
+        else:
+            first = pygame.event.wait(timeout)
+            events = [] if first.type == pygame.NOEVENT else [first]
+        events += pygame.event.get()
+        self.clock.tick()  # keeps get_time()/get_fps() meaningful
+        return events
@@ -1,6 +1,6 @@
 # game.py
-import random
-from board import Board, generate_sequences
+from board import Board, generate_fleet
+from seeding import new_seed, stream
 
 class Player:
     def __init__(self, name, board):
@@ -8,28 +8,80 @@ class Player:
         self.board = board
 
     def all_ships_sunk(self):
-        return len(self.board.hits) >= len(self.board.cells_with_colors)
+        return self.board.all_sunk()
+
+
+class ShotResult:
+    """
+    Outcome of Game.process_shot.
+    - outcome: "hit", "miss", "repeat" (already shot there) or "invalid"
+    - sunk: the Ship this shot sank (its .id is the ship id), else None
+    - game_over / winner: set when the shot sank the last ship
+    The text for players is only built by message().
+    """
+    __slots__ = ('cell', 'outcome', 'shooter', 'sunk', 'game_over', 'winner')
+
+    def __init__(self, cell, outcome, shooter, sunk=None, game_over=False, winner=None):
+        self.cell = cell
+        self.outcome = outcome
+        self.shooter = shooter
+        self.sunk = sunk
+        self.game_over = game_over
+        self.winner = winner
+
+    @property
+    def hit(self):
+        return self.outcome == "hit"
+
+    @property
+    def changed(self):
+        # False when the board was left as it was (repeat / invalid)
+        return self.outcome in ("hit", "miss")
+
+    def message(self):
+        if self.outcome == "invalid":
+            return "Not a cell on the board!"
+        if self.outcome == "repeat":
+            return "Already shot there!"
+        if self.game_over:
+            return f"{self.shooter} wins!"
+        if self.sunk is not None:
+            return f"{self.shooter} sank a ship ({self.sunk.length}) at {self.cell}!"
+        if self.hit:
+            return f"{self.shooter} HIT at {self.cell}!"
+        return f"{self.shooter} missed at {self.cell}."
+
+    def __repr__(self):
+        return f"ShotResult({self.cell}, {self.outcome!r}, sunk={self.sunk}, game_over={self.game_over})"
 
 
 class Game:
-    def __init__(self, player_names, sequence_colors, ship_lengths, grid_size=10):
+    def __init__(self, player_names, sequence_colors, ship_lengths, grid_size=10, seed=None, rng=None):
         """
         Game holds players and turn logic. It does not use pygame.
         - player_names: list of strings, e.g. ["P1", "P2"]
         - sequence_colors: list of colors used for ship fills
         - ship_lengths: list of lengths, e.g. [2,3,5]
         - grid_size: grid dimension (default 10)
+        - seed / rng: ship placement draws only from rng, by default the
+          "placement" stream of seed (a new seed if none is given); the
+          same seed gives the same fleets (see seeding.py)
         """
         self.sequence_colors = sequence_colors
         self.ship_lengths = ship_lengths
         self.grid_size = grid_size
+        if rng is None:
+            if seed is None:
+                seed = new_seed()
+            rng = stream(seed, "placement")
+        self.seed = seed
+        self.rng = rng
 
         self.players = []
         for i, name in enumerate(player_names):
-            # origin will be set by app (App controls rendering positions)
-            board = Board((0, 0), sequence_colors)
-            ships = generate_sequences(grid_size, ship_lengths, sequence_colors)
-            board.set_cells(ships)
+            # rendering (origin, drawing) is done by board_view.BoardView in the app
+            board = Board(sequence_colors, grid_size)
+            board.set_ships(generate_fleet(grid_size, ship_lengths, sequence_colors, rng))
             player = type("P", (), {})()  # tiny anonymous object to hold name and board
             player.name = name
             player.board = board
@@ -38,7 +90,7 @@ class Game:
         self.current_turn = 0
         self.over = False
         self.winner = None
-        self.last_result = ""  # message string (e.g., "Hit!", "Miss", "Already shot here")
+        self.last_result = None  # ShotResult of the last process_shot
 
     def get_current_player(self):
         return self.players[self.current_turn]
@@ -52,32 +104,39 @@ class Game:
 
     def process_shot(self, cell):
         """
-        Process a shot on the opponent's board.
-        Returns (result_str, is_game_over, winner_name_or_None).
+        Process a shot on the opponent's board; returns a ShotResult.
+        The turn passes to the opponent unless the shot was not taken
+        (repeat / invalid) or won the game.
         """
-        shooter = self.get_current_player()
-        opponent = self.get_opponent()
-        board = opponent.board
-
-        if cell in board.hits or cell in board.misses:
-            self.last_result = "Already shot there!"
-            return self.last_result, False, None
-
-        if cell in board.cells_with_colors:
-            board.hits.add(cell)
-            self.last_result = f"{shooter.name} HIT at {cell}!"
-        else:
-            board.misses.add(cell)
-            self.last_result = f"{shooter.name} missed at {cell}."
-
-        # Check win
-        total_ship_cells = len(board.cells_with_colors)
-        if len(board.hits) >= total_ship_cells > 0:
+        # hot path on the server: no helper calls, and only O(1) per-cell
+        # lookups (no shifts of the grid-sized masks)
+        players = self.players
+        turn = self.current_turn
+        shooter = players[turn]
+        board = players[(turn + 1) % len(players)].board
+
+        if not board.in_bounds(cell):
+            self.last_result = ShotResult(cell, "invalid", shooter.name)
+            return self.last_result
+
+        index = cell[0] * board.grid_size + cell[1]
+        if board.shot_cells[index]:
+            self.last_result = ShotResult(cell, "repeat", shooter.name)
+            return self.last_result
+
+        hit = board.ship_ids[index] >= 0
+        sunk = board.mark_index(index, hit)
+        result = ShotResult(cell, "hit" if hit else "miss", shooter.name, sunk)
+        self.last_result = result
+
+        # Win: the counters say no ship is left afloat
+        if sunk is not None and board.ships_afloat == 0:
             self.over = True
             self.winner = shooter.name
-            self.last_result = f"{shooter.name} wins!"
-            return self.last_result, True, self.winner
+            result.game_over = True
+            result.winner = self.winner
+            return result
 
         # Not over → advance turn
-        self.next_turn()
-        return self.last_result, False, None
\ No newline at end of file
+        self.current_turn = (turn + 1) % len(players)
+        return result
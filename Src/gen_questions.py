@@ -1,75 +1,150 @@
 import random
-def generate_simple_question():
+
+# rng: a random.Random stream (see seeding.py); defaults to the global module
+
+# distractors are the answer plus 3 distinct offsets from these
+DISTRACTOR_OFFSETS = [d for d in range(-10, 11) if d != 0]
+
+def generate_simple_question(rng=random):
     operations = ['+', '-', '*', '/']
-    operation = random.choice(operations)
+    operation = rng.choice(operations)
 
     if operation == '+':
-        num1 = random.randint(10, 100)
-        num2 = random.randint(10, 100)
+        num1 = rng.randint(10, 100)
+        num2 = rng.randint(10, 100)
         answer = num1 + num2
     elif operation == '-':
-        num1 = random.randint(10, 100)
-        num2 = random.randint(10, num1)  # Ensure no negative results
+        num1 = rng.randint(10, 100)
+        num2 = rng.randint(10, num1)  # Ensure no negative results
         answer = num1 - num2
     elif operation == '*':
-        num1 = random.randint(1, 10)
-        num2 = random.randint(1, 10)
+        num1 = rng.randint(1, 10)
+        num2 = rng.randint(1, 10)
         answer = num1 * num2
     elif operation == '/':
         # Ensure no division by zero and integer result
-        num1 = random.randint(1, 10)
-        num2 = random.randint(1, 10)
+        num1 = rng.randint(1, 10)
+        num2 = rng.randint(1, 10)
         num1 = num1 * num2
         answer = num1 // num2
 
     question = f"What is {num1} {operation} {num2}?"
     return question, str(answer) # :)
 
-def generate_multiple_choice_question():
-    question, answer = generate_simple_question()
-    choices = [answer]
-    while len(choices) < 4:
-        fake_answer = answer + random.randint(-10, 10)
-        if fake_answer != answer and fake_answer not in choices:
-            choices.append(fake_answer)
-    random.shuffle(choices)
-    return question, answer, choices
-
-
-def generate_extreme_question():
-    a, b, c, d = random.randint(1, 10), random.randint(1, 10), random.randint(1, 10), random.randint(1, 5)
-
-    question_type = random.choice([1, 2, 3, 4, 5])
-
-    if question_type == 1:
-        question = f"Extreme Challenge! What is ({a} + {b}) * {c} - {b} + {a}?"
-        answer = (a + b) * c - b + a
-
-    elif question_type == 2:
-        question = f"Extreme Challenge! What is ({a} * {b}) + {c} - {a}?"
-        answer = (a * b) + c - a
-
-    elif question_type == 3:
-        question = f"Extreme Challenge! What is ({a} + {b} + {c}) - {d} + {b}?"
-        answer = (a + b + c) - d + b
-
-    elif question_type == 4:
-        question = f"Extreme Challenge! What is ({a} * 2 - {b} * 2) + {c}?"
-        answer = (a * 2 - b * 2) + c
-
-    elif question_type == 5:
-        question = f"Extreme Challenge! What is ({a} + {b}) * ({c} + {d})?"
-        answer = (a + b) * (c + d)
-
-    # Generate multiple-choice answers
-    choices = [answer]
-    while len(choices) < 4:
-        fake_answer = answer + random.randint(-10, 10)
-        if fake_answer != answer and fake_answer not in choices:
-            choices.append(fake_answer)
-
-    random.shuffle(choices)
-    return question, answer, choices
+def make_choices(answer, rng=random):
+    # answer + 3 distinct wrong ones, shuffled, as strings (no rejection loop)
+    choices = [answer + d for d in rng.sample(DISTRACTOR_OFFSETS, 3)]
+    choices.insert(rng.randrange(4), answer)
+    return [str(c) for c in choices]
+
+def generate_multiple_choice_question(rng=random):
+    question, answer = generate_simple_question(rng)
+    return question, answer, make_choices(int(answer), rng)
+
+
+EXTREME_TEMPLATES = [
+    "Extreme Challenge! What is ({a} + {b}) * {c} - {b} + {a}?",
+    "Extreme Challenge! What is ({a} * {b}) + {c} - {a}?",
+    "Extreme Challenge! What is ({a} + {b} + {c}) - {d} + {b}?",
+    "Extreme Challenge! What is ({a} * 2 - {b} * 2) + {c}?",
+    "Extreme Challenge! What is ({a} + {b}) * ({c} + {d})?",
+]
+
+def extreme_answer(question_type, a, b, c, d):
+    # same formulas as EXTREME_TEMPLATES; works on ints and numpy arrays
+    return [
+        (a + b) * c - b + a,
+        (a * b) + c - a,
+        (a + b + c) - d + b,
+        (a * 2 - b * 2) + c,
+        (a + b) * (c + d),
+    ][question_type]
+
+def generate_extreme_question(rng=random):
+    a, b, c, d = rng.randint(1, 10), rng.randint(1, 10), rng.randint(1, 10), rng.randint(1, 5)
+    question_type = rng.randrange(len(EXTREME_TEMPLATES))
+    question = EXTREME_TEMPLATES[question_type].format(a=a, b=b, c=c, d=d)
+    answer = extreme_answer(question_type, a, b, c, d)
+    return question, str(answer), make_choices(answer, rng)
+
+
+# --- batches (NumPy), used to fill QuizManager pools ---
+# A batch is an int array with one row per question; format_* turns a row
+# (as a list) into the same tuple the generate_* functions return. Each
+# *_rows takes n and a NumPy seed (an int or a list of ints), and the same
+# seed gives the same batch.
+
+OPERATIONS = "+-*/"
+
+def _batch_rng(seed):
+    import numpy as np
+    return np, np.random.default_rng(seed)
+
+def _batch_choices(np, g, answers):
+    # (n, 4) answer + 3 distinct distractors, answer in a random column
+    n = len(answers)
+    offsets = np.array(DISTRACTOR_OFFSETS)
+    picks = offsets[np.argsort(g.random((n, len(offsets))), axis=1)[:, :3]]
+    correct_col = np.arange(4) == g.integers(0, 4, n)[:, None]
+    choices = np.empty((n, 4), dtype=np.int64)
+    choices[correct_col] = answers
+    choices[~correct_col] = (answers[:, None] + picks).ravel()
+    return choices
+
+def _simple_columns(np, g, n):
+    op = g.integers(0, 4, n)
+    big1, big2 = g.integers(10, 101, n), g.integers(10, 101, n)
+    small1, small2 = g.integers(1, 11, n), g.integers(1, 11, n)
+    below = 10 + (g.random(n) * (big1 - 9)).astype(np.int64)  # 10..big1
+    num1 = np.select([op == 0, op == 1, op == 2], [big1, big1, small1], small1 * small2)
+    num2 = np.select([op == 0, op == 1, op == 2], [big2, below, small2], small2)
+    answer = np.select([op == 0, op == 1, op == 2], [big1 + big2, big1 - below, small1 * small2], small1)
+    return op, num1, num2, answer
+
+def simple_rows(n, seed=None):
+    # op, num1, num2, answer
+    np, g = _batch_rng(seed)
+    return np.stack(_simple_columns(np, g, n), axis=1).astype(np.int32)
+
+def format_simple(row):
+    op, num1, num2, answer = row
+    return f"What is {num1} {OPERATIONS[op]} {num2}?", str(answer)
+
+def multiple_choice_rows(n, seed=None):
+    # op, num1, num2, answer, 4 choices
+    np, g = _batch_rng(seed)
+    columns = _simple_columns(np, g, n)
+    return np.hstack([np.stack(columns, axis=1), _batch_choices(np, g, columns[3])]).astype(np.int32)
+
+def format_multiple_choice(row):
+    question, answer = format_simple(row[:4])
+    return question, answer, [str(c) for c in row[4:]]
+
+def extreme_rows(n, seed=None):
+    # template, a, b, c, d, answer, 4 choices
+    np, g = _batch_rng(seed)
+    a, b, c = g.integers(1, 11, (3, n))
+    d = g.integers(1, 6, n)
+    kind = g.integers(0, len(EXTREME_TEMPLATES), n)
+    answers = np.choose(kind, [extreme_answer(t, a, b, c, d) for t in range(len(EXTREME_TEMPLATES))])
+    return np.hstack([np.stack([kind, a, b, c, d, answers], axis=1),
+                      _batch_choices(np, g, answers)]).astype(np.int32)
+
+def format_extreme(row):
+    kind, a, b, c, d, answer = row[:6]
+    return (EXTREME_TEMPLATES[kind].format(a=a, b=b, c=c, d=d), str(answer),
+            [str(ch) for ch in row[6:]])
+
+# difficulty -> (rows, format)
+BATCH_GENERATORS = {
+    "simple": (simple_rows, format_simple),
+    "multiple_choice": (multiple_choice_rows, format_multiple_choice),
+    "extreme": (extreme_rows, format_extreme),
+}
+
+def generate_batch(difficulty, n, seed=None):
+    rows, fmt = BATCH_GENERATORS[difficulty]
+    return [fmt(row) for row in rows(n, seed).tolist()]
 
 if __name__ == "__main__":
     print("Simple Question:")
@@ -1,24 +1,26 @@
 # hud.py
 import pygame
 import math
+import text_cache
+from fonts import get_font, UI_FAMILIES
 
-def _get_font(size, bold=False):
-    for name in ["Inter", "Poppins", "Nunito", "Segoe UI", "Arial"]:
-        path = pygame.font.match_font(name, bold=bold)
-        if path:
-            return pygame.font.Font(path, size)
-    return pygame.font.SysFont(None, size, bold=bold)
+PULSE_MS = 1500  # the result badge pulses this long after it changes, then rests
+
+def _wobble(p):
+    # sine at 8 rad/s over the pulse, back to rest at the end
+    return math.sin(p * PULSE_MS / 1000.0 * 8.0) if p < 1 else 0.0
 
 class TurnHUD:
     """Top-center pill showing current player's turn + right-side badge for last shot result."""
-    def __init__(self, surface):
+    def __init__(self, surface, timeline):
         self.surface = surface
+        self.timeline = timeline
         self.player_name = "Player"
         self.status_text = None     # "Hit!" / "Miss!" / "Skipped"
         self.status_hit = None      # True/False/None (None hides badge)
 
-        self.title_font = _get_font(22, bold=True)
-        self.small_font = _get_font(18, bold=False)
+        self.title_font = get_font(22, bold=True, families=UI_FAMILIES)
+        self.small_font = get_font(18, bold=False, families=UI_FAMILIES)
 
         self.pill_bg = (20, 24, 32, 210)     # translucent dark
         self.pill_border = (255, 255, 255, 40)
@@ -29,17 +31,35 @@ class TurnHUD:
         self.miss_bg = (239, 68, 68)         # red
         self.badge_text = (255, 255, 255)
 
-        self.created_ms = pygame.time.get_ticks()
-        self.badge_updated_ms = pygame.time.get_ticks()
+        self.pulse = None  # tween over PULSE_MS, restarted when the badge changes
 
     def set_player(self, name: str):
         self.player_name = name
-        self.created_ms = pygame.time.get_ticks()
 
     def set_status(self, hit: bool | None, text: str | None):
         self.status_hit = hit
         self.status_text = text
-        self.badge_updated_ms = pygame.time.get_ticks()
+        self.pulse = self.timeline.tween(PULSE_MS, 1.0, 1.05, ease=_wobble) if hit is not None and text else None
+
+    def _layout(self):
+        sw, sh = self.surface.get_size()
+        pill_w = min(520, sw - 40)
+        pill_h = 48  # thinner
+        return (sw - pill_w) // 2, 4, pill_w, pill_h
+
+    def _badge_size(self):
+        pulse = self.pulse.value() if self.pulse else 1.0
+        return int(130 * pulse), int(36 * pulse)
+
+    def rect(self):
+        # area draw() paints, shadow included
+        x, y, pill_w, pill_h = self._layout()
+        return pygame.Rect(x, y, pill_w, pill_h + 4)
+
+    def render_key(self):
+        # texts and the badge size, which the pulse tween animates
+        badge = self._badge_size() if self.status_hit is not None and self.status_text else None
+        return self.player_name, self.status_hit, self.status_text, badge
 
     def _round_rect(self, surf, rect, color, radius=16, border=0, border_color=None):
         x, y, w, h = rect
@@ -50,12 +70,7 @@ class TurnHUD:
         surf.blit(s, (x, y))
 
     def draw(self):
-        sw, sh = self.surface.get_size()
-
-        pill_w = min(520, sw - 40)
-        pill_h = 48  # thinner
-        x = (sw - pill_w) // 2
-        y = 4  # closer to the top
+        x, y, pill_w, pill_h = self._layout()  # y: closer to the top
 
         # shadow
         shadow = pygame.Surface((pill_w, pill_h), pygame.SRCALPHA)
@@ -67,21 +82,17 @@ class TurnHUD:
         # left text
         left_pad = 18
         label_text = f"TURN: {self.player_name}"
-        label = self.title_font.render(label_text, True, self.text_color)
+        label = text_cache.render(self.title_font, label_text, self.text_color)
         self.surface.blit(label, (x + left_pad, y + (pill_h - label.get_height()) // 2))
 
         # right badge
         if self.status_hit is not None and self.status_text:
-            elapsed = (pygame.time.get_ticks() - self.badge_updated_ms) / 1000.0
-            pulse = 1.0 + 0.05 * math.sin(elapsed * 8.0)
-
-            badge_w = int(130 * pulse)
-            badge_h = int(36 * pulse)
+            badge_w, badge_h = self._badge_size()
             bx = x + pill_w - badge_w - 14
             by = y + (pill_h - badge_h) // 2
 
             bg = self.hit_bg if self.status_hit else self.miss_bg
             self._round_rect(self.surface, (bx, by, badge_w, badge_h), bg, radius=12)
 
-            txt = self.small_font.render(self.status_text, True, self.badge_text)
+            txt = text_cache.render(self.small_font, self.status_text, self.badge_text)
             self.surface.blit(txt, (bx + (badge_w - txt.get_width()) // 2, by + (badge_h - txt.get_height()) // 2))
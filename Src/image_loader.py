@@ -1,17 +1,65 @@
 import pygame
 import os
 
+
+def display_key():
+    # identifies the display surface and its format; surfaces converted for
+    # one key must be rebuilt when it changes (None: no display yet)
+    display = pygame.display.get_surface()
+    if display is None:
+        return None
+    return id(display), display.get_size(), display.get_bitsize(), display.get_masks()
+
+
 class ImageLoader:
+    """
+    Ship images, plus a cache of ready-to-blit sprites: scaled to the cell
+    size, rotated for horizontal ships and converted to the display format.
+    The cache is emptied when the display surface changes (new mode, size
+    or pixel format), since converted surfaces belong to one display.
+    """
     def __init__(self, images_folder="images"):
         self.images_folder = images_folder
         self.ship_images = {}
+        self.sprites = {}  # (length, orientation, cell size) -> Surface
+        self.display_key = None
         self.load_ship_images()
-    
+
     def load_ship_images(self):
         for length in [2, 3, 5]:
             path = os.path.join(self.images_folder, f"ship_{length}.png")
             if os.path.exists(path):
                 self.ship_images[length] = pygame.image.load(path)
-    
+
     def get_ship_image(self, length):
-        return self.ship_images.get(length)
\ No newline at end of file
+        return self.ship_images.get(length)
+
+    def _check_display(self):
+        key = display_key()
+        if key != self.display_key:
+            self.sprites.clear()
+            self.display_key = key
+        return key is not None
+
+    def build_sprites(self, cell_size):
+        # all lengths and orientations at once, e.g. at startup or after a resize
+        for length in self.ship_images:
+            for orientation in ("H", "V"):
+                self.get_ship_sprite(length, orientation, cell_size)
+
+    def get_ship_sprite(self, length, orientation, cell_size):
+        # None when there is no image for this length (callers draw a fallback)
+        has_display = self._check_display()
+        key = (length, orientation, cell_size)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            img = self.ship_images.get(length)
+            if img is None:
+                return None
+            sprite = pygame.transform.scale(img, (cell_size, cell_size * length))
+            if orientation == "H":
+                sprite = pygame.transform.rotate(sprite, -90)
+            if has_display:
+                sprite = sprite.convert_alpha()
+            self.sprites[key] = sprite
+        return sprite
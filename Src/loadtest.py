@@ -0,0 +1,273 @@
+# loadtest.py
+"""
+Headless load generator for BattleshipServer.
+
+Every bot is an asyncio connection that speaks the real protocol:
+connection_success (+ codec choice), game_start, quiz_question -> answer,
+answer_result, shot -> shot_result, and it applies the shot deltas to its
+own copy of both boards, asking for a snapshot (resync) when the seq/hash
+check fails, like client.py does. Bots answer correctly with probability
+--accuracy, wait --think-ms before answering and before shooting, and
+reconnect when their match ends so the load stays constant. Generated
+questions (any --difficulty) are solved; others, e.g. from a question
+bank, are guessed from the options and counted as "unsolved question".
+
+Reports turns/sec, p50/p99 round-trip latency (answer -> answer_result,
+shot -> shot_result) and errors by kind.
+
+    python loadtest.py --bots 2000 --duration 30                # against a running server
+    python loadtest.py --spawn-server --bots 2000 --think-ms 200
+"""
+import os
+import re
+import ast
+import sys
+import time
+import random
+import asyncio
+import argparse
+import resource
+import subprocess
+
+import codec
+from board import Board
+from config import SEQUENCE_COLORS, DEFAULT_PORT
+from network_utils import write_message, read_message, deserialize_board_state, apply_shot_delta
+
+SRC = os.path.dirname(os.path.abspath(__file__))
+
+
+_ARITHMETIC = re.compile(r"What is ([\d\s()+\-*/]+)\?$")
+_OPS = {ast.Add: int.__add__, ast.Sub: int.__sub__, ast.Mult: int.__mul__, ast.Div: int.__floordiv__}
+
+
+def _evaluate(node):
+    if isinstance(node, ast.Constant) and type(node.value) is int:
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _OPS:
+        return _OPS[type(node.op)](_evaluate(node.left), _evaluate(node.right))
+    raise ValueError("not integer arithmetic")
+
+
+def solve(question):
+    """
+    Answer to a generated question ("What is a op b?", the extreme
+    templates), or None for any other kind (e.g. from a question bank).
+    """
+    match = _ARITHMETIC.search(question)
+    if not match:
+        return None
+    try:
+        return str(_evaluate(ast.parse(match.group(1), mode='eval').body))
+    except (SyntaxError, ValueError, ZeroDivisionError):
+        return None
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+class Stats:
+    def __init__(self):
+        self.measuring = False
+        self.turns = 0
+        self.games = 0
+        self.latencies = []
+        self.errors = {}
+
+    def record(self, started, turn_done=False):
+        if self.measuring:
+            self.turns += turn_done
+            self.latencies.append(time.perf_counter() - started)
+
+    def error(self, kind):
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+
+class Bot:
+    """One scripted player; run() keeps it in matches until stop is set."""
+
+    def __init__(self, host, port, stats, stop, accuracy=1.0, think=0.0, codec_name=codec.BINARY,
+                 timeout=30.0, rng=random):
+        self.host = host
+        self.port = port
+        self.stats = stats
+        self.stop = stop
+        self.accuracy = accuracy
+        self.think = think
+        self.codec_name = codec_name
+        self.timeout = timeout
+        self.rng = rng
+        self.connected = asyncio.Event()
+
+    async def pause(self):
+        if self.think:
+            await asyncio.sleep(self.think * self.rng.uniform(0.5, 1.5))
+
+    async def run(self):
+        while not self.stop.is_set():
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+            except OSError:
+                self.stats.error('connect')
+                await asyncio.sleep(0.5)
+                continue
+            self.connected.set()
+            try:
+                await self.play(reader, writer)
+            except asyncio.TimeoutError:
+                self.stats.error('timeout')
+            except ConnectionError:
+                self.stats.error('disconnect')
+            finally:
+                writer.close()
+
+    async def play(self, reader, writer):
+        codec_name = codec.JSON
+        my_board = opponent_board = None
+        cells = []
+        sent = 0.0
+        while not self.stop.is_set():
+            msg = await asyncio.wait_for(read_message(reader), self.timeout)
+            if msg is None:
+                self.stats.error('disconnect')
+                return
+            kind = msg.get('type')
+
+            if kind == 'connection_success':
+                if self.codec_name in msg.get('codecs', []):
+                    write_message(writer, {'type': 'codec', 'codec': self.codec_name}, codec_name)
+                    codec_name = self.codec_name
+            elif kind == 'game_start':
+                grid = msg.get('grid_size', 10)
+                my_board = Board(SEQUENCE_COLORS, grid)
+                opponent_board = Board(SEQUENCE_COLORS, grid)
+                deserialize_board_state(my_board, msg['your_board'])
+                deserialize_board_state(opponent_board, msg['opponent_board'])
+                cells = [(r, c) for r in range(grid) for c in range(grid)]
+                self.rng.shuffle(cells)
+            elif kind == 'quiz_question':
+                await self.pause()
+                answer = solve(msg['question'])
+                if answer is None:
+                    # not a generated question: guess among the options, if any
+                    self.stats.error('unsolved question')
+                    answer = self.rng.choice(msg.get('choices') or ["?"])
+                elif self.rng.random() >= self.accuracy:
+                    answer += "0"  # wrong on purpose
+                sent = time.perf_counter()
+                write_message(writer, {'type': 'answer', 'answer': answer}, codec_name)
+            elif kind == 'answer_result':
+                self.stats.record(sent, turn_done=not msg['correct'])
+                if msg['correct']:
+                    await self.pause()
+                    sent = time.perf_counter()
+                    write_message(writer, {'type': 'shot', 'cell': list(cells.pop())}, codec_name)
+            elif kind in ('shot_result', 'opponent_shot'):
+                if kind == 'shot_result':
+                    self.stats.record(sent, turn_done=True)
+                board = opponent_board if kind == 'shot_result' else my_board
+                if board is None or not apply_shot_delta(board, msg):
+                    self.stats.error('desync')
+                    write_message(writer, {'type': 'resync'}, codec_name)
+                if msg['game_over']:
+                    if self.stats.measuring:
+                        self.stats.games += kind == 'shot_result'
+                    return
+            elif kind == 'board_snapshot':
+                deserialize_board_state(my_board, msg['your_board'])
+                deserialize_board_state(opponent_board, msg['opponent_board'])
+            elif kind not in ('opponent_turn', 'turn_skipped'):
+                self.stats.error(f'unexpected {kind}')
+
+
+async def run_load(host, port, bots, duration, accuracy=1.0, think=0.0, codec_name=codec.BINARY,
+                   ramp=0.0, warmup=1.0, timeout=30.0):
+    """Start `bots` bots, measure for `duration` seconds, return (stats, elapsed)."""
+    stats = Stats()
+    stop = asyncio.Event()
+    players = [Bot(host, port, stats, stop, accuracy, think, codec_name, timeout) for _ in range(bots)]
+    tasks = []
+    for i, bot in enumerate(players):
+        tasks.append(asyncio.create_task(bot.run()))
+        if ramp:
+            await asyncio.sleep(ramp / bots)
+        elif i % 200 == 199:
+            await asyncio.sleep(0)
+    for bot in players:
+        await bot.connected.wait()
+
+    await asyncio.sleep(warmup)
+    stats.measuring = True
+    start = time.perf_counter()
+    await asyncio.sleep(duration)
+    stats.measuring = False
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return stats, elapsed
+
+
+def raise_fd_limit(needed):
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(hard, max(needed, soft)), hard))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+
+def spawn_server(host, port):
+    # local server.py in a child process; the caller terminates it
+    server = subprocess.Popen([sys.executable, os.path.join(SRC, "server.py"),
+                               "--host", host, "--port", str(port), "--quiet"],
+                              cwd=SRC, stdout=subprocess.DEVNULL)
+    time.sleep(1.0)
+    return server
+
+
+def report(stats, elapsed, bots):
+    lat = stats.latencies
+    errors = ", ".join(f"{k} {v}" for k, v in sorted(stats.errors.items())) or "none"
+    print(f"bots {bots}, {elapsed:.1f} s: {stats.turns / elapsed:.0f} turns/s, "
+          f"{stats.games / elapsed:.1f} games/s, latency p50 {percentile(lat, 0.50) * 1000:.2f} ms, "
+          f"p99 {percentile(lat, 0.99) * 1000:.2f} ms ({len(lat)} samples), errors: {errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test BattleshipServer with scripted bots")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--bots", type=int, default=1000, help="concurrent connections (2 per match)")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds")
+    parser.add_argument("--accuracy", type=float, default=0.8, help="chance a bot answers correctly")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="mean delay before answering / shooting")
+    parser.add_argument("--codec", default=codec.BINARY, choices=codec.SUPPORTED_CODECS)
+    parser.add_argument("--ramp", type=float, default=0.0, help="seconds to spread connection setup over")
+    parser.add_argument("--timeout", type=float, default=30.0, help="max wait for a server message")
+    parser.add_argument("--spawn-server", action="store_true", help="start a local server.py for the run")
+    args = parser.parse_args()
+
+    limit = raise_fd_limit(args.bots + 64)
+    if limit < args.bots + 16:
+        print(f"{args.bots} bots need more sockets than RLIMIT_NOFILE ({limit}) allows")
+        return
+
+    server = spawn_server(args.host, args.port) if args.spawn_server else None
+    try:
+        stats, elapsed = asyncio.run(run_load(args.host, args.port, args.bots, args.duration,
+                                              args.accuracy, args.think_ms / 1000, args.codec,
+                                              args.ramp, timeout=args.timeout))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+    report(stats, elapsed, args.bots)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,33 @@
 from main_menu import MainMenu
 from app import App
+from scenes import SceneManager
 import pygame
 import sys
 
+
+def menu_closed(scenes, menu):
+    # the menu stays underneath whatever it starts and shows again after it
+    choice = menu.selected_option
+    if choice not in ("start", "computer", "multiplayer"):
+        return  # quit: nothing left on the stack
+    scenes.push(menu, on_exit=lambda menu: menu_closed(scenes, menu))
+
+    if choice == "start":
+        scenes.push(App(scenes=scenes))
+
+    elif choice == "computer":
+        scenes.push(App(vs_computer=True, scenes=scenes))
+
+    elif choice == "multiplayer":
+        from multiplayer_menu import start_multiplayer_game
+        start_multiplayer_game(scenes)
+
+
 if __name__ == "__main__":
-    pygame.init()
-    running = True
-    
-    while running:
-        menu = MainMenu()
-        choice = menu.run()
-
-        if choice == "start":
-            game = App()
-            game.run()
-            
-        elif choice == "multiplayer":
-            from multiplayer_menu import start_multiplayer_game
-            start_multiplayer_game()
-            
-        elif choice == "quit":
-            running = False
-            
-        else:
-            running = False
-    
+    scenes = SceneManager()
+    menu = MainMenu(scenes=scenes)
+    scenes.push(menu, on_exit=lambda menu: menu_closed(scenes, menu))
+    scenes.run()
+
     pygame.quit()
-    sys.exit()
\ No newline at end of file
+    sys.exit()
@@ -1,16 +1,18 @@
 import pygame
-import sys
 import styles as st
+import text_cache
+from fonts import get_font
+from scenes import SceneManager
 
 
 class MainMenu:
-    def __init__(self, screen_width=800, screen_height=600):
-        pygame.init()
-        self.screen = pygame.display.set_mode((screen_width, screen_height))
-        pygame.display.set_caption("Battleship – Main Menu")
-        self.clock = pygame.time.Clock()
-        self.font_title = pygame.font.SysFont(None, 72)
-        self.font_button = pygame.font.SysFont(None, 48)
+    def __init__(self, screen_width=800, screen_height=600, scenes=None):
+        self.scenes = scenes or SceneManager()
+        self.size = (screen_width, screen_height)
+        self.caption = "Battleship – Main Menu"
+        self.screen = self.scenes.show(self.size, self.caption)
+        self.font_title = get_font(72)
+        self.font_button = get_font(48)
         self.running = True
         self.selected_option = None
 
@@ -22,14 +24,16 @@ class MainMenu:
 
         # Button rectangles
         self.start_rect = pygame.Rect(0, 0, 200, 60)
+        self.computer_rect = pygame.Rect(0, 0, 200, 60)
         self.test_rect = pygame.Rect(0, 0, 200, 60)
         self.quit_rect = pygame.Rect(0, 0, 200, 60)
         self.start_rect.center = (screen_width // 2, screen_height // 2 - 75)
-        self.test_rect.center = (screen_width // 2, screen_height // 2)
-        self.quit_rect.center = (screen_width // 2, screen_height // 2 + 75)
+        self.computer_rect.center = (screen_width // 2, screen_height // 2)
+        self.test_rect.center = (screen_width // 2, screen_height // 2 + 75)
+        self.quit_rect.center = (screen_width // 2, screen_height // 2 + 150)
 
     def draw_text(self, text, font, color, center):
-        surf = font.render(text, True, color)
+        surf = text_cache.render(font, text, color)
         rect = surf.get_rect(center=center)
         self.screen.blit(surf, rect)
 
@@ -39,38 +43,49 @@ class MainMenu:
         pygame.draw.rect(self.screen, (100, 100, 100), rect, 2, border_radius=12)
         self.draw_text(text, self.font_button, self.TEXT_COLOR, rect.center)
 
-    def run(self):
-        # Display the menu until user starts or quits the game.
-        while self.running:
-            mouse_pos = pygame.mouse.get_pos()
+    def enter(self):
+        # shown again when the game on top of it ends
+        self.running = True
+        self.selected_option = None
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+    def handle_events(self, events):
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.selected_option = "quit"
+                self.running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                if self.start_rect.collidepoint(event.pos):
+                    self.selected_option = "start"
+                    self.running = False
+                elif self.computer_rect.collidepoint(event.pos):
+                    self.selected_option = "computer"
+                    self.running = False
+                elif self.test_rect.collidepoint(event.pos):
+                    self.selected_option = "multiplayer"
+                    self.running = False
+                elif self.quit_rect.collidepoint(event.pos):
                     self.selected_option = "quit"
                     self.running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    if self.start_rect.collidepoint(mouse_pos):
-                        self.selected_option = "start"
-                        self.running = False
-                    elif self.test_rect.collidepoint(mouse_pos):
-                        self.selected_option = "multiplayer"
-                        self.running = False
-                    elif self.quit_rect.collidepoint(mouse_pos):
-                        self.selected_option = "quit"
-                        self.running = False
 
-            # Draw background
-            self.screen.fill(self.BG_COLOR)
+    def draw(self):
+        mouse_pos = pygame.mouse.get_pos()
+
+        # Draw background
+        self.screen.fill(self.BG_COLOR)
 
-            # Title
-            self.draw_text("Battleship", self.font_title, self.TEXT_COLOR, (self.screen.get_width() // 2, 140))
+        # Title
+        self.draw_text("Battleship", self.font_title, self.TEXT_COLOR, (self.screen.get_width() // 2, 140))
 
-            # Buttons
-            self.draw_button(self.start_rect, "Start Game", mouse_pos)
-            self.draw_button(self.test_rect, "Multiplayer", mouse_pos)
-            self.draw_button(self.quit_rect, "Quit", mouse_pos)
+        # Buttons
+        self.draw_button(self.start_rect, "Start Game", mouse_pos)
+        self.draw_button(self.computer_rect, "vs Computer", mouse_pos)
+        self.draw_button(self.test_rect, "Multiplayer", mouse_pos)
+        self.draw_button(self.quit_rect, "Quit", mouse_pos)
 
-            pygame.display.flip()
-            self.clock.tick(60)
+        pygame.display.flip()
 
-        return self.selected_option
\ No newline at end of file
+    def run(self):
+        # Display the menu until user starts or quits the game.
+        self.scenes.push(self)
+        self.scenes.run()
+        return self.selected_option or "quit"
\ No newline at end of file
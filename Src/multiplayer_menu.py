@@ -1,22 +1,26 @@
 import pygame
-import sys
 import threading
-import time
 import socket
 from config import DEFAULT_PORT
 import styles as st
+import text_cache
+from fonts import get_font
+from scenes import SceneManager
+
+_server_thread = None
 
 
 class MultiplayerMenu:
-    def __init__(self, screen_width=800, screen_height=600):
-        self.screen = pygame.display.set_mode((screen_width, screen_height))
-        pygame.display.set_caption("Battleship - Multiplayer")
-        self.clock = pygame.time.Clock()
+    def __init__(self, screen_width=800, screen_height=600, scenes=None):
+        self.scenes = scenes or SceneManager()
+        self.size = (screen_width, screen_height)
+        self.caption = "Battleship - Multiplayer"
+        self.screen = self.scenes.show(self.size, self.caption)
         
         #izgled
-        self.font_title = pygame.font.SysFont(None, 64)
-        self.font_button = pygame.font.SysFont(None, 42)
-        self.font_small = pygame.font.SysFont(None, 28)
+        self.font_title = get_font(64)
+        self.font_button = get_font(42)
+        self.font_small = get_font(28)
         
         self.BG_COLOR = st.COLOR_BG
         self.TEXT_COLOR = st.COLOR_TEXT
@@ -53,11 +57,13 @@ class MultiplayerMenu:
         self.back2_rect.center = (cx, cy + 190)
         
         self.mode = "main"  # "main", "join", "host_waiting"
+        self.local_ip = None
+        self.font_large_ip = get_font(56)
     
 
 
     def draw_text(self, text, font, color, center):
-        surf = font.render(text, True, color)
+        surf = text_cache.render(font, text, color)
         rect = surf.get_rect(center=center)
         self.screen.blit(surf, rect)
     
@@ -78,7 +84,7 @@ class MultiplayerMenu:
         pygame.draw.rect(self.screen, bg_color, rect, border_radius=8)
         pygame.draw.rect(self.screen, border_color, rect, 2, border_radius=8)
         
-        text_surf = self.font_small.render(text, True, (0, 0, 0))
+        text_surf = text_cache.render(self.font_small, text, (0, 0, 0))
         text_rect = text_surf.get_rect(center=rect.center)
         self.screen.blit(text_surf, text_rect)
     
@@ -120,57 +126,41 @@ class MultiplayerMenu:
         self.screen.fill(self.BG_COLOR)
         w, h = self.screen.get_size()
         
-        self.draw_text("Hosting Game", self.font_title, self.TEXT_COLOR, (w // 2, 100))
-        self.draw_text("Waiting for opponent...", self.font_button, self.TEXT_COLOR, (w // 2, 240))
-        self.draw_text("Share this with your opponent:", self.font_small, self.TEXT_COLOR, (w // 2, 310))
+        self.draw_text("Server Started!", self.font_title, (40, 120, 40), (w // 2, 80))
+        self.draw_text("Waiting for opponent to connect...", self.font_button, self.TEXT_COLOR, (w // 2, 170))
         
-        ip = self.get_local_ip()
-        self.draw_text(f"IP: {ip}", self.font_button, (40, 120, 40), (w // 2, 360))
-        self.draw_text(f"Port: {DEFAULT_PORT}", self.font_small, self.TEXT_COLOR, (w // 2, 400))
-    
-    def show_host_waiting_screen(self):
-        waiting = True
-        self.screen.fill(self.BG_COLOR)
-        w, h = self.screen.get_size()
+        info_rect = pygame.Rect(w // 2 - 250, 240, 500, 180)
+        pygame.draw.rect(self.screen, (220, 240, 255), info_rect, border_radius=15)
+        pygame.draw.rect(self.screen, (100, 140, 200), info_rect, 4, border_radius=15)
         
-        ip = self.get_local_ip()
+        self.draw_text("Player 2 should enter:", self.font_small, self.TEXT_COLOR, (w // 2, 275))
         
-        font_large_ip = pygame.font.SysFont(None, 56)
+        ip_surf = text_cache.render(self.font_large_ip, self.local_ip, (20, 80, 180))
+        ip_rect = ip_surf.get_rect(center=(w // 2, 330))
+        self.screen.blit(ip_surf, ip_rect)
+        
+        self.draw_text(f"Port: {DEFAULT_PORT}", self.font_button, (80, 80, 80), (w // 2, 385))
+        
+        self.draw_text("Press any key when ready to start...", self.font_small, (120, 120, 120), (w // 2, 480))
+    
+    def start_server(self):
+        global _server_thread
+        from server import BattleshipServer
         
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
-                    waiting = False
-            
-            self.screen.fill(self.BG_COLOR)
-            
-            self.draw_text("Server Started!", self.font_title, (40, 120, 40), (w // 2, 80))
-            self.draw_text("Waiting for opponent to connect...", self.font_button, self.TEXT_COLOR, (w // 2, 170))
-            
-            info_rect = pygame.Rect(w // 2 - 250, 240, 500, 180)
-            pygame.draw.rect(self.screen, (220, 240, 255), info_rect, border_radius=15)
-            pygame.draw.rect(self.screen, (100, 140, 200), info_rect, 4, border_radius=15)
-            
-            self.draw_text("Player 2 should enter:", self.font_small, self.TEXT_COLOR, (w // 2, 275))
-            
-            ip_surf = font_large_ip.render(ip, True, (20, 80, 180))
-            ip_rect = ip_surf.get_rect(center=(w // 2, 330))
-            self.screen.blit(ip_surf, ip_rect)
-            
-            self.draw_text(f"Port: {DEFAULT_PORT}", self.font_button, (80, 80, 80), (w // 2, 385))
-            
-            self.draw_text("Press any key when ready to start...", self.font_small, (120, 120, 120), (w // 2, 480))
-            
-            pygame.display.flip()
-            self.clock.tick(60)
+        # one server per process; hosting again after a game reuses it
+        if _server_thread is None or not _server_thread.is_alive():
+            print("[MULTIPLAYER] Starting server...")
+            _server_thread = threading.Thread(
+                target=lambda: BattleshipServer().start(),
+                daemon=True
+            )
+            _server_thread.start()
+        self.local_ip = self.get_local_ip()
+        self.mode = "host_waiting"
     
     def handle_main_click(self, mouse_pos):
         if self.host_rect.collidepoint(mouse_pos):
-            self.choice = "host"
-            self.running = False
+            self.start_server()
         elif self.join_rect.collidepoint(mouse_pos):
             self.mode = "join"
         elif self.back_rect.collidepoint(mouse_pos):
@@ -206,70 +196,61 @@ class MultiplayerMenu:
                 if event.unicode.isdigit():
                     self.port_input += event.unicode
     
-    # pokazi meni
-    def run(self):
-        while self.running:
-            mouse_pos = pygame.mouse.get_pos()
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    if self.mode == "main":
-                        self.handle_main_click(mouse_pos)
-                    elif self.mode == "join":
-                        self.handle_join_click(mouse_pos)
-                elif event.type == pygame.KEYDOWN and self.mode == "join":
-                    self.handle_text_input(event)
-
-            if self.mode == "main":
-                self.draw_main_menu(mouse_pos)
-            elif self.mode == "join":
-                self.draw_join_menu(mouse_pos)
+    def handle_events(self, events):
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.running = False
             elif self.mode == "host_waiting":
-                self.draw_host_menu()
-            
-            pygame.display.flip()
-            self.clock.tick(60)
+                if event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
+                    self.choice = "host"
+                    self.running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                if self.mode == "main":
+                    self.handle_main_click(event.pos)
+                elif self.mode == "join":
+                    self.handle_join_click(event.pos)
+            elif event.type == pygame.KEYDOWN and self.mode == "join":
+                self.handle_text_input(event)
+    
+    def draw(self):
+        mouse_pos = pygame.mouse.get_pos()
+        if self.mode == "main":
+            self.draw_main_menu(mouse_pos)
+        elif self.mode == "join":
+            self.draw_join_menu(mouse_pos)
+        elif self.mode == "host_waiting":
+            self.draw_host_menu()
         
+        pygame.display.flip()
+    
+    def address(self):
+        # where the client connects for the chosen option
         if self.choice == "join":
             port = int(self.port_input) if self.port_input else DEFAULT_PORT
-            return self.choice, self.ip_input, port
+            return self.ip_input, port
+        return 'localhost', DEFAULT_PORT
+    
+    # pokazi meni
+    def run(self):
+        self.scenes.push(self)
+        self.scenes.run()
+        if self.choice == "join":
+            return (self.choice,) + self.address()
         return self.choice, None, None
 
 
-# glavna funkcija, pokazi multiplayer meni, zaženi host game ali join game
-def start_multiplayer_game():
-    menu = MultiplayerMenu()
-    choice, host, port = menu.run()
-    
-    if choice == "back":
-        return None
-    
-    if choice == "host":
-        from server import BattleshipServer
-        
-        print("[MULTIPLAYER] Starting server...")
-        server_thread = threading.Thread(
-            target=lambda: BattleshipServer().start(),
-            daemon=True
-        )
-        server_thread.start()
-        
-        time.sleep(0.5)
-        
-        menu.show_host_waiting_screen()
-        
+# glavna funkcija, pokazi multiplayer meni, potem igro na svojem ali tujem serverju
+def start_multiplayer_game(scenes):
+    scenes.push(MultiplayerMenu(scenes=scenes), on_exit=lambda menu: _menu_closed(scenes, menu))
+
+
+def _menu_closed(scenes, menu):
+    if menu.choice not in ("host", "join"):
+        return  # back to the main menu
+    host, port = menu.address()
+    if menu.choice == "host":
         print("[MULTIPLAYER] Connecting to own server...")
-        from client import BattleshipClient
-        client = BattleshipClient(host='localhost')
-        client.run()
-        
-    elif choice == "join":
+    else:
         print(f"[MULTIPLAYER] Connecting to {host}:{port}...")
-        from client import BattleshipClient
-        client = BattleshipClient(host=host, port=port)
-        client.run()
-    
-    return "done"
\ No newline at end of file
+    from client import BattleshipClient
+    scenes.push(BattleshipClient(host=host, port=port, scenes=scenes))
@@ -1,52 +1,182 @@
-import json
-import socket
+import struct
+import asyncio
+import codec
+from board import Ship
 
-def send_json(sock, data):
+# vsak frame: 4-bajtna dolzina (big endian) + payload
+FRAME_HEADER = struct.Struct('!I')
+MAX_FRAME_SIZE = 1 << 20
+RECV_BUFFER_SIZE = 4096  # grows per connection only when a bigger frame arrives
+
+
+class FrameError(ValueError):
+    """Raised when the peer sends a frame larger than the allowed maximum."""
+
+
+def encode_frame(payload):
+    if len(payload) > MAX_FRAME_SIZE:
+        raise FrameError(f"frame of {len(payload)} bytes exceeds {MAX_FRAME_SIZE}")
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+def encode_message(data, codec_name=codec.JSON):
+    return encode_frame(codec.encode(data, codec_name))
+
+
+def decode_message(frame):
+    # either codec, see codec.decode
+    return codec.decode(frame)
+
+
+class FrameReader:
+    """
+    Splits a byte stream into length-prefixed frames.
+    Data is received straight into one reusable bytearray (recv_into /
+    BufferedProtocol.get_buffer), and complete frames are handed out as
+    memoryview slices of it, so nothing is copied while a frame is assembled.
+    A memoryview returned by frames() is only valid until the next receive.
+    """
+    def __init__(self, max_frame_size=MAX_FRAME_SIZE, buffer_size=RECV_BUFFER_SIZE):
+        self.max_frame_size = max_frame_size
+        self.buffer_size = buffer_size
+        self.buffer = bytearray(buffer_size)
+        self.view = memoryview(self.buffer)
+        self.start = 0  # first byte not yet handed out
+        self.end = 0    # end of received data
+
+    def _replace_buffer(self, size):
+        pending = self.end - self.start
+        buffer = bytearray(size)
+        buffer[:pending] = self.view[self.start:self.end]
+        self.view.release()
+        self.buffer = buffer
+        self.view = memoryview(buffer)
+        self.start, self.end = 0, pending
+
+    def get_buffer(self, sizehint=-1):
+        """Writable memoryview for the next receive."""
+        pending = self.end - self.start
+        if pending == 0 and len(self.buffer) > self.buffer_size:
+            # a big frame is done with: back to the small buffer
+            self._replace_buffer(self.buffer_size)
+        needed = max(self.frame_size_needed(), sizehint if sizehint > 0 else 0, 1)
+        if len(self.buffer) - self.end >= needed:
+            return self.view[self.end:]
+
+        if self.start:
+            # move the partial frame to the front
+            self.view[:pending] = self.view[self.start:self.end]
+            self.start, self.end = 0, pending
+        if self.end == len(self.buffer):
+            # full of one unfinished frame: at most double, so the buffer only
+            # grows with bytes that actually arrived, not with the declared length
+            self._replace_buffer(min(len(self.buffer) * 2, pending + needed))
+        return self.view[self.end:]
+
+    def frame_size_needed(self):
+        # bytes still missing for the frame at the front of the buffer
+        pending = self.end - self.start
+        if pending < FRAME_HEADER.size:
+            return FRAME_HEADER.size - pending
+        (length,) = FRAME_HEADER.unpack_from(self.buffer, self.start)
+        if length > self.max_frame_size:
+            return 1  # frames() rejects it
+        return FRAME_HEADER.size + length - pending
+
+    def advance(self, nbytes):
+        self.end += nbytes
+
+    def frames(self):
+        """Yield every complete frame currently in the buffer."""
+        while self.end - self.start >= FRAME_HEADER.size:
+            (length,) = FRAME_HEADER.unpack_from(self.buffer, self.start)
+            if length > self.max_frame_size:
+                raise FrameError(f"frame of {length} bytes exceeds {self.max_frame_size}")
+            frame_end = self.start + FRAME_HEADER.size + length
+            if frame_end > self.end:
+                break
+            frame = self.view[self.start + FRAME_HEADER.size:frame_end]
+            self.start = frame_end
+            yield frame
+        if self.start == self.end:
+            self.start = self.end = 0
+
+    def recv_from(self, sock):
+        """One recv_into syscall. Returns the number of bytes read (0 = closed)."""
+        nbytes = sock.recv_into(self.get_buffer())
+        self.advance(nbytes)
+        return nbytes
+
+
+def send_message(sock, data, codec_name=codec.JSON):
     try:
-        message = json.dumps(data) + '\n'
-        sock.sendall(message.encode('utf-8'))
+        sock.sendall(encode_message(data, codec_name))
         return True
-    except Exception as e:
+    except (OSError, TypeError, ValueError) as e:
         print(f"[NET] Send error: {e}")
         return False
 
-# return: (message_dict, remaining_buffer) ali (None, buffer)
-def receive_json(sock, buffer=b''):
+# return: seznam vseh sporocil iz enega recv klica, ali None ob prekinitvi
+def receive_messages(sock, reader):
     try:
-        while b'\n' not in buffer:
-            chunk = sock.recv(1024)
-            if not chunk:
-                return None, buffer
-            buffer += chunk
-        
-        line, buffer = buffer.split(b'\n', 1)
-        if line:
-            return json.loads(line.decode('utf-8')), buffer
-        return None, buffer
-    except Exception as e:
+        while True:
+            if reader.recv_from(sock) == 0:
+                return None
+            messages = [decode_message(frame) for frame in reader.frames()]
+            if messages:
+                return messages
+    except (OSError, ValueError) as e:
         print(f"[NET] Receive error: {e}")
-        return None, buffer
+        return None
+
+# asyncio verzija (streams), npr. za bote
+def write_message(writer, data, codec_name=codec.JSON):
+    writer.write(encode_message(data, codec_name))
+
+# return: message_dict ali None ob prekinitvi
+async def read_message(reader, max_frame_size=MAX_FRAME_SIZE):
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+        (length,) = FRAME_HEADER.unpack(header)
+        if length > max_frame_size:
+            raise FrameError(f"frame of {length} bytes exceeds {max_frame_size}")
+        return decode_message(await reader.readexactly(length))
+    except asyncio.IncompleteReadError:
+        return None
+    except (ConnectionError, ValueError) as e:
+        print(f"[NET] Receive error: {e}")
+        return None
 
 # spremeni board v dict
 def serialize_board(board, show_ships=False):
     data = {
+        'grid_size': board.grid_size,
         'hits': list(board.hits),
         'misses': list(board.misses),
+        'seq': board.seq,
+        'hash': board.state_hash,
     }
     if show_ships:
-        data['ships'] = {f"{r},{c}": list(color) for (r, c), color in board.cells_with_colors.items()}
+        # one [row, col, orientation, length, rgb] per ship, in id order
+        data['ships'] = [[s.row, s.col, s.orientation, s.length, list(s.color)] for s in board.ships]
     return data
 
-# posodobi hits in misses
+# posodobi hits in misses (celoten snapshot)
 def deserialize_board_state(board, board_data):
-    board.hits = set(tuple(h) for h in board_data.get('hits', []))
-    board.misses = set(tuple(m) for m in board_data.get('misses', []))
+    board.reset_state((tuple(h) for h in board_data.get('hits', [])),
+                      (tuple(m) for m in board_data.get('misses', [])))
+
+# en strel (delta) iz shot_result / opponent_shot
+# return: False ce se seq ali hash ne ujemata -> treba zahtevati snapshot
+def apply_shot_delta(board, msg):
+    if msg['outcome'] == 'repeat' or msg['seq'] <= board.seq:
+        return True  # nothing changed / already in a newer snapshot
+    if msg['seq'] != board.seq + 1:
+        return False
+    board.mark(tuple(msg['cell']), msg['outcome'] == 'hit')
+    return board.state_hash == msg['hash']
 
 # set board ships, na začetku
 def deserialize_board_ships(board, board_data):
-    ships_dict = board_data.get('ships', {})
-    cells_with_colors = {}
-    for key, color in ships_dict.items():
-        r, c = map(int, key.split(','))
-        cells_with_colors[(r, c)] = tuple(color)
-    board.set_cells(cells_with_colors)
\ No newline at end of file
+    board.set_ships([Ship(i, r, c, orientation, length, tuple(color), board.grid_size)
+                     for i, (r, c, orientation, length, color) in enumerate(board_data.get('ships', []))])
\ No newline at end of file
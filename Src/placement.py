@@ -0,0 +1,191 @@
+# placement.py
+"""
+Ship placement engine.
+
+For every (grid size, ship length) the table of all legal placements is
+built once; a placement is a bitmask (see bitboard.py) plus its origin and
+orientation. Fleets are drawn by sampling one placement per ship and
+rejecting the whole fleet on overlap, which is exactly uniform over all
+valid fleets. If that keeps failing (very crowded boards) a randomized
+backtracking search takes over, so sampling always terminates: it either
+returns a valid fleet or raises ValueError when none exists. The fallback
+is not uniform (each ship, longest first, is uniform only among the spots
+the earlier ones left free); on the standard 10x10 fleet rejection
+succeeds long before REJECTION_TRIES.
+
+sample_fleets() does the same in bulk with NumPy for simulations.
+"""
+import random
+import warnings
+import functools
+import itertools
+
+REJECTION_TRIES = 2000
+
+
+class Placement:
+    """One legal position of a ship: origin cell, 'H' or 'V', length and bitmask."""
+    __slots__ = ('row', 'col', 'orientation', 'length', 'mask')
+
+    def __init__(self, row, col, orientation, length, mask):
+        self.row = row
+        self.col = col
+        self.orientation = orientation
+        self.length = length
+        self.mask = mask
+
+    def cells(self):
+        if self.orientation == "H":
+            return [(self.row, self.col + i) for i in range(self.length)]
+        return [(self.row + i, self.col) for i in range(self.length)]
+
+    def __repr__(self):
+        return f"Placement({self.row}, {self.col}, {self.orientation!r}, {self.length})"
+
+
+@functools.lru_cache(maxsize=None)
+def placement_table(grid_size, length):
+    """All legal placements of one ship, horizontal ones first."""
+    if not 1 <= length <= grid_size:
+        return ()
+    table = []
+    run = (1 << length) - 1
+    col_run = sum(1 << (i * grid_size) for i in range(length))
+    for row in range(grid_size):
+        for col in range(grid_size - length + 1):
+            table.append(Placement(row, col, "H", length, run << (row * grid_size + col)))
+    if length > 1:
+        for row in range(grid_size - length + 1):
+            for col in range(grid_size):
+                table.append(Placement(row, col, "V", length, col_run << (row * grid_size + col)))
+    return tuple(table)
+
+
+def sample_fleet(grid_size, lengths, rng=random):
+    """
+    One random non-overlapping fleet, as a list of Placements in the order
+    of `lengths`: uniform when rejection succeeds within REJECTION_TRIES,
+    biased if the backtracking fallback has to take over. Raises
+    ValueError if the ships cannot fit.
+    """
+    tables = [placement_table(grid_size, length) for length in lengths]
+    if any(not t for t in tables):
+        raise ValueError(f"ship lengths {lengths} do not fit a {grid_size}x{grid_size} grid")
+
+    for _ in range(REJECTION_TRIES):
+        occupied = 0
+        fleet = []
+        for table in tables:
+            p = table[rng.randrange(len(table))]
+            if occupied & p.mask:
+                break
+            occupied |= p.mask
+            fleet.append(p)
+        else:
+            return fleet
+    return _backtrack_fleet(tables, rng)
+
+
+def _backtrack_fleet(tables, rng):
+    # longest ships first prunes earliest; results are put back in input order
+    order = sorted(range(len(tables)), key=lambda i: -tables[i][0].length)
+    chosen = [None] * len(tables)
+
+    def place(k, occupied):
+        if k == len(order):
+            return True
+        i = order[k]
+        candidates = list(tables[i])
+        rng.shuffle(candidates)
+        for p in candidates:
+            if not occupied & p.mask:
+                chosen[i] = p
+                if place(k + 1, occupied | p.mask):
+                    return True
+        return False
+
+    if not place(0, 0):
+        raise ValueError("no non-overlapping fleet exists for these ship lengths")
+    return chosen
+
+
+def fleet_to_colors(fleet, sequence_colors):
+    """Placements -> {cell: colour}, the old per-cell fleet format (see benchmarks)."""
+    cell_to_color = {}
+    for p, color in zip(fleet, itertools.cycle(sequence_colors)):
+        for cell in p.cells():
+            cell_to_color[cell] = color
+    return cell_to_color
+
+
+# --- bulk sampling (NumPy) ---
+@functools.lru_cache(maxsize=None)
+def placement_cells_array(grid_size, length):
+    """(placements, length) array of cell indices, same order as placement_table."""
+    import numpy as np
+    table = placement_table(grid_size, length)
+    dtype = np.int16 if grid_size * grid_size < 2 ** 15 else np.int32
+    return np.array([[r * grid_size + c for r, c in p.cells()] for p in table], dtype=dtype).reshape(-1, length)
+
+
+def sample_fleets(n, grid_size, lengths, rng=None, chunk=250_000, exact=False):
+    """
+    n random fleets as an (n, len(lengths)) int32 array of indices into
+    placement_table(grid_size, length) for each ship, by rejection in
+    bulk, so exactly uniform. A chunk that yields nothing is followed by a
+    bigger one (up to `chunk` fleets); only if `chunk`-sized chunks keep
+    coming back empty does it switch to sample_fleet, whose backtracking
+    fallback is biased, and it says so with a RuntimeWarning (or raises
+    ValueError when exact=True).
+    rng is a numpy Generator or a seed.
+    """
+    import numpy as np
+    rng = np.random.default_rng(rng)
+    tables = [placement_cells_array(grid_size, length) for length in lengths]
+    if any(len(t) == 0 for t in tables):
+        raise ValueError(f"ship lengths {lengths} do not fit a {grid_size}x{grid_size} grid")
+
+    out = np.empty((n, len(lengths)), dtype=np.int32)
+    filled = 0
+    misses_in_a_row = 0
+    boost = 1  # grows while chunks come back empty
+    while filled < n:
+        m = min(chunk, max(1024, 2 * (n - filled)) * boost)
+        idx = np.stack([rng.integers(0, len(t), size=m, dtype=np.int32) for t in tables], axis=1)
+        cells = np.concatenate([t[idx[:, s]] for s, t in enumerate(tables)], axis=1)
+        cells.sort(axis=1)
+        ok = ~(cells[:, 1:] == cells[:, :-1]).any(axis=1)
+        accepted = idx[ok][:n - filled]
+        out[filled:filled + len(accepted)] = accepted
+        filled += len(accepted)
+
+        if len(accepted):
+            misses_in_a_row = 0
+        elif m < chunk:
+            boost *= 4  # rare acceptance: try a bigger chunk
+        else:
+            misses_in_a_row += 1
+        if misses_in_a_row >= 3:
+            # rejection is hopeless here; fall back to the scalar sampler
+            message = (f"sample_fleets: no valid fleet in the last {3 * chunk} draws for {lengths} on "
+                       f"{grid_size}x{grid_size}; the remaining {n - filled} are not uniform")
+            if exact:
+                raise ValueError(message)
+            warnings.warn(message, RuntimeWarning, stacklevel=2)
+            py_rng = random.Random(int(rng.integers(2 ** 63)))
+            while filled < n:
+                fleet = sample_fleet(grid_size, lengths, py_rng)
+                out[filled] = [placement_table(grid_size, p.length).index(p) for p in fleet]
+                filled += 1
+    return out
+
+
+def fleet_boards(fleets, grid_size, lengths):
+    """(n, ships) placement indices -> (n, grid_size * grid_size) bool ship boards."""
+    import numpy as np
+    n = len(fleets)
+    boards = np.zeros((n, grid_size * grid_size), dtype=bool)
+    rows = np.arange(n)[:, None]
+    for s, length in enumerate(lengths):
+        boards[rows, placement_cells_array(grid_size, length)[fleets[:, s]]] = True
+    return boards
@@ -0,0 +1,272 @@
+# question_bank.py
+"""
+On-disk question bank, memory-mapped.
+
+File layout (little-endian):
+
+    header   '<4sHHHHIQ'  magic b"QBNK", version, header size, #difficulties,
+                          #topics, #records, size of the metadata block
+    metadata JSON {"difficulties": [...], "topics": [...]}, padded to 8 bytes
+    groups   u32 * (D * T + 1)  first record of every (difficulty, topic)
+                                group, difficulty-major, plus the end
+    offsets  u64 * (records + 1)  byte offset of every record in the text
+    text     UTF-8 records: question, answer, choices... joined by \\x1f
+
+Records are sorted by (difficulty, topic), so every group, and every
+difficulty as a whole, is one contiguous range of record numbers: a
+filtered random draw is a single randrange plus one offset lookup. Opening
+a bank only reads the header and metadata; the rest is paged in by the OS
+on demand, and processes that map the same file share those pages.
+
+    python question_bank.py build bank.qb --generate 1000000
+    python question_bank.py build bank.qb --csv questions.csv   # topic,difficulty,question,answer[,choices;...]
+    python question_bank.py info bank.qb
+"""
+import io
+import os
+import sys
+import csv
+import mmap
+import json
+import struct
+import random
+import argparse
+from array import array
+
+MAGIC = b"QBNK"
+VERSION = 1
+HEADER = struct.Struct('<4sHHHHIQ')
+SEPARATOR = "\x1f"
+
+
+class QuestionBankError(ValueError):
+    pass
+
+
+def _pad8(n):
+    return (n + 7) & ~7
+
+
+class QuestionBank:
+    """Read-only view of a bank file; draw() and get() decode single records."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            try:
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:  # empty file
+                raise QuestionBankError(f"{path}: not a question bank ({e})") from e
+        try:
+            self._parse()
+        except (struct.error, ValueError, TypeError, KeyError) as e:
+            self._release()
+            raise QuestionBankError(f"{path}: not a question bank ({e})") from e
+
+    def _parse(self):
+        size = len(self.map)
+        magic, version, header_size, n_diff, n_topics, n_records, meta_size = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION or header_size != HEADER.size:
+            raise ValueError(f"bad header {magic!r} v{version}")
+        pos = HEADER.size
+        groups_pos = pos + _pad8(meta_size)
+        groups_size = 4 * (n_diff * n_topics + 1)
+        offsets_pos = groups_pos + _pad8(groups_size)
+        text_start = offsets_pos + 8 * (n_records + 1)
+        if text_start > size:
+            raise ValueError(f"truncated: tables end at byte {text_start}, file has {size}")
+        meta = json.loads(bytes(self.map[pos:pos + meta_size]))
+        self.difficulties = meta['difficulties']
+        self.topics = meta['topics']
+        if len(self.difficulties) != n_diff or len(self.topics) != n_topics:
+            raise ValueError("metadata does not match header")
+
+        view = memoryview(self.map)
+        self.groups = view[groups_pos:groups_pos + groups_size].cast('I')
+        self.offsets = view[offsets_pos:text_start].cast('Q')
+        view.release()
+        groups = self.groups.tolist()
+        if groups[0] != 0 or groups[-1] != n_records or any(a > b for a, b in zip(groups, groups[1:])):
+            raise ValueError("group table does not match the records")
+        if self.offsets[0] != 0 or text_start + self.offsets[n_records] != size:
+            raise ValueError(f"text is {size - text_start} bytes, offsets say {self.offsets[n_records]}")
+        self.text_start = text_start
+        self.n_records = n_records
+        self.difficulty_index = {d: i for i, d in enumerate(self.difficulties)}
+        self.topic_index = {t: i for i, t in enumerate(self.topics)}
+
+    def __len__(self):
+        return self.n_records
+
+    def _release(self):
+        # the views must go before the map, which refuses to close while exported
+        for name in ('groups', 'offsets'):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self.map.close()
+
+    def close(self):
+        self._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, i):
+        """Record i as (question, answer) or (question, answer, choices)."""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        fields = self.map[self.text_start + start:self.text_start + end].decode('utf-8').split(SEPARATOR)
+        if len(fields) < 2:
+            raise QuestionBankError(f"{self.path}: record {i} is corrupt")
+        if len(fields) > 2:
+            return fields[0], fields[1], fields[2:]
+        return fields[0], fields[1]
+
+    def _group(self, d, t):
+        g = d * len(self.topics) + t
+        return self.groups[g], self.groups[g + 1]
+
+    def record_range(self, difficulty=None, topic=None):
+        """(first, end) record numbers when the filter is one contiguous range, else None."""
+        T = len(self.topics)
+        if difficulty is None and topic is None:
+            return 0, self.n_records
+        if difficulty is not None:
+            d = self._lookup(self.difficulty_index, difficulty, "difficulty")
+            if topic is None:
+                return self.groups[d * T], self.groups[(d + 1) * T]
+            return self._group(d, self._lookup(self.topic_index, topic, "topic"))
+        return None
+
+    def count(self, difficulty=None, topic=None):
+        span = self.record_range(difficulty, topic)
+        if span is not None:
+            return span[1] - span[0]
+        t = self._lookup(self.topic_index, topic, "topic")
+        return sum(b - a for a, b in (self._group(d, t) for d in range(len(self.difficulties))))
+
+    def draw(self, rng=random, difficulty=None, topic=None):
+        """Uniformly random record matching the filter."""
+        span = self.record_range(difficulty, topic)
+        if span is None:
+            # topic only: one range per difficulty, pick across them
+            t = self._lookup(self.topic_index, topic, "topic")
+            k = rng.randrange(self.count(topic=topic) or 1)
+            for d in range(len(self.difficulties)):
+                a, b = self._group(d, t)
+                if k < b - a:
+                    return self.get(a + k)
+                k -= b - a
+            raise QuestionBankError(f"no questions for topic {topic!r}")
+        first, end = span
+        if end <= first:
+            raise QuestionBankError(f"no questions for difficulty={difficulty!r} topic={topic!r}")
+        return self.get(first + rng.randrange(end - first))
+
+    @staticmethod
+    def _lookup(index, key, what):
+        try:
+            return index[key]
+        except KeyError:
+            raise QuestionBankError(f"unknown {what} {key!r}") from None
+
+
+def _le(values):
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tobytes()
+
+
+def build_question_bank(path, rows):
+    """
+    Write a bank from rows of (topic, difficulty, question, answer, choices),
+    choices being a list of strings or None. Rows may come in any order.
+    """
+    groups = {}
+    for topic, difficulty, question, answer, choices in rows:
+        fields = [question, answer] + list(choices or [])
+        if any(SEPARATOR in f for f in fields):
+            raise QuestionBankError(f"field contains the separator: {fields!r}")
+        groups.setdefault((difficulty, topic), []).append(SEPARATOR.join(fields).encode('utf-8'))
+
+    difficulties = sorted({d for d, _ in groups})
+    topics = sorted({t for _, t in groups})
+    meta = json.dumps({'difficulties': difficulties, 'topics': topics}).encode('utf-8')
+
+    starts = []
+    offsets = array('Q', [0])
+    n = 0
+    text = io.BytesIO()
+    for d in difficulties:
+        for t in topics:
+            starts.append(n)
+            for record in groups.get((d, t), ()):
+                text.write(record)
+                offsets.append(offsets[-1] + len(record))
+                n += 1
+    starts.append(n)
+
+    tmp = path + ".tmp"
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, HEADER.size, len(difficulties), len(topics), n, len(meta)))
+        for block in (meta, _le(array('I', starts))):
+            f.write(block)
+            f.write(b"\0" * (_pad8(len(block)) - len(block)))
+        f.write(_le(array('Q', offsets)))
+        f.write(text.getbuffer())
+    os.replace(tmp, path)  # readers never see a half-written bank
+    return n
+
+
+def generated_rows(n, seed=0):
+    # synthetic bank from gen_questions, spread over the three difficulties
+    import gen_questions
+    per = -(-n // 3)
+    for k, difficulty in enumerate(("simple", "multiple_choice", "extreme")):
+        count = max(0, min(per, n - k * per))
+        if not count:
+            continue
+        for row in gen_questions.generate_batch(difficulty, count, [seed, k]):
+            yield ("arithmetic", difficulty, row[0], row[1], row[2] if len(row) > 2 else None)
+
+
+def csv_rows(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        for line in csv.reader(f):
+            if not line or line[0].startswith('#'):
+                continue
+            topic, difficulty, question, answer = line[:4]
+            choices = line[4].split(';') if len(line) > 4 and line[4] else None
+            yield topic, difficulty, question, answer, choices
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or inspect a question bank file")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build")
+    build.add_argument("path")
+    source = build.add_mutually_exclusive_group(required=True)
+    source.add_argument("--csv", help="topic,difficulty,question,answer[,choice;choice;...]")
+    source.add_argument("--generate", type=int, metavar="N", help="N generated arithmetic questions")
+    build.add_argument("--seed", type=int, default=0)
+    info = sub.add_parser("info")
+    info.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        rows = csv_rows(args.csv) if args.csv else generated_rows(args.generate, args.seed)
+        n = build_question_bank(args.path, rows)
+        print(f"{args.path}: {n} questions, {os.path.getsize(args.path) / 1e6:.1f} MB")
+    else:
+        with QuestionBank(args.path) as bank:
+            print(f"{args.path}: {len(bank)} questions")
+            for d in bank.difficulties:
+                for t in bank.topics:
+                    print(f"  {d:>16} {t:>16} {bank.count(d, t):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,10 @@
 
 import pygame
 import textwrap
+import text_cache
+from fonts import get_font, CARD_FAMILIES
 
-try_fonts = ["Montserrat", "Poppins", "Nunito", "Inter", "Avenir", "Segoe UI", "Arial"]
-def get_font(size, bold=False):
-    for name in try_fonts:
-        path = pygame.font.match_font(name, bold=bold)
-        if path:
-            return pygame.font.Font(path, size)
-    return pygame.font.SysFont(None, size, bold=bold)
+CHOICE_H = 36  # height of an answer option button
 
 class QuestionCard:
     def __init__(self, surface, width=680, padding=24):
@@ -16,10 +12,10 @@ class QuestionCard:
         self.width = width
         self.padding = padding
 
-        self.title_font = get_font(28, bold=True)
-        self.text_font  = get_font(22, bold=False)
-        self.input_font = get_font(22, bold=False)
-        self.btn_font   = get_font(22, bold=True)
+        self.title_font = get_font(28, bold=True, families=CARD_FAMILIES)
+        self.text_font  = get_font(22, bold=False, families=CARD_FAMILIES)
+        self.input_font = get_font(22, bold=False, families=CARD_FAMILIES)
+        self.btn_font   = get_font(22, bold=True, families=CARD_FAMILIES)
 
         # colors
         self.bg = (20, 24, 32)           # canvas
@@ -36,10 +32,14 @@ class QuestionCard:
         # component state
         self.input_value = ""
         self.feedback = None  # ("correct" | "wrong", message)
+        self.choices = None   # answer options of a multiple-choice question
 
         # button rects set on layout
         self.input_rect = None
         self.btn_rect = None
+        self.choice_rects = []
+        self._rect_for = None
+        self._rect = None
 
     def set_input(self, value: str):
         self.input_value = value
@@ -50,21 +50,13 @@ class QuestionCard:
     def clear_feedback(self):
         self.feedback = None
 
+    def set_choices(self, choices):
+        # a row of option buttons under the question; clicking one answers with it
+        self.choices = list(choices) if choices else None
+        self.choice_rects = []
+
     def wrap_text(self, text, font, max_w):
-        words = text.split(" ")
-        lines = []
-        line = ""
-        for w in words:
-            test = (line + " " + w).strip()
-            if font.size(test)[0] <= max_w:
-                line = test
-            else:
-                if line:
-                    lines.append(line)
-                line = w
-        if line:
-            lines.append(line)
-        return lines
+        return text_cache.wrap(font, text, max_w)
 
     def draw_round_rect(self, rect, color, radius=16, border=0, border_color=None, shadow=True):
         x, y, w, h = rect
@@ -78,14 +70,37 @@ class QuestionCard:
         if border and border_color:
             pygame.draw.rect(self.surface, border_color, rect, width=border, border_radius=radius)
 
+    def card_height(self, question, card_w):
+        # title + question + options + input + feedback line, at least 220
+        lines = self.wrap_text(question, self.text_font, card_w - self.padding * 2)
+        content_h = (self.title_font.get_height() + 8 + len(lines) * (self.text_font.get_height() + 2)
+                     + 12 + (CHOICE_H + 12 if self.choices else 0) + 40 + 12 + self.padding * 2 + 24)
+        return max(220, content_h)
+
+    def rect(self, question, center):
+        # area draw() may paint, shadow included (cached per question)
+        key = (question, center, bool(self.choices))
+        if self._rect_for != key:
+            card_w = min(self.width, self.surface.get_width() - 40)
+            self._rect = pygame.Rect(center[0] - card_w // 2, center[1] - 160, card_w + 4,
+                                     self.card_height(question, card_w) + 6)
+            self._rect_for = key
+        return self._rect
+
+    def render_key(self, question):
+        # question, options, typed answer, feedback and button hover
+        mouse = pygame.mouse.get_pos()
+        hovered = bool(self.btn_rect and self.btn_rect.collidepoint(mouse))
+        hovered_choice = next((i for i, r in enumerate(self.choice_rects) if r.collidepoint(mouse)), None)
+        choices = tuple(self.choices) if self.choices else None
+        return question, choices, self.input_value, self.feedback, hovered, hovered_choice
+
     def draw(self, question: str, center):
         sw, sh = self.surface.get_size()
         card_w = min(self.width, sw - 40)
-        # dynamic height: title + question + input + button + spacing
-        # start with generous height and compute in-flow
         x = center[0] - card_w // 2
         y = center[1] - 160
-        card_h = 220
+        card_h = self.card_height(question, card_w)
 
         # card
         self.draw_round_rect((x, y, card_w, card_h), self.card, radius=18, border=1, border_color=self.card_border, shadow=True)
@@ -96,19 +111,23 @@ class QuestionCard:
         content_w = card_w - self.padding * 2
 
         # title
-        title_surf = self.title_font.render("Answer to fire!", True, self.text)
+        title_surf = text_cache.render(self.title_font, "Answer to fire!", self.text)
         self.surface.blit(title_surf, (content_x, content_y))
         content_y += title_surf.get_height() + 8
 
         # question
         q_lines = self.wrap_text(question, self.text_font, content_w)
         for line in q_lines:
-            ln = self.text_font.render(line, True, self.text)
+            ln = text_cache.render(self.text_font, line, self.text)
             self.surface.blit(ln, (content_x, content_y))
             content_y += ln.get_height() + 2
 
         content_y += 12
 
+        # answer options
+        if self.choices:
+            content_y = self.draw_choices(content_x, content_y, content_w) + 12
+
         # input box
         input_h = 40
         self.input_rect = pygame.Rect(content_x, content_y, content_w - 140, input_h)
@@ -119,7 +138,7 @@ class QuestionCard:
         # ensure text fits
         while self.input_font.size(txt)[0] > self.input_rect.w - 16 and len(txt) > 0:
             txt = txt[1:]
-        text_surf = self.input_font.render(txt, True, self.text)
+        text_surf = text_cache.render(self.input_font, txt, self.text)
         self.surface.blit(text_surf, (self.input_rect.x + 12, self.input_rect.y + (input_h - text_surf.get_height())//2))
 
         # button
@@ -128,7 +147,7 @@ class QuestionCard:
         hovered = self.btn_rect.collidepoint(mouse)
         btn_color = self.accent_hover if hovered else self.accent
         self.draw_round_rect(self.btn_rect, btn_color, radius=12, shadow=False)
-        btn_label = self.btn_font.render("Submit", True, (255,255,255))
+        btn_label = text_cache.render(self.btn_font, "Submit", (255,255,255))
         self.surface.blit(btn_label, (self.btn_rect.centerx - btn_label.get_width()//2, self.btn_rect.centery - btn_label.get_height()//2))
 
         content_y += input_h + 12
@@ -137,17 +156,24 @@ class QuestionCard:
         if self.feedback:
             kind, msg = self.feedback
             color = self.success if kind == "correct" else self.error
-            fb = self.text_font.render(msg, True, color)
+            fb = text_cache.render(self.text_font, msg, color)
             self.surface.blit(fb, (content_x, content_y))
 
-        # Recalculate card_h to fit content gracefully
-        new_h = (content_y - y) + self.padding + (self.feedback and 24 or 16)
-        if new_h > card_h:
-            self.draw_round_rect((x, y, card_w, new_h), self.card, radius=18, border=1, border_color=self.card_border, shadow=True)
-            # redraw content over the new height (simple approach: call recursively without changing state)
-            # To avoid recursion, just draw again without shadow. Good enough visually.
-            # In practice, most questions fit the base height.
-            pass
+    def draw_choices(self, x, y, w):
+        gap = 8
+        n = len(self.choices)
+        chip_w = (w - gap * (n - 1)) // n
+        mouse = pygame.mouse.get_pos()
+        self.choice_rects = []
+        for i, choice in enumerate(self.choices):
+            rect = pygame.Rect(x + i * (chip_w + gap), y, chip_w, CHOICE_H)
+            self.choice_rects.append(rect)
+            selected = choice == self.input_value
+            fill = self.accent if selected else ((235, 238, 244) if rect.collidepoint(mouse) else (255, 255, 255))
+            self.draw_round_rect(rect, fill, radius=10, border=1, border_color=self.card_border, shadow=False)
+            label = text_cache.render(self.input_font, choice, (255, 255, 255) if selected else self.text)
+            self.surface.blit(label, (rect.centerx - label.get_width() // 2, rect.centery - label.get_height() // 2))
+        return y + CHOICE_H
 
     def handle_key(self, event):
         if event.key == pygame.K_BACKSPACE:
@@ -161,6 +187,10 @@ class QuestionCard:
         return None
 
     def handle_click(self, pos):
+        for rect, choice in zip(self.choice_rects, self.choices or ()):
+            if rect.collidepoint(pos):
+                self.input_value = choice
+                return "submit"
         if self.btn_rect and self.btn_rect.collidepoint(pos):
             return "submit"
         return None
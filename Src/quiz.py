@@ -1,15 +1,188 @@
 # quiz.py
+"""
+Question service. "simple" questions are cheaper to generate on the spot
+(gen_questions.generate_simple_question) than to take from a pool, so they
+are made inline. The costlier difficulties are generated in batches
+(gen_questions.*_rows, NumPy) into one pool per difficulty; get_question()
+only takes the next row and formats it, and when a pool drops below the
+low-water mark the next batch is made on a background thread shared by
+every QuizManager in the process. NumPy is imported only once a pool is
+used.
+
+Each difficulty has its own seed derived from the manager's seed, batch k
+of a pool is generated from (pool seed, k), and a pool's batches are made
+one at a time in order, so the sequence of questions is the same for a
+given seed however the refills are timed.
+"""
 import random
+import threading
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
 import gen_questions
+from seeding import new_seed, stream
+
+DIFFICULTIES = ("simple", "multiple_choice", "extreme")
+INLINE_GENERATORS = {"simple": gen_questions.generate_simple_question}  # faster than a pool
+BATCH_SIZE = 64
+LOW_WATER = 16
+RECENT_SIZE = 64  # recently asked questions that are not repeated
+
+_refill_executor = None
+_executor_lock = threading.Lock()
+
+
+def refill_executor():
+    # one background thread for all managers (a server can have thousands of rooms)
+    global _refill_executor
+    with _executor_lock:
+        if _refill_executor is None:
+            _refill_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="quiz-refill")
+        return _refill_executor
+
+
+def warm_up(difficulty="simple"):
+    # for a pooled difficulty: imports NumPy and runs one tiny batch on the
+    # refill thread, so the first rooms do not wait for it
+    if difficulty in gen_questions.BATCH_GENERATORS and difficulty not in INLINE_GENERATORS:
+        rows, _ = gen_questions.BATCH_GENERATORS[difficulty]
+        refill_executor().submit(rows, 1)
+
+
+class QuestionPool:
+    """
+    Prefetched questions of one difficulty, kept as the int arrays the
+    batch generator returns (a row per question); a row is formatted only
+    when it is served.
+    """
+
+    def __init__(self, rows, fmt, seed, batch_size=BATCH_SIZE, low_water=LOW_WATER):
+        self.rows = rows
+        self.format = fmt
+        self.seed = seed
+        self.batch_number = 0
+        self.batch_size = batch_size
+        self.low_water = low_water
+        self.batches = collections.deque()  # generated, not yet started
+        self.current = []                    # rows of the batch being served
+        self.position = 0
+        self.lock = threading.Lock()  # one batch at a time keeps the order deterministic
+        self.refill_pending = False
+        # a shorter first batch, different per pool, so rooms that started
+        # together do not all reach the low-water mark on the same turn
+        self.next_batch = low_water + 1 + seed % (batch_size - low_water)
+
+    def refill(self, only_if_empty=False):
+        with self.lock:
+            try:
+                if not (only_if_empty and self.batches):
+                    self.batches.append(self.rows(self.next_batch, [self.seed, self.batch_number]))
+                    self.batch_number += 1
+                    self.next_batch = self.batch_size
+            finally:
+                self.refill_pending = False
+
+    def refill_in_background(self):
+        if not self.refill_pending:
+            self.refill_pending = True
+            refill_executor().submit(self.refill)
+
+    def pop(self):
+        if self.position == len(self.current):
+            if not self.batches:
+                # ran dry (or never filled): wait for a running refill or generate inline
+                self.refill(only_if_empty=True)
+            self.current = self.batches.popleft()
+            self.position = 0
+        row = self.current[self.position].tolist()
+        self.position += 1
+        # a queued batch always holds more than low_water rows
+        if not self.batches and len(self.current) - self.position < self.low_water:
+            self.refill_in_background()
+        return self.format(row)
+
 
 class QuizManager:
-    def __init__(self):
+    def __init__(self, seed=None, rng=None, batch_size=BATCH_SIZE, low_water=LOW_WATER,
+                 recent_size=RECENT_SIZE, bank=None):
+        # every question comes from seed (or rng); with the same seed the
+        # question sequence repeats exactly (see seeding.py)
+        if rng is None:
+            if seed is None:
+                seed = new_seed()
+            rng = stream(seed, "quiz")
+        self.seed = seed
         self.questions = [
             ("What is 2 + 2?", "4"),
-            ("What is 9 + 10", "21"),
+            ("What is 9 + 10?", "19"),
             ("What is 3 * 5?", "15"),
         ]
+        # pools (and inline generators) are created on first use, each with its own seed
+        self.pool_seeds = {d: rng.getrandbits(64) for d in DIFFICULTIES}
+        self.pools = {}
+        self.inline_rngs = {}
+        self.batch_size = batch_size
+        self.low_water = low_water
+        # hashes of recently asked questions: set for lookups, deque for age
+        self.recent = set()
+        self.recent_order = collections.deque(maxlen=recent_size)
+        # optional question_bank.QuestionBank; its difficulties are drawn
+        # from the bank, the rest still come from the generated pools
+        self.bank = bank
+        self.bank_rng = random.Random(rng.getrandbits(64)) if bank is not None else None
+
+    def from_bank(self, difficulty):
+        return self.bank is not None and difficulty in self.bank.difficulty_index
+
+    def pool(self, difficulty):
+        pool = self.pools.get(difficulty)
+        if pool is None:
+            if difficulty not in gen_questions.BATCH_GENERATORS:
+                raise ValueError(f"unknown difficulty {difficulty!r}, expected one of {DIFFICULTIES}")
+            rows, fmt = gen_questions.BATCH_GENERATORS[difficulty]
+            pool = QuestionPool(rows, fmt, self.pool_seeds[difficulty], self.batch_size, self.low_water)
+            self.pools[difficulty] = pool
+        return pool
+
+    def inline(self, difficulty):
+        # next_item for a difficulty generated on the spot
+        rng = self.inline_rngs.get(difficulty)
+        if rng is None:
+            rng = self.inline_rngs[difficulty] = random.Random(self.pool_seeds[difficulty])
+        generate = INLINE_GENERATORS[difficulty]
+        return lambda: generate(rng)
+
+    def prefetch(self, difficulty="simple"):
+        # start filling a pool in the background before the first question
+        if not self.from_bank(difficulty) and difficulty not in INLINE_GENERATORS:
+            self.pool(difficulty).refill_in_background()
+
+    def get_question(self, difficulty="simple"):
+        """
+        (question, answer) for "simple", (question, answer, choices) for
+        "multiple_choice" and "extreme" (a bank may store either shape).
+        Skips questions asked recently.
+        """
+        if self.from_bank(difficulty):
+            bank, rng = self.bank, self.bank_rng
+            next_item = lambda: bank.draw(rng, difficulty)
+        elif difficulty in INLINE_GENERATORS:
+            next_item = self.inline(difficulty)
+        else:
+            next_item = self.pool(difficulty).pop
+        for _ in range(self.batch_size):
+            item = next_item()
+            key = hash(item[0])
+            if key not in self.recent:
+                break
+        # (after a full batch of repeats the last one is served anyway)
+        self.remember(key)
+        return item
 
-    def get_question(self):
-        # return random.choice(self.questions)
-        return gen_questions.generate_simple_question()
+    def remember(self, key):
+        # key: hash of the question text; forgets the oldest beyond recent_size
+        order = self.recent_order
+        if len(order) == order.maxlen:
+            self.recent.discard(order[0])
+        order.append(key)
+        self.recent.add(key)
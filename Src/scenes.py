@@ -0,0 +1,96 @@
+# scenes.py
+"""
+One window for the whole program. The SceneManager owns the display and
+the frame loop (frame_scheduler.FrameScheduler); the menus, App and
+BattleshipClient are scenes on its stack, so going from the menu into a
+game and back resizes the one window instead of re-running pygame.init()
+and set_mode(), and fonts (fonts.py), rendered text (text_cache.py),
+ship sprites (board_view.image_loader) and the question bank stay loaded.
+pygame.quit() runs once, when the program ends.
+
+A scene has
+  - size, caption: what the window shows while the scene is on top,
+  - running: set to False to leave the scene (it is popped),
+  - handle_events(events), draw(), and optionally
+  - update(): once per frame after the events (timers, computer moves),
+  - next_frame_at(): frame_scheduler source while it is on top; a scene
+    without one (the menus) is redrawn on input only,
+  - enter(): each time it comes on top (pushed, or the scene above left),
+  - close(): when it is removed (popped, or the program ends).
+
+Closing the window ends the program from any scene. Scenes take
+scenes=None and make their own SceneManager (and window) without one.
+
+    scenes = SceneManager()
+    scenes.push(MainMenu(scenes), on_exit=menu_closed)  # on_exit(scene) may push more
+    scenes.run()
+"""
+import pygame
+from frame_scheduler import FrameScheduler
+
+
+class SceneManager:
+    def __init__(self):
+        pygame.init()
+        self.screen = pygame.display.get_surface()
+        self.frames = FrameScheduler([self.next_frame_at])
+        self.stack = []  # (scene, on_exit)
+        self.active = None
+        self.running = True
+
+    def show(self, size, caption):
+        """The display surface at size; the window and surface object are reused."""
+        screen = pygame.display.get_surface()
+        if screen is None or screen.get_size() != tuple(size):
+            screen = pygame.display.set_mode(size)
+        pygame.display.set_caption(caption)
+        self.screen = screen
+        return screen
+
+    def push(self, scene, on_exit=None):
+        self.stack.append((scene, on_exit))
+
+    def top(self):
+        return self.stack[-1][0] if self.stack else None
+
+    def next_frame_at(self):
+        source = getattr(self.active, "next_frame_at", None)
+        return source() if source else None
+
+    def _activate(self):
+        scene = self.top()
+        if scene is not self.active:
+            self.active = scene
+            self.show(scene.size, scene.caption)
+            if hasattr(scene, "enter"):
+                scene.enter()
+            self.frames.request_frame()
+
+    def _remove(self):
+        scene, on_exit = self.stack.pop()
+        if self.active is scene:
+            self.active = None
+        if hasattr(scene, "close"):
+            scene.close()
+        return scene, on_exit
+
+    def run(self):
+        """Runs the top scene until the stack is empty or the window is closed."""
+        while self.running and self.stack:
+            self._activate()
+            scene = self.active
+            events = self.frames.next_events()
+            scene.handle_events(events)
+            if any(event.type == pygame.QUIT for event in events):
+                self.running = False
+                break
+            if hasattr(scene, "update"):
+                scene.update()
+            scene.draw()
+            if not scene.running:
+                scene, on_exit = self._remove()
+                if on_exit:
+                    on_exit(scene)
+
+        while self.stack:
+            self._remove()
@@ -0,0 +1,21 @@
+# seeding.py
+"""
+Seeds and random streams for reproducible matches.
+
+A match has one seed (an int, recorded in the room log). Each consumer
+draws from its own stream derived from it, stream(seed, "placement"),
+stream(seed, "quiz"), ..., so adding draws to one part of the game does
+not shift the others, and workers in a process pool never share state
+with the global `random` module.
+"""
+import random
+import secrets
+
+
+def new_seed():
+    return secrets.randbits(64)
+
+
+def stream(seed, name):
+    """Independent random.Random for one consumer of a match seed."""
+    return random.Random(f"{seed}/{name}")
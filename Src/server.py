@@ -1,121 +1,458 @@
-import socket
+import asyncio
+import argparse
+import itertools
+import collections
 from game import Game
-from quiz import QuizManager
+from quiz import QuizManager, DIFFICULTIES, warm_up as warm_up_quiz
+from seeding import new_seed, stream
+from question_bank import QuestionBank
 from config import SEQUENCE_COLORS, SHIP_LENGTHS, DEFAULT_HOST, DEFAULT_PORT
-from network_utils import send_json, receive_json, serialize_board
+import codec
+from network_utils import FrameReader, encode_message, decode_message, serialize_board
 
-class BattleshipServer:
-    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
-        self.host = host
-        self.port = port
-        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.clients = []
-        self.game = None
-        self.quiz = QuizManager()
-    
-    def start(self):
-        self.server_socket.bind((self.host, self.port))
-        self.server_socket.listen(2)
-        print(f"[SERVER] Started on {self.host}:{self.port}")
-        
-        for i in range(2):
-            conn, addr = self.server_socket.accept()
-            player_name = f"Player {i + 1}"
-            self.clients.append((conn, addr, player_name))
-            print(f"[SERVER] {player_name} connected from {addr}")
-            
-            send_json(conn, {
-                'type': 'connection_success',
-                'player_name': player_name,
-                'player_id': i
-            })
-        
-        print("[SERVER] Starting game...")
-        self.initialize_game()
-        self.game_loop()
-    
-    def initialize_game(self):
-        player_names = [c[2] for c in self.clients]
-        self.game = Game(player_names, SEQUENCE_COLORS, ship_lengths=SHIP_LENGTHS, grid_size=10)
-        
-        for i, (conn, _, _) in enumerate(self.clients):
-            send_json(conn, {
+# outbound queue per connection (see Connection.send)
+OUTBOX_MAX_BYTES = 256 * 1024  # queued and not yet handed to the socket
+OVERFLOW_POLICIES = ("disconnect", "drop")
+SLOW_CLIENT_TIMEOUT = 10.0     # seconds a client may keep the socket full
+MAX_CLIENT_FRAME_SIZE = 64 * 1024  # client messages are answers and shots, well under 1 KB
+
+RESTORABLE_TYPES = ('board_snapshot', 'shot_result', 'opponent_shot')
+
+
+def restorable(data):
+    # board state a resync rebuilds; the game_over delta also ends the client's game
+    return data.get('type') in RESTORABLE_TYPES and not data.get('game_over')
+
+
+class Connection(asyncio.BufferedProtocol):
+    """
+    One connected player socket. Incoming bytes are received straight into
+    a FrameReader buffer, so one read can yield several queued messages.
+
+    Outgoing messages go to a bounded queue that the event loop writes out
+    once per loop pass, so everything a room sends before it next waits
+    (e.g. answer_result + opponent_turn) becomes one write, and a room never
+    waits for a slow client. While the socket is full (pause_writing) the
+    queue only grows; past max_bytes the overflow policy either disconnects
+    the client ("disconnect") or drops the message ("drop"). Only board
+    state is ever dropped: the next delta then fails the client's seq/hash
+    check and it asks for a snapshot. A message the turn flow depends on
+    (question, answer result, turn notices, the final shot) cannot be
+    rebuilt that way, so it disconnects the client under either policy, as
+    does keeping the socket full for stall_timeout seconds.
+    """
+    def __init__(self, server, max_bytes=OUTBOX_MAX_BYTES, policy="disconnect",
+                 stall_timeout=SLOW_CLIENT_TIMEOUT):
+        self.server = server
+        self.metrics = server.metrics
+        self.transport = None
+        self.addr = None
+        self.player_name = None
+        self.room = None
+        self.reader = FrameReader(MAX_CLIENT_FRAME_SIZE)
+        self.codec = codec.JSON  # until the client picks one
+        self.inbox = collections.deque()
+        self.closed = False
+        self._waiter = None
+        self.outbox = collections.deque()  # encoded frames not yet written
+        self.outbox_bytes = 0
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.stall_timeout = stall_timeout
+        self._paused = False
+        self._write_scheduled = False
+        self._stall_timer = None
+
+    # --- asyncio.BufferedProtocol ---
+    def connection_made(self, transport):
+        self.transport = transport
+        self.addr = transport.get_extra_info('peername')
+        self.server.add_connection(self)
+
+    def get_buffer(self, sizehint):
+        return self.reader.get_buffer(sizehint)
+
+    def buffer_updated(self, nbytes):
+        self.reader.advance(nbytes)
+        try:
+            for frame in self.reader.frames():
+                msg = decode_message(frame)
+                msg_type = msg.get('type')
+                # control messages are answered here, outside the turn flow
+                if msg_type == 'codec':
+                    self.codec = codec.choose_codec([msg.get('codec')])
+                elif msg_type == 'resync':
+                    if self.room is not None:
+                        self.room.send_snapshot(self)
+                else:
+                    self.inbox.append(msg)
+        except ValueError as e:
+            print(f"[NET] Receive error from {self.addr}: {e}")
+            self.close()
+        self._wake()
+
+    def eof_received(self):
+        self.closed = True
+        self._wake()
+        return False
+
+    def connection_lost(self, exc):
+        self.closed = True
+        self._drop_outbox()
+        self._cancel_stall_timer()
+        self._wake()
+
+    def pause_writing(self):
+        self._paused = True
+        self.metrics['socket_full'] += 1
+        if self._stall_timer is None:
+            self._stall_timer = asyncio.get_running_loop().call_later(self.stall_timeout, self._stalled)
+
+    def resume_writing(self):
+        self._paused = False
+        self._cancel_stall_timer()
+        self._schedule_write()
+
+    def _wake(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    # --- outbound queue ---
+    def _schedule_write(self):
+        if not self._write_scheduled and self.outbox:
+            self._write_scheduled = True
+            asyncio.get_running_loop().call_soon(self._write_outbox)
+
+    def _write_outbox(self):
+        self._write_scheduled = False
+        if self.closed or self._paused or not self.outbox:
+            return
+        n = len(self.outbox)
+        data = b"".join(self.outbox) if n > 1 else self.outbox[0]
+        self.outbox.clear()
+        self.outbox_bytes = 0
+        self.metrics['writes'] += 1
+        self.metrics['coalesced'] += n - 1
+        self.metrics['bytes_sent'] += len(data)
+        self.transport.write(data)  # may call pause_writing
+
+    def _drop_outbox(self):
+        self.outbox.clear()
+        self.outbox_bytes = 0
+
+    def _cancel_stall_timer(self):
+        if self._stall_timer is not None:
+            self._stall_timer.cancel()
+            self._stall_timer = None
+
+    def _stalled(self):
+        self._stall_timer = None
+        self.metrics['slow_disconnects'] += 1
+        self.server.log(f"[NET] {self.addr} stopped reading for {self.stall_timeout:.0f} s, disconnecting")
+        self.abort()
+
+    # --- room API ---
+    def send(self, data):
+        # queues data; never blocks the room
+        if self.closed:
+            return
+        frame = encode_message(data, self.codec)
+        if self.outbox_bytes + len(frame) > self.max_bytes:
+            if self.policy == "drop" and restorable(data):
+                self.metrics['dropped'] += 1
+                return
+            self.metrics['overflow_disconnects'] += 1
+            self.server.log(f"[NET] {self.addr} outbound queue over {self.max_bytes} bytes, disconnecting")
+            self.abort()
+            return
+        self.outbox.append(frame)
+        self.outbox_bytes += len(frame)
+        self.metrics['messages'] += 1
+        if self.outbox_bytes > self.metrics['max_queued_bytes']:
+            self.metrics['max_queued_bytes'] = self.outbox_bytes
+        self._schedule_write()
+
+    async def recv(self):
+        while not self.inbox:
+            if self.closed:
+                return None
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return self.inbox.popleft()
+
+    def is_open(self):
+        return not self.closed
+
+    def close(self):
+        # hands what is still queued to the transport, which sends it before closing
+        if not self.closed and self.outbox and self.transport is not None:
+            self.transport.write(b"".join(self.outbox))
+        self._drop_outbox()
+        self._cancel_stall_timer()
+        self.closed = True
+        if self.transport is not None:
+            self.transport.close()
+
+    def abort(self):
+        # slow or flooded client: drop everything queued and reset the connection
+        self._drop_outbox()
+        self._cancel_stall_timer()
+        self.closed = True
+        if self.transport is not None:
+            self.transport.abort()
+        self._wake()
+
+
+class GameRoom:
+    """
+    One match between two connections, with its own Game and QuizManager.
+    Both draw from streams of the room's seed, so a logged seed replays the
+    match's fleets and question sequence.
+    """
+    def __init__(self, room_id, connections, log=print, seed=None, question_bank=None, difficulty="simple"):
+        self.room_id = room_id
+        self.connections = connections
+        self.log = log
+        self.seed = new_seed() if seed is None else seed
+        self.difficulty = difficulty
+        self.quiz = QuizManager(seed=self.seed, bank=question_bank)
+        self.quiz.prefetch(difficulty)  # first batch is built off the event loop
+        self.game = Game([c.player_name for c in connections], SEQUENCE_COLORS,
+                         ship_lengths=SHIP_LENGTHS, grid_size=10, seed=self.seed)
+
+    async def run(self):
+        try:
+            await self.start_game()
+            await self.game_loop()
+        finally:
+            self.log(f"[ROOM {self.room_id}] Game ended")
+            for conn in self.connections:
+                conn.close()
+
+    async def start_game(self):
+        for i, conn in enumerate(self.connections):
+            conn.room = self
+            conn.send({
                 'type': 'game_start',
                 'your_board': serialize_board(self.game.players[i].board, show_ships=True),
                 'opponent_board': serialize_board(self.game.players[1-i].board, show_ships=False),
                 'grid_size': self.game.grid_size
             })
-    
-    def game_loop(self):
-        buffers = [b'', b'']  # One buffer per client
-        
+
+    def send_snapshot(self, conn):
+        # full state for one player, after a seq/hash mismatch on their side
+        i = self.connections.index(conn)
+        self.log(f"[ROOM {self.room_id}] Resync for {conn.player_name}")
+        conn.send({
+            'type': 'board_snapshot',
+            'your_board': serialize_board(self.game.players[i].board, show_ships=True),
+            'opponent_board': serialize_board(self.game.players[1-i].board, show_ships=False)
+        })
+
+    async def game_loop(self):
         while not self.game.over:
             curr_idx = self.game.current_turn
             opp_idx = 1 - curr_idx
-            curr_conn = self.clients[curr_idx][0]
-            opp_conn = self.clients[opp_idx][0]
-            
-            question, correct_answer = self.quiz.get_question()
-            print(f"[SERVER] Question for {self.game.get_current_player().name}: {question}")
-            
-            send_json(curr_conn, {'type': 'quiz_question', 'question': question})
-            send_json(opp_conn, {'type': 'opponent_turn', 'message': f"{self.game.get_current_player().name} answering..."})
-            
+            curr_conn = self.connections[curr_idx]
+            opp_conn = self.connections[opp_idx]
+            player_name = self.game.get_current_player().name
+
+            item = self.quiz.get_question(self.difficulty)
+            question, correct_answer = item[:2]
+            self.log(f"[ROOM {self.room_id}] Question for {player_name}: {question}")
+
+            ask = {'type': 'quiz_question', 'question': question}
+            if len(item) > 2:
+                ask['choices'] = item[2]  # multiple_choice, extreme, or a bank row with options
+            curr_conn.send(ask)
+            opp_conn.send({'type': 'opponent_turn', 'message': f"{player_name} answering..."})
+
             # Get answer
-            answer_msg, buffers[curr_idx] = receive_json(curr_conn, buffers[curr_idx])
+            answer_msg = await curr_conn.recv()
             if not answer_msg:
                 break
-            
+
             user_answer = answer_msg.get('answer', '').strip().lower()
-            
+
             if user_answer == correct_answer.lower():
-                print(f"[SERVER] Correct from {self.game.get_current_player().name}")
-                send_json(curr_conn, {'type': 'answer_result', 'correct': True, 'message': 'Correct! Take your shot.'})
-                
+                self.log(f"[ROOM {self.room_id}] Correct from {player_name}")
+                curr_conn.send({'type': 'answer_result', 'correct': True, 'message': 'Correct! Take your shot.'})
+
                 # Get shot
-                shot_msg, buffers[curr_idx] = receive_json(curr_conn, buffers[curr_idx])
+                shot_msg = await curr_conn.recv()
                 if not shot_msg:
                     break
-                
+
                 cell = tuple(shot_msg.get('cell', []))
-                result, game_over, winner = self.game.process_shot(cell)
-                print(f"[SERVER] Shot at {cell}: {result}")
-                
-                # Send results
-                send_json(curr_conn, {
-                    'type': 'shot_result',
-                    'result': result,
-                    'opponent_board': serialize_board(self.game.players[opp_idx].board, show_ships=False),
-                    'game_over': game_over,
-                    'winner': winner
-                })
-                
-                send_json(opp_conn, {
-                    'type': 'opponent_shot',
-                    'result': result,
-                    'cell': list(cell),
-                    'your_board': serialize_board(self.game.players[opp_idx].board, show_ships=True),
-                    'game_over': game_over,
-                    'winner': winner
-                })
-                
-                if game_over:
-                    print(f"[SERVER] Winner: {winner}")
+                board = self.game.players[opp_idx].board
+                result = self.game.process_shot(cell)
+                message = result.message()
+                self.log(f"[ROOM {self.room_id}] Shot at {cell}: {message}")
+
+                # Send only the changed cell; clients check seq/hash and ask for a snapshot if out of sync
+                sunk = result.sunk
+                delta = {
+                    'result': message,
+                    'cell': list(cell) if result.changed else [0, 0],
+                    'outcome': result.outcome if result.changed else 'repeat',
+                    'seq': board.seq,
+                    'hash': board.state_hash,
+                    'game_over': result.game_over,
+                    'winner': result.winner,
+                    # the ship this shot sank, so clients need not work it out
+                    'sunk': [sunk.row, sunk.col, sunk.orientation, sunk.length] if sunk else None,
+                }
+                curr_conn.send({'type': 'shot_result', **delta})
+                opp_conn.send({'type': 'opponent_shot', **delta})
+
+                if result.game_over:
+                    self.log(f"[ROOM {self.room_id}] Winner: {result.winner}")
                     break
             else:
-                print(f"[SERVER] Wrong answer from {self.game.get_current_player().name}")
-                send_json(curr_conn, {'type': 'answer_result', 'correct': False, 'message': 'Incorrect. Turn skipped.'})
-                send_json(opp_conn, {'type': 'turn_skipped', 'message': f"{self.game.get_current_player().name} answered incorrectly."})
+                self.log(f"[ROOM {self.room_id}] Wrong answer from {player_name}")
+                curr_conn.send({'type': 'answer_result', 'correct': False, 'message': 'Incorrect. Turn skipped.'})
+                opp_conn.send({'type': 'turn_skipped', 'message': f"{player_name} answered incorrectly."})
                 self.game.next_turn()
-        
-        print("[SERVER] Game ended")
-        self.cleanup()
-    
-    def cleanup(self):
-        for conn, _, _ in self.clients:
-            try:
-                conn.close()
-            except:
-                pass
-        self.server_socket.close()
\ No newline at end of file
+
+
+class BattleshipServer:
+    """
+    Event-loop server: one listening socket, every pair of connecting
+    players gets its own GameRoom and all rooms run on the same loop.
+    """
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, verbose=True, seed=None, question_bank=None,
+                 outbox_max_bytes=OUTBOX_MAX_BYTES, overflow="disconnect", stall_timeout=SLOW_CLIENT_TIMEOUT,
+                 stats_interval=None, difficulty="simple"):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"unknown overflow policy {overflow!r}")
+        self.host = host
+        self.port = port
+        self.verbose = verbose
+        # outbound queues (see Connection) and their counters
+        self.outbox_max_bytes = outbox_max_bytes
+        self.overflow = overflow
+        self.stall_timeout = stall_timeout
+        self.stats_interval = stats_interval
+        self.metrics = collections.Counter()
+        self.seed = seed  # if set, room seeds are derived from it (deterministic runs)
+        # one mapped bank shared by every room (and every server process using the file)
+        self.question_bank = QuestionBank(question_bank) if question_bank else None
+        self.difficulty = difficulty  # of every question the rooms ask
+        bank_difficulties = self.question_bank.difficulties if self.question_bank else []
+        if difficulty not in DIFFICULTIES and difficulty not in bank_difficulties:
+            raise ValueError(f"no questions for difficulty {difficulty!r}: not generated"
+                             + (f" and not in the bank (it has {bank_difficulties})" if self.question_bank else ""))
+        self.server = None
+        self.waiting = None  # connection waiting for an opponent
+        self.rooms = {}
+        self.room_ids = itertools.count(1)
+        self.room_tasks = set()  # keeps running room tasks referenced
+
+    def log(self, text):
+        if self.verbose:
+            print(text)
+
+    def start(self):
+        # blocking, runs until the process (or thread) ends
+        asyncio.run(self.serve_forever())
+
+    async def serve_forever(self):
+        loop = asyncio.get_running_loop()
+        if not (self.question_bank and self.difficulty in self.question_bank.difficulty_index):
+            warm_up_quiz(self.difficulty)
+        self.server = await loop.create_server(self.make_connection, self.host, self.port,
+                                               reuse_address=True, backlog=1024)
+        print(f"[SERVER] Started on {self.host}:{self.port}")
+        if self.question_bank is not None:
+            bank = self.question_bank
+            if self.difficulty in bank.difficulty_index:
+                print(f"[SERVER] Question bank {bank.path}: {bank.count(self.difficulty)} {self.difficulty} questions")
+            else:
+                print(f"[SERVER] Warning: question bank {bank.path} has no {self.difficulty} questions "
+                      f"(only {bank.difficulties}), generating them instead")
+        if self.stats_interval:
+            loop.create_task(self.print_stats())
+        async with self.server:
+            await self.server.serve_forever()
+
+    def make_connection(self):
+        return Connection(self, self.outbox_max_bytes, self.overflow, self.stall_timeout)
+
+    def stats(self):
+        # outbound queue counters: messages queued, writes (after coalescing), bytes,
+        # dropped messages, disconnects for overflow / stalled sockets, peak queue
+        return dict(self.metrics, rooms=len(self.rooms))
+
+    async def print_stats(self):
+        while True:
+            await asyncio.sleep(self.stats_interval)
+            print("[SERVER] " + ", ".join(f"{k} {v}" for k, v in sorted(self.stats().items())))
+
+    def add_connection(self, conn):
+        if self.waiting is not None and not self.waiting.is_open():
+            self.waiting.close()
+            self.waiting = None
+
+        if self.waiting is None:
+            self.waiting = conn
+            self.greet(conn, 0)
+            return
+
+        first, self.waiting = self.waiting, None
+        self.greet(conn, 1)
+        task = asyncio.get_running_loop().create_task(self.run_room([first, conn]))
+        self.room_tasks.add(task)
+        task.add_done_callback(self.room_tasks.discard)
+
+    async def run_room(self, connections):
+        room_id = next(self.room_ids)
+        seed = None if self.seed is None else stream(self.seed, f"room {room_id}").getrandbits(64)
+        room = GameRoom(room_id, connections, log=self.log, seed=seed, question_bank=self.question_bank,
+                        difficulty=self.difficulty)
+        self.rooms[room_id] = room
+        # always printed, also with --quiet: the seed is what replays a match
+        print(f"[SERVER] Room {room_id} started, seed {room.seed} ({len(self.rooms)} active)")
+        try:
+            await room.run()
+        finally:
+            del self.rooms[room_id]
+
+    def greet(self, conn, player_id):
+        conn.player_name = f"Player {player_id + 1}"
+        self.log(f"[SERVER] {conn.player_name} connected from {conn.addr}")
+        conn.send({
+            'type': 'connection_success',
+            'player_name': conn.player_name,
+            'player_id': player_id,
+            'codecs': codec.SUPPORTED_CODECS
+        })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless multi-room Battleship server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--quiet", action="store_true", help="only log server start and room seeds")
+    parser.add_argument("--seed", type=int, help="derive every room's seed from this one")
+    parser.add_argument("--question-bank", help="question bank file (see question_bank.py)")
+    parser.add_argument("--difficulty", default="simple",
+                        help=f"difficulty of the questions: {', '.join(DIFFICULTIES)} or one in the bank")
+    parser.add_argument("--outbox-kb", type=int, default=OUTBOX_MAX_BYTES // 1024,
+                        help="outbound queue limit per connection")
+    parser.add_argument("--overflow", default="disconnect", choices=OVERFLOW_POLICIES,
+                        help="what to do with a message that does not fit the queue (drop: board state only)")
+    parser.add_argument("--stall-timeout", type=float, default=SLOW_CLIENT_TIMEOUT,
+                        help="disconnect a client that keeps its socket full this many seconds")
+    parser.add_argument("--stats", type=float, metavar="SECONDS", help="print queue counters this often")
+    args = parser.parse_args()
+    try:
+        server = BattleshipServer(args.host, args.port, verbose=not args.quiet, seed=args.seed,
+                                  question_bank=args.question_bank, outbox_max_bytes=args.outbox_kb * 1024,
+                                  overflow=args.overflow, stall_timeout=args.stall_timeout,
+                                  stats_interval=args.stats, difficulty=args.difficulty)
+    except ValueError as e:  # also a bad bank file (QuestionBankError)
+        parser.error(str(e))
+    server.start()
@@ -0,0 +1,80 @@
+# text_cache.py
+"""
+Rendered text shared by the HUD, toast, question card and menus. Most
+labels are the same from frame to frame ("TURN: Player 1", button names,
+the current question), so font.render and word wrapping run once per
+(font, text, colour, antialias) / (font, text, width) and the results are
+kept in a bounded LRU.
+
+Cached surfaces are shared: blit them, don't draw on them. A caller that
+needs to change one (e.g. set_alpha for a fade) restores it afterwards.
+"""
+from collections import OrderedDict
+
+MAX_SURFACES = 256
+MAX_LAYOUTS = 64
+
+
+class TextCache:
+    def __init__(self, max_surfaces=MAX_SURFACES, max_layouts=MAX_LAYOUTS):
+        self.max_surfaces = max_surfaces  # 0 turns caching off (see bench_text)
+        self.max_layouts = max_layouts
+        self.surfaces = OrderedDict()
+        self.layouts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, table, limit, key, make):
+        value = table.get(key)
+        if value is not None:
+            table.move_to_end(key)
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = make()
+        if limit:
+            table[key] = value
+            if len(table) > limit:
+                table.popitem(last=False)
+        return value
+
+    def render(self, font, text, color, antialias=True):
+        return self._get(self.surfaces, self.max_surfaces, (font, text, tuple(color), antialias),
+                         lambda: font.render(text, antialias, color))
+
+    def wrap(self, font, text, max_w):
+        # greedy word wrap to max_w pixels; returns a tuple of lines
+        def make():
+            lines, line = [], ""
+            for w in text.split(" "):
+                test = (line + " " + w).strip()
+                if font.size(test)[0] <= max_w:
+                    line = test
+                else:
+                    if line:
+                        lines.append(line)
+                    line = w
+            if line:
+                lines.append(line)
+            return tuple(lines)
+        return self._get(self.layouts, self.max_layouts, (font, text, max_w), make)
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        self.surfaces.clear()
+        self.layouts.clear()
+        self.hits = self.misses = 0
+
+
+cache = TextCache()
+
+
+def render(font, text, color, antialias=True):
+    return cache.render(font, text, color, antialias)
+
+
+def wrap(font, text, max_w):
+    return cache.wrap(font, text, max_w)
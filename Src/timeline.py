@@ -0,0 +1,115 @@
+# timeline.py
+"""
+Delayed callbacks and tweens on the pygame clock (get_ticks() ms), shared
+by everything in one window so that nothing has to block or keep its own
+timing:
+
+    timeline = Timeline()
+    timer = timeline.after(1200, app.next_question)   # timer.cancel()
+    fade = timeline.tween(250, 255, 0, delay=1150)     # fade.value() each frame
+
+The frame loop calls update() once per frame, which runs the callbacks
+that are due (on the loop's thread), and passes next_frame_at to its
+FrameScheduler: "now" while a tween is moving, else the next callback or
+tween start, so the loop sleeps until then. Everything runs on the loop's
+thread (the client hands network messages over through a queue).
+"""
+import heapq
+import itertools
+import pygame
+
+
+def linear(p):
+    return p
+
+
+class Timer:
+    __slots__ = ("due", "callback", "cancelled")
+
+    def __init__(self, due, callback):
+        self.due = due
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Tween:
+    """Goes from start to end over duration ms, beginning delay ms after it was made."""
+    __slots__ = ("begin", "duration", "start", "end", "ease")
+
+    def __init__(self, begin, duration, start, end, ease):
+        self.begin = begin
+        self.duration = duration
+        self.start = start
+        self.end = end
+        self.ease = ease
+
+    def progress(self, now=None):
+        # 0..1, linear in time
+        if now is None:
+            now = pygame.time.get_ticks()
+        if self.duration <= 0:
+            return 1.0 if now >= self.begin else 0.0
+        return max(0.0, min(1.0, (now - self.begin) / self.duration))
+
+    def value(self, now=None):
+        return self.start + (self.end - self.start) * self.ease(self.progress(now))
+
+    def running(self, now=None):
+        if now is None:
+            now = pygame.time.get_ticks()
+        return self.begin <= now < self.begin + self.duration
+
+    def done(self, now=None):
+        if now is None:
+            now = pygame.time.get_ticks()
+        return now >= self.begin + self.duration
+
+
+class Timeline:
+    def __init__(self):
+        self.timers = []   # heap of (due, seq, Timer)
+        self.tweens = []
+        self.seq = itertools.count()
+
+    def after(self, ms, callback):
+        """Calls callback() from update() once ms have passed; returns the Timer."""
+        timer = Timer(pygame.time.get_ticks() + ms, callback)
+        heapq.heappush(self.timers, (timer.due, next(self.seq), timer))
+        return timer
+
+    def tween(self, duration, start=0.0, end=1.0, delay=0, ease=linear):
+        tween = Tween(pygame.time.get_ticks() + delay, duration, start, end, ease)
+        self.tweens.append(tween)
+        return tween
+
+    def update(self):
+        """Runs the callbacks that are due, in order; returns how many ran."""
+        now = pygame.time.get_ticks()
+        due = []
+        while self.timers and self.timers[0][0] <= now:
+            due.append(heapq.heappop(self.timers)[2])
+        self.tweens = [t for t in self.tweens if not t.done(now)]
+        ran = 0
+        for timer in due:
+            if not timer.cancelled:
+                timer.callback()  # may schedule more; those wait for the next update()
+                ran += 1
+        return ran
+
+    def next_frame_at(self):
+        # frame_scheduler source
+        now = pygame.time.get_ticks()
+        times = []
+        while self.timers and self.timers[0][2].cancelled:
+            heapq.heappop(self.timers)
+        if self.timers:
+            times.append(self.timers[0][0])
+        for tween in self.tweens:
+            if tween.running(now):
+                return now
+            if now < tween.begin:
+                times.append(tween.begin)
+        return min(times) if times else None
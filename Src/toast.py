@@ -1,47 +1,53 @@
 # toast.py
 import pygame, math
-
-def _font(size, bold=False):
-    for name in ["Inter", "Poppins", "Nunito", "Segoe UI", "Arial"]:
-        p = pygame.font.match_font(name, bold=bold)
-        if p: return pygame.font.Font(p, size)
-    return pygame.font.SysFont(None, size, bold=bold)
+import text_cache
+from fonts import get_font, UI_FAMILIES
 
 class StatusToast:
     """
     Slide/fade toast near the bottom center.
     Usage:
-      toast = StatusToast(screen)
+      toast = StatusToast(screen, timeline)
       toast.show("Correct! Take your shot.", positive=True)   # green
       toast.show("Wrong answer. Turn lost.", positive=False)  # red
       ...
-      toast.draw()  # every frame
+      timeline.update(); toast.draw()  # every frame
     """
-    def __init__(self, surface):
+    def __init__(self, surface, timeline):
         self.surface = surface
+        self.timeline = timeline
         self.text = None
         self.positive = True
-        self.font = _font(20, bold=True)
+        self.font = get_font(20, bold=True, families=UI_FAMILIES)
         self.bg_ok = (16, 185, 129)    # green
         self.bg_bad = (239, 68, 68)    # red
         self.txt = (255, 255, 255)
         self.shadow = (0, 0, 0, 90)
-        self.started = 0
         self.duration = 1400  # ms visible
+        self.slide_in = self.fade_out = self.hide_timer = None
         self.padding_x = 18
         self.padding_y = 10
         self.max_w = 540
+        self._layout_for = None
+        self._layout_cache = None
 
     def show(self, text, positive=True, duration_ms=None):
-        self.text = text
-        self.positive = positive
-        self.started = pygame.time.get_ticks()
         if duration_ms:
             self.duration = duration_ms
+        if self.hide_timer:
+            self.hide_timer.cancel()
+        # slide up + fade in over the first 250 ms, fade out over the last 250 ms
+        self.slide_in = self.timeline.tween(250)
+        self.fade_out = self.timeline.tween(250, 1.0, 0.0, delay=self.duration - 250)
+        self.hide_timer = self.timeline.after(self.duration + 300, self.hide)  # keep for fade out
+        self.text = text
+        self.positive = positive
+
+    def hide(self):
+        self.text = None
 
     def active(self):
-        if not self.text: return False
-        return pygame.time.get_ticks() - self.started <= self.duration + 300  # keep for fade out
+        return bool(self.text)
 
     def _round_rect(self, surf, rect, color, radius=14):
         x,y,w,h = rect
@@ -49,39 +55,48 @@ class StatusToast:
         pygame.draw.rect(s, color, (0,0,w,h), border_radius=radius)
         surf.blit(s, (x,y))
 
+    def _layout(self):
+        # wrapped text surfaces and box size, built once per text
+        if self._layout_for != (self.text, self.font):
+            lines = text_cache.wrap(self.font, self.text, self.max_w - self.padding_x*2) or ("",)
+            text_surfs = [text_cache.render(self.font, l, self.txt) for l in lines]
+            text_w = max(s.get_width() for s in text_surfs)
+            text_h = sum(s.get_height() for s in text_surfs) + (len(text_surfs)-1)*2
+            self._layout_cache = (text_surfs, text_w + self.padding_x*2, text_h + self.padding_y*2)
+            self._layout_for = (self.text, self.font)
+        return self._layout_cache
+
+    def _frame(self):
+        # (alpha, slide-in offset in px) at the current time
+        t, o = self.slide_in.value(), self.fade_out.value()
+        return int(255 * min(t, o)), int((1 - t) * 20)
+
+    def rect(self):
+        # area draw() paints over the whole slide (shadow included); empty when hidden
+        if not self.active():
+            return pygame.Rect(0, 0, 0, 0)
+        _, w, h = self._layout()
+        sw, sh = self.surface.get_size()
+        return pygame.Rect((sw - w) // 2, sh - 40 - h, w, h + 20 + 4)
+
+    def render_key(self):
+        # text, colour, alpha and slide offset; None while hidden
+        if not self.active():
+            return None
+        return (self.text, self.positive) + self._frame()
+
     def draw(self):
         if not self.active():
             return
 
-        elapsed = pygame.time.get_ticks() - self.started
-        # Ease in/out for Y position and alpha
-        t = max(0, min(1, elapsed / 250.0))            # in (first 250ms)
-        o = max(0, min(1, (self.duration - elapsed) / 250.0)) if elapsed > self.duration - 250 else 1.0  # out
-        alpha = int(255 * min(t, o))
-
-        # Prepare text (wrap if too long)
-        words, lines, line = self.text.split(" "), [], ""
-        while words:
-            w = words.pop(0)
-            test = (line + " " + w).strip()
-            if self.font.size(test)[0] <= self.max_w - self.padding_x*2:
-                line = test
-            else:
-                lines.append(line); line = w
-        if line: lines.append(line)
+        alpha, slide = self._frame()
+        text_surfs, w, h = self._layout()
 
         sw, sh = self.surface.get_size()
-        text_surfs = [self.font.render(l, True, self.txt) for l in lines]
-        text_w = max(s.get_width() for s in text_surfs)
-        text_h = sum(s.get_height() for s in text_surfs) + (len(text_surfs)-1)*2
-
-        w = text_w + self.padding_x*2
-        h = text_h + self.padding_y*2
-
         x = (sw - w) // 2
         baseline_y = sh - 40 - h   # baseline resting Y
         # slide from +20px below
-        y = baseline_y + int((1 - t) * 20)
+        y = baseline_y + slide
 
         # shadow
         shadow = pygame.Surface((w, h), pygame.SRCALPHA)
@@ -96,6 +111,8 @@ class StatusToast:
         # text
         ty = y + self.padding_y
         for s in text_surfs:
-            s2 = s.copy(); s2.set_alpha(alpha)
-            self.surface.blit(s2, (x + (w - s.get_width())//2, ty))
+            # shared cached surface: fade it for this blit only
+            prev = s.get_alpha(); s.set_alpha(alpha)
+            self.surface.blit(s, (x + (w - s.get_width())//2, ty))
+            s.set_alpha(prev)
             ty += s.get_height() + 2